@@ -0,0 +1,196 @@
+"""Admission control for calls to rate-limited upstream APIs (LLM, embeddings)."""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from api.metrics import metrics
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call is not admitted (wait queue full or queue deadline passed)."""
+
+    def __init__(self, gate: str, reason: str, retry_after: int):
+        super().__init__(f"{gate} is overloaded ({reason}), retry in {retry_after}s")
+        self.gate = gate
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """A queued caller; wake() hands it a slot."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        self.granted = False
+        self._loop = loop
+        self._future = loop.create_future() if loop else None
+        self._event = None if loop else threading.Event()
+
+    def wake(self):
+        self.granted = True
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._resolve)
+        else:
+            self._event.set()
+
+    def _resolve(self):
+        if not self._future.done():
+            self._future.set_result(True)
+
+    async def await_slot(self, timeout: float):
+        await asyncio.wait_for(asyncio.shield(self._future), timeout)
+
+    def wait_slot(self, timeout: float) -> bool:
+        return self._event.wait(timeout)
+
+
+class AdmissionGate:
+    """
+    Concurrency limit with a bounded FIFO wait queue and a queue deadline.
+
+    At most max_concurrent calls run at once. Up to max_queue further calls
+    wait in arrival order; a call that finds the queue full, or that waits
+    longer than queue_timeout, is rejected immediately with AdmissionRejected
+    so the API can answer 429 instead of piling up requests upstream.
+
+    Works for both async callers (aslot) and worker threads (slot), which
+    share the same limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int = 5
+    ):
+        """
+        Initialize admission gate.
+
+        Args:
+            name: Gate name, used in metric names (admission_<name>_*)
+            max_concurrent: Maximum calls running at once
+            max_queue: Maximum calls waiting for a slot
+            queue_timeout: Maximum seconds a call may wait for a slot
+            retry_after: Retry-After hint (seconds) for rejected calls
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for a slot."""
+        return len(self._waiters)
+
+    def check(self):
+        """
+        Reject up front if a new call would not even be queued.
+
+        Used before starting a streaming response, whose status code cannot
+        be changed once the first event is sent.
+
+        Raises:
+            AdmissionRejected: If the wait queue is full
+        """
+        with self._lock:
+            if self._active >= self.max_concurrent and len(self._waiters) >= self.max_queue:
+                self._reject("queue full")
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Hold a slot for the duration of an async call."""
+        start_time = time.time()
+        waiter = self._enter(asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await waiter.await_slot(self.queue_timeout)
+            except asyncio.CancelledError:
+                if not self._abandon(waiter):
+                    self._release()
+                raise
+            except asyncio.TimeoutError:
+                if self._abandon(waiter):
+                    self._reject("queue timeout")
+        self._admitted(start_time)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of a blocking call (worker threads)."""
+        start_time = time.time()
+        waiter = self._enter(None)
+        if waiter is not None and not waiter.wait_slot(self.queue_timeout):
+            if self._abandon(waiter):
+                self._reject("queue timeout")
+        self._admitted(start_time)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _enter(self, loop):
+        """Take a free slot (returns None) or join the wait queue (returns the waiter)."""
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                self._publish()
+                return None
+            if len(self._waiters) >= self.max_queue:
+                self._reject("queue full")
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+            self._publish()
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """
+        Leave the queue after a timeout or cancellation.
+
+        Returns:
+            True if the waiter left without a slot; False if a slot was handed
+            to it concurrently (the caller then owns that slot)
+        """
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            self._publish()
+            return True
+
+    def _release(self):
+        """Give the slot to the next waiter, or free it."""
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().wake()
+            else:
+                self._active -= 1
+            self._publish()
+
+    def _admitted(self, start_time: float):
+        """Record how long an admitted call waited."""
+        wait_ms = (time.time() - start_time) * 1000
+        metrics.increment(f'admission_{self.name}_admitted_total')
+        metrics.increment(f'admission_{self.name}_wait_ms_total', wait_ms)
+        metrics.set_gauge(f'admission_{self.name}_last_wait_ms', round(wait_ms, 2))
+
+    def _reject(self, reason: str):
+        """Count and raise a rejection."""
+        metrics.increment(f'admission_{self.name}_rejected_total')
+        print(f"[ADMISSION] {self.name} rejected a call: {reason}")
+        raise AdmissionRejected(self.name, reason, self.retry_after)
+
+    def _publish(self):
+        """Update the active/queue gauges (caller holds the lock)."""
+        metrics.set_gauge(f'admission_{self.name}_active', self._active)
+        metrics.set_gauge(f'admission_{self.name}_queue_depth', len(self._waiters))
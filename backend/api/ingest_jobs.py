@@ -0,0 +1,410 @@
+"""Background ingestion jobs, persisted in SQLite and run outside the request threads.
+
+Each job runs one of the ingestion CLI scripts as a child process from a
+dedicated worker pool, so embedding, chunking and ChromaDB writes never
+compete with queries for this process's threads or GIL. Progress is parsed
+from the script's output ("n/total" counters such as "Stored documents
+1-100/1442"). Only one job per target (collection or database) is queued or
+running at a time, so two scripts never write the same data concurrently.
+Cancellation is a flag in the table, so a cancel request served by any
+worker process stops the job. When a job ends, the serving indexes of
+this process are refreshed (see RAGService.refresh_indexes); other workers
+notice the new corpus version on their next refresh poll.
+"""
+import json
+import os
+import queue
+import re
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Job kind -> (script relative to the backend directory, allowed boolean options -> CLI flag, data it writes)
+JOB_KINDS: Dict[str, tuple] = {
+    "guide": ("ingest_full_guide.py", {"rebuild": "--rebuild"}, "fta_compliance_guide"),
+    "guide_chunks": ("ingest.py", {"rebuild": "--rebuild"}, "fta_compliance_guide"),
+    "historical_audits": ("scripts/ingest_historical_audits.py", {"dry_run": "--dry-run"}, "audit_database"),
+    "historical_narratives": ("scripts/ingest_historical_narratives.py", {"reset": "--reset"}, "historical_audits"),
+}
+
+_PROGRESS_RE = re.compile(r"(\d+)/(\d+)\b")
+_LOG_TAIL_LINES = 20
+_CANCEL_POLL_SECONDS = 1.0
+_TERMINATE_GRACE_SECONDS = 10.0
+
+
+def conflicting_kinds(kind: str) -> List[str]:
+    """Job kinds that write the same target as this one (including itself)."""
+    target = JOB_KINDS[kind][2]
+    return [other for other, (_, _, other_target) in JOB_KINDS.items() if other_target == target]
+
+
+class IngestJobStore:
+    """SQLite table of ingestion jobs (shared by all worker processes)."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the job table.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ingest_jobs ("
+            " id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " options TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " cancel_requested INTEGER NOT NULL DEFAULT 0,"
+            " progress_done INTEGER,"
+            " progress_total INTEGER,"
+            " message TEXT,"
+            " error TEXT,"
+            " log_tail TEXT,"
+            " worker_pid INTEGER,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ingest_jobs_created ON ingest_jobs (created_at)")
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def create(self, kind: str, options: Dict[str, bool], exclusive_with: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Record a new queued job.
+
+        Args:
+            kind: Job kind
+            options: Boolean options of the job
+            exclusive_with: Kinds that must not be queued or running; checked in the
+                same write transaction as the insert, so concurrent submits from
+                several worker processes cannot both succeed
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If a job of one of the exclusive kinds is active
+        """
+        job_id = uuid.uuid4().hex[:12]
+        exclusive_with = exclusive_with or []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                active = self._conn.execute(
+                    f"SELECT kind FROM ingest_jobs WHERE status IN ('queued', 'running') "
+                    f"AND kind IN ({', '.join('?' * len(exclusive_with))})",
+                    tuple(exclusive_with)
+                ).fetchone() if exclusive_with else None
+                if active:
+                    raise ValueError(f"A '{active['kind']}' job writing the same data is already queued or running")
+                self._conn.execute(
+                    "INSERT INTO ingest_jobs (id, kind, options, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                    (job_id, kind, json.dumps(options), time.time())
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job as a dict (None if unknown)."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM ingest_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def claim(self, job_id: str) -> bool:
+        """Mark a queued job as running in this process; False if another process got it first."""
+        return self._execute(
+            "UPDATE ingest_jobs SET status = 'running', started_at = ?, worker_pid = ? "
+            "WHERE id = ? AND status = 'queued' AND cancel_requested = 0",
+            (time.time(), os.getpid(), job_id)
+        ) == 1
+
+    def update_progress(self, job_id: str, done: Optional[int], total: Optional[int], message: str, log_tail: str):
+        """Record the latest output of a running job."""
+        self._execute(
+            "UPDATE ingest_jobs SET progress_done = COALESCE(?, progress_done), "
+            "progress_total = COALESCE(?, progress_total), message = ?, log_tail = ? WHERE id = ?",
+            (done, total, message, log_tail, job_id)
+        )
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None, message: Optional[str] = None):
+        """Record the final status of a job."""
+        self._execute(
+            "UPDATE ingest_jobs SET status = ?, error = ?, message = COALESCE(?, message), finished_at = ? "
+            "WHERE id = ?",
+            (status, error, message, time.time(), job_id)
+        )
+
+    def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Ask a job to stop: a queued job is cancelled at once, a running one by its worker.
+
+        Returns:
+            The job after the request (None if unknown)
+        """
+        self._execute(
+            "UPDATE ingest_jobs SET cancel_requested = 1 WHERE id = ? AND status IN ('queued', 'running')",
+            (job_id,)
+        )
+        self._execute(
+            "UPDATE ingest_jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id)
+        )
+        return self.get(job_id)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        """True once cancellation of a job was requested."""
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def recover(self) -> List[str]:
+        """
+        Fail jobs whose worker process died, and return the IDs of jobs still queued.
+
+        Returns:
+            Queued job IDs, oldest first
+        """
+        with self._lock:
+            running = self._conn.execute(
+                "SELECT id, worker_pid FROM ingest_jobs WHERE status = 'running'"
+            ).fetchall()
+            queued = self._conn.execute(
+                "SELECT id FROM ingest_jobs WHERE status = 'queued' ORDER BY created_at"
+            ).fetchall()
+        for row in running:
+            # A fresh runner has no jobs of its own yet, so a job claimed under this PID is from a previous run
+            if row["worker_pid"] == os.getpid() or not _pid_alive(row["worker_pid"]):
+                self.finish(row["id"], "failed", error="Interrupted: the server stopped while the job was running")
+        return [row["id"] for row in queued]
+
+
+class IngestJobRunner:
+    """Runs queued ingestion jobs in a dedicated thread pool, one child process per job."""
+
+    def __init__(
+        self,
+        store: IngestJobStore,
+        workers: int = 1,
+        on_finished: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None
+    ):
+        """
+        Initialize job runner.
+
+        Args:
+            store: Job table
+            workers: Jobs run at the same time (1 serializes writes to the collections)
+            on_finished: Called in the job thread after a job's process exits; may
+                return a message to record (e.g. that the serving indexes were refreshed)
+        """
+        self.store = store
+        self.on_finished = on_finished
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-job")
+        for job_id in store.recover():
+            self._executor.submit(self._run, job_id)
+
+    def submit(self, kind: str, options: Optional[Dict[str, bool]] = None) -> Dict[str, Any]:
+        """
+        Queue an ingestion job.
+
+        Args:
+            kind: Job kind (see JOB_KINDS)
+            options: Boolean options of that kind (e.g. {"rebuild": true})
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If the kind or an option is unknown, or a job writing the same
+                collection or database is already active
+        """
+        options = options or {}
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}' (available: {', '.join(JOB_KINDS)})")
+        unknown = set(options) - set(JOB_KINDS[kind][1])
+        if unknown:
+            raise ValueError(f"Unknown options for '{kind}': {', '.join(sorted(unknown))}")
+
+        job = self.store.create(kind, options, exclusive_with=conflicting_kinds(kind))
+        self._executor.submit(self._run, job["id"])
+        print(f"[INGEST JOBS] Queued {kind} job {job['id']}" + (f" {options}" if options else ""))
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Request cancellation of a job (None if unknown)."""
+        return self.store.request_cancel(job_id)
+
+    def shutdown(self):
+        """Stop accepting jobs (running ones finish in the background)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job_id: str):
+        """Run one job to completion in a pool thread."""
+        if not self.store.claim(job_id):
+            return
+        job = self.store.get(job_id)
+        script, flags, _ = JOB_KINDS[job["kind"]]
+        command = [sys.executable, "-u", script] + [flags[name] for name, enabled in job["options"].items() if enabled]
+        print(f"[INGEST JOBS] Running {job['kind']} job {job_id}: {' '.join(command[2:])}")
+
+        try:
+            status, error = self._run_process(job_id, command)
+        except Exception as e:
+            status, error = "failed", str(e)
+
+        # Even a failed or cancelled run may have written part of its changes
+        message = None
+        if self.on_finished:
+            try:
+                message = self.on_finished(self.store.get(job_id))
+            except Exception as e:
+                message = f"Serving index refresh failed: {e}"
+        self.store.finish(job_id, status, error=error, message=message)
+        print(f"[INGEST JOBS] {job['kind']} job {job_id} {status}" + (f": {error}" if error else ""))
+
+    def _run_process(self, job_id: str, command: List[str]):
+        """Run a job's script, streaming progress into the table; returns (status, error)."""
+        process = subprocess.Popen(
+            command,
+            cwd=str(BACKEND_DIR),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+        def read_output():
+            for line in process.stdout:
+                lines.put(line.rstrip())
+            lines.put(None)
+
+        threading.Thread(target=read_output, daemon=True, name=f"ingest-job-{job_id}-output").start()
+
+        tail: List[str] = []
+        while True:
+            batch = []
+            try:
+                batch.append(lines.get(timeout=_CANCEL_POLL_SECONDS))
+                # Drain whatever else arrived so progress writes stay infrequent
+                while not lines.empty():
+                    batch.append(lines.get_nowait())
+            except queue.Empty:
+                pass
+            ended = None in batch
+            batch = [line for line in batch if line]
+
+            if batch:
+                tail = (tail + batch)[-_LOG_TAIL_LINES:]
+                done = total = None
+                for line in batch:
+                    match = _PROGRESS_RE.search(line)
+                    if match and int(match.group(1)) <= int(match.group(2)):
+                        done, total = int(match.group(1)), int(match.group(2))
+                self.store.update_progress(job_id, done, total, batch[-1][:500], "\n".join(tail))
+
+            if ended:
+                break
+            if self.store.cancel_requested(job_id):
+                _terminate(process)
+                return "cancelled", None
+
+        returncode = process.wait()
+        if returncode != 0:
+            return "failed", f"Script exited with code {returncode}"
+        return "succeeded", None
+
+
+def _terminate(process: subprocess.Popen):
+    """Stop a child process, killing it if it doesn't exit in time."""
+    process.terminate()
+    try:
+        process.wait(timeout=_TERMINATE_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    """True if a process with this PID exists."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    """Job row as an API-friendly dict."""
+    job = dict(row)
+    job["options"] = json.loads(job["options"])
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    done, total = job["progress_done"], job["progress_total"]
+    job["progress"] = round(done / total, 4) if done is not None and total else None
+    return job
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_ingest_runner() -> IngestJobRunner:
+    """
+    Get or create this process's job runner.
+
+    Finished jobs refresh the RAG service's serving indexes (once it is warmed up).
+    """
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            from api.service import RAGService
+            from config import settings
+
+            def refresh_serving_indexes(job: Dict[str, Any]) -> Optional[str]:
+                service = RAGService.get_instance()
+                if service is None:
+                    return None
+                return service.refresh_indexes()
+
+            _runner = IngestJobRunner(
+                IngestJobStore(settings.ingest_jobs_db or str(Path(settings.chroma_db_path) / "ingest_jobs.sqlite3")),
+                workers=settings.ingest_job_workers,
+                on_finished=refresh_serving_indexes
+            )
+        return _runner
@@ -0,0 +1,34 @@
+"""In-process service metrics exposed by the /metrics endpoint."""
+import threading
+from typing import Dict
+
+
+class Metrics:
+    """Thread-safe counters and gauges for this worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+
+    def increment(self, name: str, value: float = 1):
+        """Add value to a monotonically increasing counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return a copy of all counters and gauges."""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+            }
+
+
+# Singleton instance
+metrics = Metrics()
@@ -0,0 +1,175 @@
+"""Precomputed answers for the most frequently asked questions."""
+import copy
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from retrieval.batch import normalize_question
+
+# Occurrence weight at which the query log rescales its counts (keeps them far from float overflow)
+_RESCALE_WEIGHT = 2.0 ** 64
+
+# Metadata describing how one request was served rather than the answer itself
+REQUEST_METADATA_KEYS = (
+    'cache_hit', 'semantic_cache_hit', 'semantic_similarity', 'matched_question', 'execution_time_ms', 'precomputed'
+)
+
+
+def strip_request_metadata(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a response without the metadata of the request that produced it.
+
+    Args:
+        response: Response dict (not modified; it may be shared with the answer cache)
+
+    Returns:
+        Response dict safe to serve to later requests
+    """
+    metadata = {
+        key: value for key, value in (response.get('metadata') or {}).items()
+        if key not in REQUEST_METADATA_KEYS
+    }
+    return {**response, 'metadata': metadata}
+
+
+class QueryLog:
+    """
+    Frequency log of questions asked without conversation history.
+
+    Counts are kept per normalized question and persisted as JSON so the top
+    questions survive restarts. Counts decay: every half_life questions
+    recorded, older occurrences weigh half as much, so questions that became
+    popular recently can overtake ones that were asked often long ago. When
+    the log is full the lowest count other than the question just asked is
+    dropped, so a new question always gets the chance to build up a count.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, half_life: int = 10000):
+        """
+        Initialize query log.
+
+        Args:
+            path: JSON file the counts are persisted to
+            max_entries: Maximum distinct questions kept (lowest counts are dropped)
+            half_life: Questions recorded after which an occurrence counts half
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        # Counts are stored scaled by _weight (the current value of one occurrence)
+        # instead of shrinking every count on each record
+        self._counts: Counter = Counter()
+        self._weight = 1.0
+        self._questions: Dict[str, str] = {}  # normalized -> most recent original wording
+        self._dirty = False
+        self._load()
+
+    def record(self, question: str):
+        """Count one occurrence of a question."""
+        key = normalize_question(question)
+        with self._lock:
+            self._weight *= 2 ** (1 / self.half_life)
+            if self._weight > _RESCALE_WEIGHT:
+                for counted in self._counts:
+                    self._counts[counted] /= self._weight
+                self._weight = 1.0
+
+            self._counts[key] += self._weight
+            self._questions[key] = question
+            self._dirty = True
+
+            if len(self._counts) > self.max_entries:
+                dropped = min((counted for counted in self._counts if counted != key), key=self._counts.__getitem__)
+                del self._counts[dropped]
+                self._questions.pop(dropped, None)
+
+    def top(self, n: int) -> List[str]:
+        """Return the n most frequently asked questions."""
+        with self._lock:
+            return [self._questions[key] for key, _ in self._counts.most_common(n)]
+
+    def save(self):
+        """Persist counts if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = [
+                {'question': self._questions[key], 'count': count / self._weight}
+                for key, count in self._counts.most_common()
+            ]
+            self._dirty = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[QUERY LOG] Could not save {self.path}: {e}")
+
+    def _load(self):
+        """Load persisted counts, if any."""
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+
+        for entry in entries:
+            key = normalize_question(entry['question'])
+            self._counts[key] += entry['count']
+            self._questions[key] = entry['question']
+
+
+class PrecomputedAnswers:
+    """Answers computed ahead of time for one corpus version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._answers: Dict[str, Dict[str, Any]] = {}
+        self.version: Optional[str] = None
+
+    def get(self, question: str, corpus_version: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of the precomputed answer for a question.
+
+        Args:
+            question: User's question (matched case and whitespace insensitively)
+            corpus_version: Current corpus version; answers for older versions never match
+
+        Returns:
+            Response dict marked as precomputed, or None
+        """
+        with self._lock:
+            if corpus_version != self.version:
+                return None
+            answer = self._answers.get(normalize_question(question))
+
+        if answer is None:
+            return None
+        answer = copy.deepcopy(answer)
+        answer.setdefault('metadata', {})['precomputed'] = True
+        return answer
+
+    def replace(self, corpus_version: str, answers: Dict[str, Dict[str, Any]]):
+        """
+        Swap in a new set of answers.
+
+        Args:
+            corpus_version: Corpus version the answers were computed against
+            answers: Normalized question -> response dict
+        """
+        with self._lock:
+            self._answers = answers
+            self.version = corpus_version
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the current answers keyed by normalized question."""
+        with self._lock:
+            return dict(self._answers)
+
+    def __len__(self) -> int:
+        return len(self._answers)
@@ -1,16 +1,38 @@
 """API route handlers."""
-from fastapi import APIRouter, HTTPException, Depends
-from models import QueryRequest, QueryResponse, CommonQuestion, HealthResponse
-from typing import List
+import asyncio
+import json
+import time
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import JSONResponse, StreamingResponse
+from models import (
+    QueryRequest, QueryResponse, BatchQueryRequest, BatchQueryResponse,
+    CommonQuestion, HealthResponse, IngestJobRequest, IngestJob
+)
+from retrieval.batch import normalize_question
+from api.admission import AdmissionRejected
+from typing import List, Optional
 from config import settings
 
 router = APIRouter(prefix="/api/v1")
 
 
+def _too_many_requests(e: AdmissionRejected) -> HTTPException:
+    """429 response for a call rejected by admission control."""
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
 def get_rag_service():
-    """Dependency injection for RAG service."""
+    """
+    Dependency injection for RAG service.
+
+    The service is built by the startup warm-up, never on demand; requests
+    that arrive before it finishes get a 503.
+    """
     from api.service import RAGService
-    return RAGService()
+    service = RAGService.get_instance()
+    if service is None:
+        raise HTTPException(status_code=503, detail="Service is warming up", headers={"Retry-After": "5"})
+    return service
 
 
 @router.post("/query", response_model=QueryResponse)
@@ -34,12 +56,14 @@ async def query_endpoint(
             for msg in request.conversation_history
         ] if request.conversation_history else None
 
-        response = rag_service.process_query(
+        response = await rag_service.aprocess_query(
             question=request.question,
             recipient_type=request.recipient_type,
             conversation_history=conversation_history
         )
         return response
+    except AdmissionRejected as e:
+        raise _too_many_requests(e)
     except Exception as e:
         import traceback
         error_detail = f"Query processing failed: {str(e)}\n{traceback.format_exc()}"
@@ -47,6 +71,115 @@ async def query_endpoint(
         raise HTTPException(status_code=500, detail=f"Query processing failed: {str(e)}")
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/query/stream")
+async def query_stream_endpoint(
+    request: QueryRequest,
+    rag_service: "RAGService" = Depends(get_rag_service)
+):
+    """
+    Streaming Q&A endpoint (Server-Sent Events).
+
+    Sends a `route` event, then `sources` as soon as retrieval finishes,
+    then `token` events as the answer is generated, and finally a `done`
+    event with the complete answer and confidence. Failures are reported
+    as an `error` event since the response status is already sent.
+
+    Args:
+        request: Query request with question, optional recipient_type, and conversation history
+
+    Returns:
+        text/event-stream response
+    """
+    conversation_history = [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ] if request.conversation_history else None
+
+    try:
+        rag_service.check_admission()
+    except AdmissionRejected as e:
+        raise _too_many_requests(e)
+
+    async def event_stream():
+        try:
+            async for event, data in rag_service.astream_query(
+                question=request.question,
+                recipient_type=request.recipient_type,
+                conversation_history=conversation_history
+            ):
+                yield _sse_event(event, data)
+        except AdmissionRejected as e:
+            yield _sse_event("error", {"detail": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            import traceback
+            print(f"[ERROR] Streaming query failed: {str(e)}\n{traceback.format_exc()}")
+            yield _sse_event("error", {"detail": f"Query processing failed: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def query_batch_endpoint(
+    request: BatchQueryRequest,
+    rag_service: "RAGService" = Depends(get_rag_service)
+):
+    """
+    Answer a list of independent questions in one request.
+
+    Duplicate questions are answered once, RAG questions share a single
+    embedding call, and LLM generation runs with bounded concurrency.
+    Results are returned in request order - as one JSON document, or as
+    NDJSON lines (one per question) when `stream` is true.
+
+    Args:
+        request: Batch request with questions and options
+
+    Returns:
+        Batch response, or application/x-ndjson stream
+    """
+    if len(request.questions) > settings.batch_max_questions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(request.questions)} questions (max {settings.batch_max_questions})"
+        )
+
+    try:
+        rag_service.check_admission()
+    except AdmissionRejected as e:
+        raise _too_many_requests(e)
+
+    results = rag_service.astream_batch(request.questions, request.max_concurrency)
+
+    if request.stream:
+        async def ndjson_stream():
+            async for result in results:
+                yield json.dumps(result, default=str) + "\n"
+
+        return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+    start_time = time.time()
+    try:
+        collected = [result async for result in results]
+    except Exception as e:
+        print(f"[ERROR] Batch query failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch query failed: {str(e)}")
+
+    return BatchQueryResponse(
+        results=collected,
+        unique_questions=len({normalize_question(q) for q in request.questions}),
+        execution_time_ms=round((time.time() - start_time) * 1000, 2)
+    )
+
+
 @router.get("/common-questions", response_model=List[CommonQuestion])
 async def get_common_questions():
     """
@@ -58,16 +191,63 @@ async def get_common_questions():
     return [CommonQuestion(**q) for q in settings.common_questions]
 
 
+@router.get("/live")
+async def liveness_check():
+    """
+    Liveness probe - the process is up and serving HTTP.
+
+    Returns:
+        Static status (never touches the RAG service)
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe - only succeeds once startup warm-up has finished.
+
+    Returns:
+        200 when ready to serve queries, 503 while warming up
+    """
+    from api.service import RAGService
+    if RAGService.get_instance() is None:
+        return JSONResponse(status_code=503, content={"status": "warming_up"}, headers={"Retry-After": "5"})
+    return {"status": "ready"}
+
+
+@router.get("/metrics")
+async def metrics_endpoint():
+    """
+    In-process metrics for this worker.
+
+    Returns:
+        Counters and gauges (requests, coalesced requests, in-flight queries, answer cache)
+    """
+    from api.metrics import metrics
+    from api.service import RAGService
+    snapshot = metrics.snapshot()
+    rag_service = RAGService.get_instance()
+    if rag_service is not None:
+        snapshot['gauges'].update(rag_service.cache_stats())
+    return snapshot
+
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check(rag_service: "RAGService" = Depends(get_rag_service)):
+async def health_check():
     """
     Health check endpoint.
 
     Returns:
         Service status and database readiness
     """
+    from api.service import RAGService
+    rag_service = RAGService.get_instance()
+    if rag_service is None:
+        return HealthResponse(status="starting", version="1.0.0", database_ready=False)
+
     try:
-        db_ready = rag_service.check_database_ready()
+        db_ready = await asyncio.to_thread(rag_service.check_database_ready)
         return HealthResponse(
             status="healthy",
             version="1.0.0",
@@ -79,3 +259,78 @@ async def health_check(rag_service: "RAGService" = Depends(get_rag_service)):
             version="1.0.0",
             database_ready=False
         )
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """
+    Dependency guarding admin endpoints with the X-Admin-Key header.
+
+    The admin API is disabled unless ADMIN_API_KEY is configured.
+    """
+    if not settings.admin_api_key:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (set ADMIN_API_KEY)")
+    if x_admin_key != settings.admin_api_key:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+
+@router.post("/admin/ingest-jobs", response_model=IngestJob, status_code=202, dependencies=[Depends(require_admin)])
+async def submit_ingest_job(request: IngestJobRequest):
+    """
+    Queue a background ingestion job.
+
+    The job runs an ingestion script in a child process; when it ends the
+    serving indexes are refreshed.
+
+    Args:
+        request: Job kind and options
+
+    Returns:
+        The queued job
+    """
+    from api.ingest_jobs import get_ingest_runner
+    try:
+        return await asyncio.to_thread(get_ingest_runner().submit, request.kind, request.options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/admin/ingest-jobs", response_model=List[IngestJob], dependencies=[Depends(require_admin)])
+async def list_ingest_jobs(limit: int = 50):
+    """
+    List recent ingestion jobs.
+
+    Returns:
+        Jobs, most recent first
+    """
+    from api.ingest_jobs import get_ingest_runner
+    return await asyncio.to_thread(get_ingest_runner().store.list, limit)
+
+
+@router.get("/admin/ingest-jobs/{job_id}", response_model=IngestJob, dependencies=[Depends(require_admin)])
+async def get_ingest_job(job_id: str):
+    """
+    Progress of an ingestion job.
+
+    Returns:
+        The job
+    """
+    from api.ingest_jobs import get_ingest_runner
+    job = await asyncio.to_thread(get_ingest_runner().store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+
+@router.post("/admin/ingest-jobs/{job_id}/cancel", response_model=IngestJob, dependencies=[Depends(require_admin)])
+async def cancel_ingest_job(job_id: str):
+    """
+    Cancel an ingestion job (a running job's process is stopped within a few seconds).
+
+    Returns:
+        The job after the cancel request
+    """
+    from api.ingest_jobs import get_ingest_runner
+    job = await asyncio.to_thread(get_ingest_runner().cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
@@ -1,11 +1,32 @@
 """RAG service for handling query processing."""
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from ingestion import EmbeddingManager
+from ingestion.corpus_version import CorpusVersion
+from ingestion.embeddings import HISTORICAL_COLLECTION
+from ingestion.embedding_dimensions import check_collection_dimensions
+from ingestion.embedding_providers import create_embeddings
 from retrieval import HybridRetriever, RAGPipeline
 from retrieval.query_classifier import classify_query, get_retrieval_params
 from retrieval.hybrid_engine import HybridQueryEngine
+from retrieval.batch import iter_batch_results, normalize_question
+from retrieval.answer_cache import AnswerCache, UNCACHEABLE_BACKENDS
+from retrieval.first_stage import FirstStageIndex
+from retrieval.fusion import FusionRetriever
+from retrieval.quantized_index import QuantizedCollection, QuantizedVectorIndex, quantized_index_dir
+from retrieval.shared_index import lexical_index_root
+from retrieval.sparse_bm25 import SparseBM25Index
+from retrieval.semantic_cache import SemanticCache, mark_semantic_hit, semantic_context_key
 from database.connection import get_db_manager
+from api.admission import AdmissionGate
+from api.metrics import metrics
+from api.precompute import PrecomputedAnswers, QueryLog, strip_request_metadata
+from api.single_flight import SingleFlight, query_key
 from config import settings
 
 
@@ -14,6 +35,7 @@ class RAGService:
 
     _instance = None
     _initialized = False
+    _warmed_up = False
 
     def __new__(cls):
         """Singleton pattern to reuse connections."""
@@ -29,38 +51,93 @@ class RAGService:
 
     def _initialize_components(self):
         """Initialize embedding manager, retriever, and RAG pipeline."""
+        # Coalesces identical concurrent queries into one execution
+        self.single_flight = SingleFlight()
+
+        # Complete-answer cache, keyed on the corpus version of the serving indexes (see refresh_indexes)
+        self.corpus_version = CorpusVersion(settings.chroma_db_path)
+        self.indexed_version = self.corpus_version.get()  # Corpus version the serving indexes were built from
+        self._refresh_lock = threading.Lock()
+        self.refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-refresh")
+        self.answer_cache = AnswerCache(
+            max_entries=settings.answer_cache_max_entries,
+            ttl_seconds={
+                'rag': settings.answer_cache_ttl_rag,
+                'database': settings.answer_cache_ttl_database,
+                'hybrid': settings.answer_cache_ttl_hybrid,
+            }
+        ) if settings.answer_cache_enabled else None
+
+        # Answers computed ahead of time for common and frequently asked questions
+        self.query_log = QueryLog(str(Path(settings.chroma_db_path) / "query_log.json"))
+        self.precomputed = PrecomputedAnswers()
+
+        # Answers to paraphrased RAG questions, matched by question embedding
+        self.semantic_cache = SemanticCache(
+            threshold=settings.semantic_cache_threshold,
+            max_entries=settings.semantic_cache_max_entries,
+            ttl_seconds=settings.semantic_cache_ttl
+        ) if settings.semantic_cache_enabled else None
+
+        # Bounded concurrency and wait queues in front of the OpenAI APIs
+        self.llm_admission = AdmissionGate(
+            "llm",
+            max_concurrent=settings.llm_max_concurrency,
+            max_queue=settings.llm_max_queue,
+            queue_timeout=settings.llm_queue_timeout_seconds,
+            retry_after=settings.admission_retry_after_seconds
+        )
+        self.embedding_admission = AdmissionGate(
+            "embedding",
+            max_concurrent=settings.embedding_max_concurrency,
+            max_queue=settings.embedding_max_queue,
+            queue_timeout=settings.embedding_queue_timeout_seconds,
+            retry_after=settings.admission_retry_after_seconds
+        )
+
         # Initialize embedding manager (connects to ChromaDB)
-        self.embedding_manager = EmbeddingManager(
-            db_path=settings.chroma_db_path,
-            openai_api_key=settings.openai_api_key,
-            embedding_model=settings.embedding_model
+        self.embedding_manager = EmbeddingManager.from_settings(
+            settings,
+            admission=self.embedding_admission,
+            query_cache_size=settings.query_embedding_cache_size
         )
 
-        # Initialize hybrid retriever
+        # Refuse to serve a collection whose vectors can't be compared with query embeddings
+        self.embedding_manager.check_dimensions()
+        self.embedding_manager.collection = self._quantize_collection(self.embedding_manager.collection)
+
+        # Optional local first stage: candidates without a network call, ranked by the primary embeddings
+        self.embedding_manager.first_stage = self._build_first_stage(self.embedding_manager.collection)
+
+        # Initialize hybrid retriever with a BM25 index of all documents in ChromaDB
         self.hybrid_retriever = HybridRetriever(
             semantic_weight=settings.semantic_weight,
             keyword_weight=settings.keyword_weight
         )
-
-        # Build BM25 index from all documents in ChromaDB
-        self._build_bm25_index()
+        self._build_bm25_index(self.hybrid_retriever, self.embedding_manager.collection)
 
         # Initialize RAG pipeline
         self.rag_pipeline = RAGPipeline(
             openai_api_key=settings.openai_api_key,
             model=settings.llm_model,
-            temperature=settings.llm_temperature
+            temperature=settings.llm_temperature,
+            admission=self.llm_admission
         )
 
-        # Initialize historical audits collection
-        try:
-            import chromadb
-            chroma_client = chromadb.PersistentClient(path=settings.chroma_db_path)
-            self.historical_collection = chroma_client.get_collection("historical_audits")
-            print(f"[RAG SERVICE] Historical audits collection loaded: {self.historical_collection.count()} documents")
-        except Exception as e:
-            self.historical_collection = None
-            print(f"[RAG SERVICE] Historical audits collection not available: {e}")
+        # Initialize historical audits collection (reuse the embedding manager's Chroma client)
+        self.historical_collection = self._load_historical_collection()
+        if self.historical_collection:
+            self._build_bm25_index(self.hybrid_retriever, self.historical_collection)
+
+        # Union retrieval: BM25 top-k alongside vector top-k, fused (None = BM25 only rescores vector results)
+        self.fusion_retriever = FusionRetriever(
+            self.embedding_manager,
+            self.hybrid_retriever,
+            method=settings.fusion_method,
+            semantic_depth=settings.fusion_semantic_depth,
+            keyword_depth=settings.fusion_keyword_depth,
+            rrf_k=settings.fusion_rrf_k
+        ) if settings.fusion_method else None
 
         # Initialize database manager (for structured queries)
         db_url = settings.database_url
@@ -71,8 +148,12 @@ class RAGService:
                 db_manager=self.db_manager,
                 rag_pipeline=self.rag_pipeline,
                 hybrid_retriever=self.hybrid_retriever,
+                fusion_retriever=self.fusion_retriever,
                 embedding_manager=self.embedding_manager,
-                historical_collection=self.historical_collection
+                historical_collection=self.historical_collection,
+                answer_cache=self.answer_cache,
+                indexed_version=self.indexed_version,
+                semantic_cache=self.semantic_cache
             )
             print("[RAG SERVICE] Hybrid query engine initialized with database support")
         else:
@@ -80,19 +161,184 @@ class RAGService:
             self.hybrid_engine = None
             print("[RAG SERVICE] No DATABASE_URL found, running in RAG-only mode")
 
-    def _build_bm25_index(self):
-        """Build BM25 index from all documents in ChromaDB."""
-        # Get all documents from collection
-        all_docs = self.embedding_manager.collection.get()
+    @classmethod
+    def get_instance(cls) -> Optional["RAGService"]:
+        """Return the singleton if startup warm-up has completed, otherwise None."""
+        if cls._initialized and cls._warmed_up:
+            return cls._instance
+        return None
+
+    @classmethod
+    def warm_up(cls) -> "RAGService":
+        """
+        Build the singleton and exercise every dependency before serving traffic.
 
-        if all_docs and all_docs['ids']:
-            documents = all_docs['documents']
-            doc_ids = all_docs['ids']
+        Initializes all components (Chroma clients, BM25 index, DB engine),
+        embeds a probe query, runs it against each collection so the vector
+        indexes are loaded, and opens pooled database connections.
 
-            self.hybrid_retriever.build_bm25_index(documents, doc_ids)
-            print(f"BM25 index built with {len(documents)} documents")
-        else:
-            print("Warning: No documents in ChromaDB. BM25 index not built.")
+        Returns:
+            The warmed-up service
+        """
+        start_time = time.time()
+        service = cls()
+
+        probe_embedding = service.embedding_manager.embed_query(settings.warmup_probe_query)
+        service.embedding_manager.query_by_embedding(probe_embedding, n_results=1)
+        if service.historical_collection:
+            service.historical_collection.query(query_embeddings=[probe_embedding], n_results=1)
+
+        if service.db_manager:
+            service.db_manager.warm_pool(settings.warmup_db_connections)
+
+        cls._warmed_up = True
+        print(f"[RAG SERVICE] Warm-up complete in {round((time.time() - start_time) * 1000, 2)}ms")
+        return service
+
+    def _load_historical_collection(self):
+        """Open the historical audits collection (None if missing or built with other embeddings)."""
+        try:
+            collection = self.embedding_manager.get_collection(HISTORICAL_COLLECTION)
+            check_collection_dimensions(
+                collection,
+                self.embedding_manager.embedding_model,
+                self.embedding_manager.dimensions
+            )
+            collection = self._quantize_collection(collection)
+            print(f"[RAG SERVICE] Historical audits collection loaded: {collection.count()} documents")
+            return collection
+        except Exception as e:
+            print(f"[RAG SERVICE] Historical audits collection not available: {e}")
+            return None
+
+    def _build_first_stage(self, collection) -> Optional[FirstStageIndex]:
+        """Local first-stage index of a collection when settings.first_stage_provider is set."""
+        if not settings.first_stage_provider:
+            return None
+        return FirstStageIndex.build(
+            create_embeddings(settings.first_stage_provider, settings.embedding_model,
+                              settings.first_stage_dimensions, settings.openai_api_key),
+            collection,
+            self.corpus_version,
+            candidates=settings.first_stage_candidates
+        )
+
+    def _build_bm25_index(self, retriever: HybridRetriever, collection):
+        """
+        Attach a collection's BM25 index to a retriever, under the collection's name as namespace.
+
+        The index saved by ingestion (or by serve.py) is memory-mapped, so
+        no documents are read from ChromaDB. If it is missing or was built
+        from another corpus version, it is rebuilt from the collection and
+        saved for the next process.
+        """
+        index_root = settings.shared_index_dir or lexical_index_root(settings.chroma_db_path)
+        start_time = time.time()
+        index = SparseBM25Index.open(collection, str(Path(index_root) / collection.name), self.corpus_version.get())
+        if not len(index):
+            print(f"Warning: No documents in '{collection.name}'. BM25 index not built.")
+            return
+
+        retriever.attach_index(index, namespace=collection.name)
+        print(f"[RAG SERVICE] BM25 index for '{collection.name}': {len(index)} documents, {len(index.vocab)} terms, "
+              f"ready in {round((time.time() - start_time) * 1000, 2)}ms (pid {os.getpid()})")
+
+    def refresh_indexes(self) -> Optional[str]:
+        """
+        Rebuild the serving indexes for the current corpus version and swap them in.
+
+        Collections are reopened on a new ChromaDB client, since the open
+        one never sees vectors written by other processes. The BM25 index,
+        quantized vector indexes and first stage are built while queries keep
+        using the previous ones; each is then replaced by a single reference
+        assignment, so a query sees either the old or the new index and never
+        a partially built one. Called when an ingestion job finishes and
+        periodically for ingestion done by other processes.
+
+        Returns:
+            Summary message, or None if the indexes were already current
+        """
+        with self._refresh_lock:
+            version = self.corpus_version.get()
+            if version == self.indexed_version:
+                return None
+            start_time = time.time()
+
+            # Re-open collections by name on a new client: a rebuild may have replaced them
+            self.embedding_manager.reconnect()
+            guide = self.embedding_manager._get_or_create_collection()
+            check_collection_dimensions(guide, self.embedding_manager.embedding_model, self.embedding_manager.dimensions)
+            guide = self._quantize_collection(guide)
+            first_stage = self._build_first_stage(guide)
+            retriever = HybridRetriever(
+                semantic_weight=settings.semantic_weight,
+                keyword_weight=settings.keyword_weight
+            )
+            self._build_bm25_index(retriever, guide)
+            historical = self._load_historical_collection()
+            if historical:
+                self._build_bm25_index(retriever, historical)
+
+            self.embedding_manager.first_stage = first_stage
+            self.embedding_manager.collection = guide
+            self.hybrid_retriever = retriever
+            self.historical_collection = historical
+            if self.fusion_retriever:
+                self.fusion_retriever.hybrid_retriever = retriever
+            if self.hybrid_engine:
+                self.hybrid_engine.hybrid_retriever = retriever
+                self.hybrid_engine.historical_collection = historical
+                self.hybrid_engine.indexed_version = version  # Cache keys follow the indexes answers come from
+            self.indexed_version = version
+
+            message = (f"Serving indexes refreshed for corpus version {version} "
+                       f"in {round((time.time() - start_time) * 1000, 2)}ms")
+            print(f"[RAG SERVICE] {message}")
+            return message
+
+    def _quantize_collection(self, collection):
+        """
+        Serve a collection's vector searches from a quantized index when settings.vector_quantization is set.
+
+        The index is saved next to ChromaDB (built by serve.py for multi-worker
+        runs) and rebuilt here if missing or from an older corpus version.
+
+        Args:
+            collection: ChromaDB collection
+
+        Returns:
+            QuantizedCollection wrapping it, or the collection unchanged
+        """
+        if not settings.vector_quantization:
+            return collection
+
+        start_time = time.time()
+        version = self.corpus_version.get()
+        index = QuantizedVectorIndex.open(
+            collection,
+            quantized_index_dir(settings.chroma_db_path, collection.name),
+            settings.vector_quantization,
+            version,
+            float_copy=settings.vector_float_copy
+        )
+        stats = index.memory_stats()
+        print(f"[RAG SERVICE] Quantized index for '{collection.name}': {stats['documents']} vectors, "
+              f"{settings.vector_quantization} codes {stats['code_bytes'] / 1e6:.1f}MB vs floats "
+              f"{stats['float_bytes'] / 1e6:.1f}MB ({stats['compression']}x) in "
+              f"{round((time.time() - start_time) * 1000, 2)}ms")
+        return QuantizedCollection(
+            collection, index, self.corpus_version, version, rescore_factor=settings.vector_rescore_factor
+        )
+
+    def check_admission(self):
+        """
+        Fail fast before starting a streaming response if upstream queues are full.
+
+        Raises:
+            AdmissionRejected: If the LLM or embedding wait queue is full
+        """
+        self.llm_admission.check()
+        self.embedding_admission.check()
 
     def check_database_ready(self) -> bool:
         """Check if database is ready with documents."""
@@ -128,51 +374,515 @@ class RAGService:
         # Fallback to pure RAG pipeline (no database)
         print("[RAG SERVICE] Using pure RAG pipeline (no database)")
 
+        cache_key = self._rag_cache_key(question, conversation_history)
+        cached = self._rag_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         # Step 0: Classify query and get retrieval parameters
-        query_type = classify_query(question)
-        retrieval_params = get_retrieval_params(query_type)
-        top_k = retrieval_params["top_k"]
+        top_k = self._get_top_k(question)
 
-        print(f"Query type: {query_type}, retrieving top {top_k} chunks")
+        # Step 1: Embed the question (paraphrases of answered questions stop here)
+        query_embedding = self.embedding_manager.embed_query(question)
+        semantic_context, cached = self._semantic_lookup(query_embedding, conversation_history)
+        if cached is not None:
+            return cached
 
-        # Step 1: Semantic retrieval from ChromaDB
-        filter_metadata = None
-        if recipient_type:
-            # Future: implement metadata filtering by recipient_type
-            pass
+        # Step 2: Hybrid search (semantic + BM25)
+        retrieved_chunks = self._retrieve_chunks(question, query_embedding, top_k, recipient_type)
+
+        if not retrieved_chunks:
+            return self._no_results_response()
 
-        semantic_results = self.embedding_manager.query_collection(
-            query_text=question,
-            n_results=top_k,
-            filter_metadata=filter_metadata
+        # Step 3: Generate answer with RAG pipeline
+        response = self.rag_pipeline.process_query(
+            question=question,
+            retrieved_chunks=retrieved_chunks,
+            conversation_history=conversation_history
         )
 
-        # Step 2: Hybrid search (merge semantic + BM25)
-        retrieved_chunks = self.hybrid_retriever.merge_results(
-            semantic_results=semantic_results,
-            query=question,
-            top_k=top_k
+        response = self._finalize_rag_response(response)
+        self._rag_cache_put(cache_key, response)
+        self._semantic_store(semantic_context, question, query_embedding, response)
+        return response
+
+    async def aprocess_query(
+        self,
+        question: str,
+        recipient_type: Optional[str] = None,
+        conversation_history: Optional[list] = None
+    ) -> Dict[str, any]:
+        """
+        Async variant of process_query for use from request handlers.
+
+        Embedding and LLM calls are awaited natively; synchronous ChromaDB,
+        BM25 and SQLAlchemy work runs in worker threads so the event loop
+        stays free for other requests. Concurrent identical queries (same
+        normalized question and recent history) share one execution.
+
+        Args:
+            question: User's question
+            recipient_type: Optional recipient type for filtering
+            conversation_history: Previous conversation messages (optional)
+
+        Returns:
+            Query response with answer, confidence, sources, and backend type
+        """
+        metrics.increment('query_requests_total')
+
+        precomputed = self._precomputed_answer(question, recipient_type, conversation_history)
+        if precomputed is not None:
+            return precomputed
+
+        key = query_key(question, conversation_history, recipient_type)
+
+        response, coalesced = await self.single_flight.run(
+            key,
+            lambda: self._aexecute(question, recipient_type, conversation_history)
+        )
+        metrics.set_gauge('query_in_flight', self.single_flight.in_flight)
+
+        if coalesced:
+            metrics.increment('query_coalesced_total')
+            print("[RAG SERVICE] Coalesced with an identical in-flight query")
+            response.setdefault('metadata', {})['coalesced'] = True
+
+        return response
+
+    async def _aexecute(
+        self,
+        question: str,
+        recipient_type: Optional[str] = None,
+        conversation_history: Optional[list] = None
+    ) -> Dict[str, any]:
+        """Execute a query once (called through single-flight coalescing)."""
+        metrics.set_gauge('query_in_flight', self.single_flight.in_flight)
+
+        if self.hybrid_engine:
+            print("[RAG SERVICE] Using hybrid query engine (async)")
+            return await self.hybrid_engine.aexecute_query(
+                question=question,
+                conversation_history=conversation_history
+            )
+
+        print("[RAG SERVICE] Using pure RAG pipeline (no database, async)")
+        return await self._aprocess_rag_only(question, recipient_type, conversation_history)
+
+    async def _aprocess_rag_only(
+        self,
+        question: str,
+        recipient_type: Optional[str] = None,
+        conversation_history: Optional[list] = None,
+        query_embedding: Optional[list] = None
+    ) -> Dict[str, any]:
+        """Async pure RAG pipeline, optionally reusing a precomputed question embedding."""
+        cache_key = self._rag_cache_key(question, conversation_history)
+        cached = self._rag_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        top_k = self._get_top_k(question)
+
+        if query_embedding is None:
+            query_embedding = await self.embedding_manager.aembed_query(question)
+
+        semantic_context, cached = self._semantic_lookup(query_embedding, conversation_history)
+        if cached is not None:
+            return cached  # Not copied into the exact cache: later calls should still report the semantic match
+
+        retrieved_chunks = await asyncio.to_thread(
+            self._retrieve_chunks, question, query_embedding, top_k, recipient_type
         )
 
         if not retrieved_chunks:
-            return {
-                'answer': "I couldn't find relevant information in the FTA compliance guide to answer your question.",
-                'confidence': 'low',
-                'sources': [],
-                'ranked_chunks': [],
-                'backend': 'rag',
-                'metadata': {}
-            }
+            return self._no_results_response()
 
-        # Step 3: Generate answer with RAG pipeline
-        response = self.rag_pipeline.process_query(
+        response = await self.rag_pipeline.aprocess_query(
             question=question,
             retrieved_chunks=retrieved_chunks,
             conversation_history=conversation_history
         )
 
-        # Add backend type for consistency
+        response = self._finalize_rag_response(response)
+        self._rag_cache_put(cache_key, response)
+        self._semantic_store(semantic_context, question, query_embedding, response)
+        return response
+
+    async def astream_query(
+        self,
+        question: str,
+        recipient_type: Optional[str] = None,
+        conversation_history: Optional[list] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, any]]]:
+        """
+        Process a query and stream route, sources, answer tokens and a final result.
+
+        Args:
+            question: User's question
+            recipient_type: Optional recipient type for filtering
+            conversation_history: Previous conversation messages (optional)
+
+        Yields:
+            (event, payload) pairs - see HybridQueryEngine.astream_query
+        """
+        precomputed = self._precomputed_answer(question, recipient_type, conversation_history)
+        if precomputed is not None:
+            metadata = precomputed['metadata']
+            yield "route", {
+                'route_type': metadata.get('route_type', 'rag'),
+                'confidence': metadata.get('confidence', 1.0),
+                'reasoning': metadata.get('reasoning', 'Precomputed answer'),
+                'sections': metadata.get('sections')
+            }
+            yield "sources", {'sources': precomputed.get('sources', []), 'ranked_chunks': precomputed.get('ranked_chunks', [])}
+            yield "token", {'text': precomputed['answer']}
+            yield "done", {
+                'answer': precomputed['answer'],
+                'confidence': precomputed['confidence'],
+                'backend': precomputed.get('backend', 'rag'),
+                'metadata': metadata
+            }
+            return
+
+        if self.hybrid_engine:
+            async for event in self.hybrid_engine.astream_query(
+                question=question,
+                conversation_history=conversation_history
+            ):
+                yield event
+            return
+
+        start_time = time.time()
+        yield "route", {'route_type': 'rag', 'confidence': 1.0, 'reasoning': 'RAG-only mode (no database)', 'sections': None}
+
+        cache_key = self._rag_cache_key(question, conversation_history)
+        response = self._rag_cache_get(cache_key)
+        if response is not None:
+            yield "sources", {'sources': response.get('sources', []), 'ranked_chunks': response.get('ranked_chunks', [])}
+            yield "token", {'text': response['answer']}
+        else:
+            top_k = self._get_top_k(question)
+            query_embedding = await self.embedding_manager.aembed_query(question)
+            semantic_context, response = self._semantic_lookup(query_embedding, conversation_history)
+
+            if response is not None:
+                yield "sources", {'sources': response.get('sources', []), 'ranked_chunks': response.get('ranked_chunks', [])}
+                yield "token", {'text': response['answer']}
+            else:
+                retrieved_chunks = await asyncio.to_thread(
+                    self._retrieve_chunks, question, query_embedding, top_k, recipient_type
+                )
+
+                if not retrieved_chunks:
+                    response = self._no_results_response()
+                    yield "sources", {'sources': [], 'ranked_chunks': []}
+                    yield "token", {'text': response['answer']}
+                else:
+                    sources = self.rag_pipeline.format_sources(retrieved_chunks)
+                    yield "sources", {'sources': sources[:3], 'ranked_chunks': sources}
+
+                    async for event, payload in self.rag_pipeline.astream_answer(
+                        question, retrieved_chunks, conversation_history
+                    ):
+                        if event == "token":
+                            yield "token", {'text': payload}
+                        else:
+                            response = self._finalize_rag_response(payload)
+                    self._rag_cache_put(cache_key, response)
+                    self._semantic_store(semantic_context, question, query_embedding, response)
+
+        response['metadata']['execution_time_ms'] = round((time.time() - start_time) * 1000, 2)
+        yield "done", {
+            'answer': response['answer'],
+            'confidence': response['confidence'],
+            'backend': response['backend'],
+            'metadata': response['metadata']
+        }
+
+    def astream_batch(
+        self,
+        questions: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, any]]:
+        """
+        Answer a batch of independent questions, yielding results in input order.
+
+        Args:
+            questions: Questions to answer
+            max_concurrency: Maximum concurrent LLM generations (defaults to, and is capped at, settings)
+
+        Returns:
+            Async iterator of result dicts, each with 'index' and 'question'
+        """
+        max_concurrency = min(max_concurrency or settings.batch_max_concurrency, settings.batch_max_concurrency)
+
+        if self.hybrid_engine:
+            return self.hybrid_engine.astream_batch(questions, max_concurrency)
+
+        async def start_unique(unique: List[str]) -> list:
+            vectors = await self.embedding_manager.aembed_documents(unique)
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def run(question: str, query_embedding: list) -> Dict[str, any]:
+                async with semaphore:
+                    return await self._aprocess_rag_only(question, query_embedding=query_embedding)
+
+            return [run(q, v) for q, v in zip(unique, vectors)]
+
+        return iter_batch_results(questions, start_unique)
+
+    def _precomputed_answer(
+        self,
+        question: str,
+        recipient_type: Optional[str],
+        conversation_history: Optional[list]
+    ) -> Optional[Dict[str, any]]:
+        """Log a standalone question and return its precomputed answer, if there is one."""
+        if conversation_history or recipient_type:
+            return None
+
+        self.query_log.record(question)
+        answer = self.precomputed.get(question, self.indexed_version)
+        if answer is not None:
+            metrics.increment('query_precomputed_total')
+            print("[RAG SERVICE] Serving precomputed answer")
+        return answer
+
+    async def refresh_precomputed(self) -> int:
+        """
+        Precompute answers for the common questions and the most asked questions.
+
+        When the serving indexes were refreshed since the last run every
+        answer is recomputed; otherwise only questions that newly entered the top list
+        are answered. Questions that dropped out of the list are discarded.
+
+        Returns:
+            Number of questions answered in this run
+        """
+        version = self.indexed_version
+
+        wanted = {}
+        for question in [q['question'] for q in settings.common_questions] + self.query_log.top(settings.precompute_top_n):
+            wanted.setdefault(normalize_question(question), question)
+
+        current = self.precomputed.snapshot() if self.precomputed.version == version else {}
+        answers = {key: current[key] for key in wanted if key in current}
+        missing = [(key, question) for key, question in wanted.items() if key not in answers]
+
+        self.query_log.save()
+        if not missing and len(answers) == len(current) and self.precomputed.version == version:
+            return 0
+
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(settings.precompute_concurrency)
+
+        async def compute(key: str, question: str):
+            async with semaphore:
+                try:
+                    response = await self._aexecute(question)
+                except Exception as e:
+                    print(f"[RAG SERVICE] Precompute failed for '{question[:60]}': {e}")
+                    return
+            if response.get('backend') not in UNCACHEABLE_BACKENDS:
+                answers[key] = strip_request_metadata(response)
+
+        await asyncio.gather(*(compute(key, question) for key, question in missing))
+        self.precomputed.replace(version, answers)
+
+        print(f"[RAG SERVICE] Precomputed {len(missing)} answers for corpus version {version} "
+              f"({len(answers)} total) in {round((time.time() - start_time) * 1000, 2)}ms")
+        return len(missing)
+
+    def _get_top_k(self, question: str) -> int:
+        """Classify the query and return how many chunks to retrieve."""
+        query_type = classify_query(question)
+        retrieval_params = get_retrieval_params(query_type)
+        top_k = retrieval_params["top_k"]
+
+        print(f"Query type: {query_type}, retrieving top {top_k} chunks")
+        return top_k
+
+    def _retrieve_chunks(
+        self,
+        question: str,
+        query_embedding: List[float],
+        top_k: int,
+        recipient_type: Optional[str] = None
+    ) -> List[Dict[str, any]]:
+        """
+        Retrieve and rank compliance guide chunks (blocking).
+
+        With fusion on, the BM25 and vector top-k are retrieved together and
+        fused, so chunks matching the question's exact wording are found even
+        when they miss the vector top-k. Otherwise BM25 only rescores the
+        vector results.
+
+        Args:
+            question: User's question
+            query_embedding: Embedding of the question
+            top_k: Number of chunks to return
+            recipient_type: Optional recipient type for filtering
+
+        Returns:
+            Ranked chunks ready for answer generation
+        """
+        filter_metadata = self._build_filter(recipient_type)
+        if self.fusion_retriever:
+            candidates = self.fusion_retriever.retrieve(
+                question,
+                query_embedding,
+                {'compliance_guide': self.embedding_manager.collection},
+                top_k,
+                filters={'compliance_guide': filter_metadata} if filter_metadata else None
+            )
+            return [candidate.to_chunk() for candidate in candidates]
+
+        semantic_results = self.embedding_manager.query_by_embedding(query_embedding, top_k, filter_metadata, question)
+        return self.hybrid_retriever.merge_results(semantic_results=semantic_results, query=question, top_k=top_k)
+
+    def _build_filter(self, recipient_type: Optional[str]) -> Optional[Dict]:
+        """Build a ChromaDB metadata filter for the request."""
+        if recipient_type:
+            # Future: implement metadata filtering by recipient_type
+            pass
+        return None
+
+    def _no_results_response(self) -> Dict[str, any]:
+        """Response returned when retrieval finds nothing."""
+        return {
+            'answer': "I couldn't find relevant information in the FTA compliance guide to answer your question.",
+            'confidence': 'low',
+            'sources': [],
+            'ranked_chunks': [],
+            'backend': 'rag',
+            'metadata': {}
+        }
+
+    def _finalize_rag_response(self, response: Dict[str, any]) -> Dict[str, any]:
+        """Add backend type and metadata for consistency with the hybrid engine."""
         response['backend'] = 'rag'
         response['metadata'] = response.get('metadata', {})
+        response['metadata'].setdefault('cache_hit', False)
 
         return response
+
+    def _rag_cache_key(self, question: str, conversation_history: Optional[list]) -> Optional[str]:
+        """Answer cache key for the RAG-only path (None when caching is disabled)."""
+        if self.answer_cache is None:
+            return None
+        return self.answer_cache.make_key(question, 'rag', self.indexed_version, conversation_history)
+
+    def _rag_cache_get(self, cache_key: Optional[str]) -> Optional[Dict[str, any]]:
+        """Return a cached RAG-only answer marked as a cache hit, if present."""
+        if not cache_key:
+            return None
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            print("[RAG SERVICE] Answer cache hit")
+            cached.setdefault('metadata', {})['cache_hit'] = True
+        return cached
+
+    def _rag_cache_put(self, cache_key: Optional[str], response: Dict[str, any]):
+        """Cache a freshly generated RAG-only answer."""
+        if cache_key:
+            self.answer_cache.put(cache_key, 'rag', response)
+
+    def _semantic_lookup(self, query_embedding: list, conversation_history: Optional[list]) -> Tuple[Optional[str], Optional[Dict[str, any]]]:
+        """Look up a RAG-only answer to a paraphrase of this question, returning (context_key, cached)."""
+        if self.semantic_cache is None:
+            return None, None
+        context_key = semantic_context_key(self.indexed_version, conversation_history)
+        hit = self.semantic_cache.lookup(query_embedding, 'rag', context_key)
+        if hit is None:
+            return context_key, None
+
+        cached, similarity, matched_question = hit
+        print(f"[RAG SERVICE] Semantic cache hit (similarity {similarity:.3f}): {matched_question[:60]}")
+        return context_key, mark_semantic_hit(cached, similarity, matched_question)
+
+    def _semantic_store(self, context_key: Optional[str], question: str, query_embedding: list, response: Dict[str, any]):
+        """Remember a freshly generated RAG-only answer in the semantic cache."""
+        if context_key:
+            self.semantic_cache.add(query_embedding, 'rag', context_key, question, response)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Answer cache and precomputed answer statistics for the metrics endpoint."""
+        stats = {}
+        if self.answer_cache is not None:
+            stats.update({
+                'answer_cache_entries': len(self.answer_cache),
+                'answer_cache_hits': self.answer_cache.hits,
+                'answer_cache_misses': self.answer_cache.misses,
+            })
+        if self.semantic_cache is not None:
+            stats.update({
+                'semantic_cache_entries': len(self.semantic_cache),
+                'semantic_cache_hits': self.semantic_cache.hits,
+                'semantic_cache_misses': self.semantic_cache.misses,
+            })
+        query_cache = self.embedding_manager.query_cache
+        stats.update({
+            'query_embedding_cache_entries': len(query_cache),
+            'query_embedding_cache_hits': query_cache.hits,
+            'query_embedding_cache_misses': query_cache.misses,
+        })
+        stats['precomputed_answers'] = len(self.precomputed)
+        return stats
+
+
+async def warm_up_service():
+    """
+    Warm up the RAG service in a worker thread, retrying until it succeeds.
+
+    Run as a background task from the application lifespan so the server can
+    answer liveness probes while initialization is in progress.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(RAGService.warm_up)
+            return
+        except Exception as e:
+            print(f"[RAG SERVICE] Warm-up failed: {e} - retrying in {settings.warmup_retry_seconds}s")
+            await asyncio.sleep(settings.warmup_retry_seconds)
+
+
+async def refresh_indexes_loop():
+    """
+    Pick up ingestion done outside this process (CLI scripts, jobs run by other workers).
+
+    Waits for warm-up, then checks the corpus version on a fixed interval
+    and rebuilds the serving indexes on the service's own refresh thread.
+    """
+    while RAGService.get_instance() is None:
+        await asyncio.sleep(1.0)
+
+    service = RAGService.get_instance()
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(settings.index_refresh_poll_seconds)
+        if service.corpus_version.get() == service.indexed_version:
+            continue
+        try:
+            await loop.run_in_executor(service.refresh_executor, service.refresh_indexes)
+        except Exception as e:
+            print(f"[RAG SERVICE] Index refresh failed: {e}")
+
+
+async def precompute_answers_loop():
+    """
+    Keep precomputed answers current for the lifetime of the server.
+
+    Waits for warm-up, then refreshes on a fixed interval. A refresh after an
+    ingest (new corpus version) recomputes every answer; otherwise it only
+    picks up questions that became popular.
+    """
+    while RAGService.get_instance() is None:
+        await asyncio.sleep(1.0)
+
+    service = RAGService.get_instance()
+    while True:
+        try:
+            await service.refresh_precomputed()
+        except Exception as e:
+            print(f"[RAG SERVICE] Precompute refresh failed: {e}")
+        await asyncio.sleep(settings.precompute_poll_seconds)
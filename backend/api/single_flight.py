@@ -0,0 +1,79 @@
+"""Single-flight coalescing of identical in-flight queries."""
+import asyncio
+import copy
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from retrieval.batch import normalize_question
+
+
+def query_key(
+    question: str,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    recipient_type: Optional[str] = None,
+    history_window: int = 6
+) -> str:
+    """
+    Build a stable key for a query.
+
+    Only the last history_window messages are included, matching what the
+    RAG pipeline actually sends to the LLM.
+
+    Args:
+        question: User's question
+        conversation_history: Previous conversation messages (optional)
+        recipient_type: Optional recipient type filter
+        history_window: Number of trailing history messages that affect the answer
+
+    Returns:
+        Hex digest identifying the query
+    """
+    history = [
+        [msg.get('role', 'user'), msg.get('content', '')]
+        for msg in (conversation_history or [])[-history_window:]
+    ]
+    payload = json.dumps([normalize_question(question), history, recipient_type])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """
+    Run at most one execution per key at a time.
+
+    Callers that arrive while an execution for the same key is in flight wait
+    for it and receive a copy of its result instead of starting their own.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct executions currently running."""
+        return len(self._in_flight)
+
+    async def run(self, key: str, execute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Execute, or join an in-flight execution for the same key.
+
+        Args:
+            key: Coalescing key (see query_key)
+            execute: Zero-argument coroutine function performing the work
+
+        Returns:
+            (result, coalesced) - coalesced is True when this caller joined
+            an execution started by another request
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            # Shield so a disconnecting follower doesn't cancel the shared work
+            result = await asyncio.shield(task)
+            return copy.deepcopy(result), True
+
+        task = asyncio.ensure_future(execute())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result), False
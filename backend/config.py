@@ -12,18 +12,91 @@ class Settings(BaseSettings):
     database_url: str | None = None  # Optional database URL for hybrid mode
 
     # Embedding config
+    embedding_provider: str = "openai"  # "openai" or "hashing" (local, no network; see ingestion.embedding_providers)
     embedding_model: str = "text-embedding-3-large"
-    embedding_dimensions: int = 3072
+    embedding_dimensions: int | None = None  # None = the model's full size; 256/512/1024 shrink the index (re-ingest after changing)
+    query_embedding_cache_size: int = 2048  # In-process LRU of query embeddings
+    embedding_cache_path: str | None = None  # Ingestion embedding cache (None = <chroma_db_path>/embedding_cache.sqlite3)
+    embedding_cache_max_mb: int = 256  # Size budget of the ingestion embedding cache (shares the ChromaDB disk)
+
+    # Ingestion embedding batches and rate limits (match them to the account's OpenAI limits)
+    embed_concurrency: int = 4  # Embeddings requests in flight at once
+    embed_max_batch_tokens: int = 20000  # Uncached tokens per request
+    embed_max_batch_size: int = 256  # Texts per request (also the ChromaDB write size)
+    embed_requests_per_minute: int = 3000
+    embed_tokens_per_minute: int = 1000000
 
     # LLM config
     llm_model: str = "gpt-4-turbo-preview"
     llm_temperature: float = 0.0
 
+    # Directory of the memory-mapped BM25 indexes, one per collection (None = chroma_db/lexical_index, written by ingestion)
+    shared_index_dir: str | None = None
+
+    # Quantized vector search: "int8" or "binary" codes with exact float rescoring (None = ChromaDB HNSW)
+    vector_quantization: str | None = None
+    vector_rescore_factor: int = 8  # Candidates rescored per requested result
+    vector_float_copy: bool = False  # Rescore from a memory-mapped float copy (doubles vector disk use, keeps HNSW out of RAM)
+
+    # Local first-stage retrieval ahead of rescoring with the primary embeddings (None = off)
+    first_stage_provider: str | None = None  # e.g. "hashing"
+    first_stage_dimensions: int = 1024
+    first_stage_candidates: int = 100
+
+    # Background ingestion jobs (admin API) and serving index refresh
+    admin_api_key: str | None = None  # Required in X-Admin-Key for /admin endpoints (None = admin API disabled)
+    ingest_jobs_db: str | None = None  # SQLite job table (None = <chroma_db_path>/ingest_jobs.sqlite3)
+    ingest_job_workers: int = 1  # Jobs running at once
+    index_refresh_poll_seconds: float = 30.0  # How often to check for ingestion done by other processes
+
     # Retrieval config
     top_k_retrieval: int = 5
     semantic_weight: float = 0.7
     keyword_weight: float = 0.3
 
+    # Union retrieval (opt-in): BM25 top-k runs alongside vector top-k and the rankings are fused
+    fusion_method: str | None = None  # "rrf" or "score" (None = BM25 only rescores the vector results)
+    fusion_semantic_depth: int = 10  # Vector results per collection entering fusion
+    fusion_keyword_depth: int = 10  # BM25 results per collection entering fusion
+    fusion_rrf_k: int = 60  # Reciprocal rank fusion constant
+
+    # Admission control for upstream API calls (excess requests get a fast 429)
+    llm_max_concurrency: int = 8
+    llm_max_queue: int = 32
+    llm_queue_timeout_seconds: float = 20.0
+    embedding_max_concurrency: int = 16
+    embedding_max_queue: int = 64
+    embedding_queue_timeout_seconds: float = 5.0
+    admission_retry_after_seconds: int = 5
+
+    # Answer cache config (entries are also invalidated by the corpus version stamp)
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 1000
+    answer_cache_ttl_rag: float = 6 * 3600
+    answer_cache_ttl_database: float = 24 * 3600
+    answer_cache_ttl_hybrid: float = 24 * 3600
+
+    # Semantic answer cache config (reuses answers for paraphrased RAG questions)
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95  # Minimum cosine similarity between question embeddings
+    semantic_cache_max_entries: int = 500
+    semantic_cache_ttl: float = 6 * 3600
+
+    # Precomputed answers (common questions + most asked questions, refreshed on corpus change)
+    precompute_enabled: bool = True
+    precompute_top_n: int = 20
+    precompute_concurrency: int = 2
+    precompute_poll_seconds: float = 60.0
+
+    # Startup warm-up config
+    warmup_probe_query: str = "What are ADA paratransit eligibility requirements?"
+    warmup_db_connections: int = 5
+    warmup_retry_seconds: float = 30.0
+
+    # Batch query config
+    batch_max_questions: int = 100
+    batch_max_concurrency: int = 4  # Concurrent LLM generations per batch request
+
     # Common questions (demonstrating DATABASE, RAG, and HYBRID queries with natural language)
     common_questions: list = [
         # DATABASE queries (structured data, 100% accurate) - Using natural section names
@@ -78,6 +78,27 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def warm_pool(self, connections: int = 5):
+        """
+        Open pooled connections ahead of traffic.
+
+        Connections are opened concurrently-held and then returned to the pool,
+        so the first requests don't pay the connect/TLS handshake.
+
+        Args:
+            connections: Number of connections to open (capped by the pool size)
+        """
+        from sqlalchemy import text
+        opened = []
+        try:
+            for _ in range(connections):
+                conn = self.engine.connect()
+                conn.execute(text("SELECT 1"))
+                opened.append(conn)
+        finally:
+            for conn in opened:
+                conn.close()
+
     def test_connection(self) -> bool:
         """Test database connection."""
         try:
@@ -1,17 +1,51 @@
 #!/usr/bin/env python3
-"""Ingestion CLI script to process PDFs and populate ChromaDB."""
+"""Ingestion CLI script to process PDFs and populate ChromaDB.
+
+Runs incrementally: only new or changed chunks are embedded and upserted,
+and chunks whose PDFs were removed are deleted. Chunks written by
+ingest_full_guide.py share the collection and are left alone. Pass --rebuild
+to delete this script's chunks first.
+"""
+import argparse
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 from ingestion import PDFProcessor, EmbeddingManager
+from ingestion.corpus_version import read_corpus_version
+from retrieval.sparse_bm25 import save_lexical_indexes
 from config import settings
 
 # Load environment variables
 load_dotenv()
 
+INGEST_SOURCE = "guide_chunks"  # Owner of this script's chunks in the shared collection
+ID_PREFIX = "chunks/"  # Chunk PDF names look like ingest_full_guide.py's IDs ({Category}_chunk_{N})
+
+
+def namespace_documents(documents: list) -> list:
+    """Prefix chunk IDs so they cannot collide with the full guide's chunks in the same collection."""
+    for doc in documents:
+        doc["metadata"]["chunk_id"] = ID_PREFIX + doc["metadata"]["chunk_id"]
+    return documents
+
+
+def wrote_untagged_chunk(chunk_id: str, metadata: dict) -> bool:
+    """
+    True for a chunk this script stored before chunks were tagged with their ingest source.
+
+    Those chunks were stored under the PDF's name without ID_PREFIX, so the
+    sync deletes them and their vectors are reused for the prefixed IDs.
+    """
+    return Path(metadata.get("file_path", "")).name == f"{chunk_id}.pdf"
+
 
 def main():
     """Main ingestion pipeline."""
+    parser = argparse.ArgumentParser(description="Ingest guide chunk PDFs into ChromaDB")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Delete this script's chunks and ingest every chunk from scratch")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("CORTAP-RAG Ingestion Pipeline")
     print("=" * 60)
@@ -22,12 +56,12 @@ def main():
 
     print(f"\nChunks directory: {chunks_dir}")
     print(f"ChromaDB path: {settings.chroma_db_path}")
-    print(f"Embedding model: {settings.embedding_model}\n")
+    print(f"Embedding model: {settings.embedding_provider}/{settings.embedding_model} ({settings.embedding_dimensions or 'full'} dimensions)\n")
 
     # Step 1: Process PDFs
     print("\n[1/3] Processing PDF files...")
     processor = PDFProcessor(str(chunks_dir))
-    documents = processor.process_all_chunks()
+    documents = namespace_documents(processor.process_all_chunks())
 
     if not documents:
         print("Error: No documents were processed. Exiting.")
@@ -35,27 +69,23 @@ def main():
 
     # Step 2: Initialize embedding manager
     print("\n[2/3] Initializing ChromaDB and embeddings...")
-    embedding_manager = EmbeddingManager(
-        db_path=settings.chroma_db_path,
-        openai_api_key=settings.openai_api_key,
-        embedding_model=settings.embedding_model
-    )
+    embedding_manager = EmbeddingManager.from_settings(settings)
 
-    # Clear existing data (optional - comment out to append)
-    current_count = embedding_manager.get_collection_count()
-    if current_count > 0:
-        response = input(f"\nCollection has {current_count} documents. Clear it? (y/n): ")
-        if response.lower() == 'y':
-            embedding_manager.clear_collection()
-            print("Collection cleared.")
+    if args.rebuild:
+        embedding_manager.clear_source(INGEST_SOURCE, adopt=wrote_untagged_chunk)
+        print("Chunk PDF documents cleared.")
 
-    # Step 3: Ingest documents
-    print("\n[3/3] Generating embeddings and storing in ChromaDB...")
-    embedding_manager.ingest_documents(documents, batch_size=5)
+    # Step 3: Upsert new/changed chunks and delete stale ones
+    print("\n[3/3] Syncing embeddings into ChromaDB...")
+    report = embedding_manager.sync_documents(documents, source=INGEST_SOURCE, adopt=wrote_untagged_chunk)
+    save_lexical_indexes(
+        embedding_manager.client, settings.chroma_db_path, read_corpus_version(settings.chroma_db_path)
+    )
 
     print("\n" + "=" * 60)
     print("Ingestion Complete!")
     print("=" * 60)
+    print(f"Changes: {report.summary()}")
     print(f"Total documents indexed: {embedding_manager.get_collection_count()}")
     print(f"Database location: {settings.chroma_db_path}")
 
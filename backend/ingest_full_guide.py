@@ -1,16 +1,41 @@
 #!/usr/bin/env python3
-"""Re-ingest the full FTA guide by intelligently chunking all 23 sections."""
+"""Re-ingest the full FTA guide by intelligently chunking all 23 sections.
+
+Ingestion is incremental: only chunks whose text or metadata changed since
+the last run are re-embedded and upserted, and chunks that disappeared are
+deleted (see ingestion.incremental); chunks written by ingest.py share the
+collection and are left alone. If the PDF itself is unchanged the run exits
+immediately.
+
+Usage:
+    python ingest_full_guide.py
+    python ingest_full_guide.py --rebuild
+"""
+import argparse
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 from pypdf import PdfReader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from ingestion import EmbeddingManager
+from ingestion.incremental import file_hash
+from ingestion.corpus_version import read_corpus_version
+from retrieval.sparse_bm25 import save_lexical_indexes
 from config import settings
 
 # Load environment variables
 load_dotenv()
 
+CHUNK_SIZE = 2000  # ~500 words, good for semantic search
+CHUNK_OVERLAP = 200  # 10% overlap to preserve context
+INGEST_SOURCE = "full_guide"  # Owner of this script's chunks in the shared collection
+GUIDE_DOCUMENT = "Fiscal-Year-2025-Contractor-Manual"  # 'source' metadata of every chunk
+
+
+def wrote_untagged_chunk(chunk_id: str, metadata: dict) -> bool:
+    """True for a chunk this script stored before chunks were tagged with their ingest source."""
+    return metadata.get("source") == GUIDE_DOCUMENT
+
 
 def extract_full_pdf_text(pdf_path: Path) -> str:
     """Extract all text from the main PDF."""
@@ -131,7 +156,7 @@ def create_documents_from_chunks(chunks: list) -> list:
                 "chunk_id": f"{category}_chunk_{i}",
                 "category": category,
                 "chunk_number": i,
-                "source": "Fiscal-Year-2025-Contractor-Manual",
+                "source": GUIDE_DOCUMENT,
                 "file_path": "docs/guide/Fiscal-Year-2025-Contractor-Manual_0.pdf",
             }
         }
@@ -155,28 +180,16 @@ def create_documents_from_chunks(chunks: list) -> list:
 
 
 def main():
-    """Main ingestion pipeline - skips if data already exists."""
+    """Main ingestion pipeline - incrementally syncs the guide, skipping if the PDF is unchanged."""
+    parser = argparse.ArgumentParser(description="Ingest the full FTA guide into ChromaDB")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Delete this script's chunks and ingest every chunk from scratch")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("CORTAP-RAG Full Guide Ingestion")
     print("=" * 70)
 
-    # Initialize embedding manager first to check if data exists
-    embedding_manager = EmbeddingManager(
-        db_path=settings.chroma_db_path,
-        openai_api_key=settings.openai_api_key,
-        embedding_model=settings.embedding_model
-    )
-
-    # Check if data already exists
-    current_count = embedding_manager.get_collection_count()
-    if current_count > 1000:  # Expected ~1442 chunks
-        print(f"\n✓ Compliance guide already ingested ({current_count} documents)")
-        print("  Skipping re-ingestion to save time and API costs.")
-        print("  To force re-ingestion, delete the ChromaDB collection first.")
-        return
-
-    print(f"\nCurrent collection has {current_count} documents - proceeding with ingestion...")
-
     # Paths
     project_root = Path(__file__).parent.parent
     main_pdf = project_root / "docs" / "guide" / "Fiscal-Year-2025-Contractor-Manual_0.pdf"
@@ -185,6 +198,26 @@ def main():
         print(f"ERROR: Main PDF not found at {main_pdf}")
         return
 
+    embedding_manager = EmbeddingManager.from_settings(settings)
+
+    if args.rebuild:
+        print("\nClearing the guide's chunks for a full rebuild...")
+        embedding_manager.clear_source(INGEST_SOURCE, adopt=wrote_untagged_chunk)
+
+    # The PDF fingerprint includes the chunking parameters, so changing either re-syncs
+    current_count = embedding_manager.get_collection_count()
+    manifest = embedding_manager.manifest()
+    fingerprint = f"{file_hash(str(main_pdf))}:{CHUNK_SIZE}:{CHUNK_OVERLAP}"
+    if not args.rebuild and current_count and manifest.source_unchanged(main_pdf.name, fingerprint) and \
+            manifest.describes(embedding_manager.collection):
+        print(f"\n✓ Compliance guide is up to date ({current_count} documents, PDF unchanged)")
+        print("  Run with --rebuild to re-ingest from scratch.")
+        save_lexical_indexes(
+            embedding_manager.client, settings.chroma_db_path, read_corpus_version(settings.chroma_db_path)
+        )
+        return
+
+    print(f"\nCurrent collection has {current_count} documents - syncing changes...")
     print(f"\nMain PDF: {main_pdf}")
     print(f"ChromaDB path: {settings.chroma_db_path}")
     print(f"Embedding model: {settings.embedding_model}\n")
@@ -197,30 +230,31 @@ def main():
     print("\n[2/4] Chunking by sections...")
     chunks = intelligent_chunk_by_sections(
         full_text,
-        chunk_size=2000,  # ~500 words, good for semantic search
-        chunk_overlap=200  # 10% overlap to preserve context
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP
     )
 
     # Step 3: Create documents with metadata
     print("\n[3/4] Creating documents with metadata...")
     documents = create_documents_from_chunks(chunks)
 
-    # Step 4: Ingest into ChromaDB
-    print("\n[4/4] Ingesting into ChromaDB...")
-
-    # Clear existing collection if it has some data but not complete
-    if current_count > 0:
-        print(f"\nClearing incomplete collection ({current_count} documents)...")
-        embedding_manager.clear_collection()
-
-    # Ingest new documents
-    print("\nGenerating embeddings and storing...")
-    embedding_manager.ingest_documents(documents, batch_size=10)
+    # Step 4: Upsert new/changed chunks and delete stale ones
+    print("\n[4/4] Syncing ChromaDB...")
+    report = embedding_manager.sync_documents(
+        documents,
+        source=INGEST_SOURCE,
+        sources={main_pdf.name: fingerprint},
+        adopt=wrote_untagged_chunk
+    )
+    save_lexical_indexes(
+        embedding_manager.client, settings.chroma_db_path, read_corpus_version(settings.chroma_db_path)
+    )
 
     # Summary
     print("\n" + "=" * 70)
     print("Ingestion Complete!")
     print("=" * 70)
+    print(f"Changes: {report.summary()}")
     print(f"Total documents indexed: {embedding_manager.get_collection_count()}")
     print(f"Database location: {settings.chroma_db_path}")
     print("\nAll 23 sections should now be represented in the database.")
@@ -0,0 +1,248 @@
+"""Pipelined, token-aware embedding for ingestion.
+
+Texts are grouped into request batches by token count, several batches are
+embedded concurrently within request/token rate limits, transient API errors
+are retried with exponential backoff, and each finished batch is handed to a
+sink (typically a ChromaDB write) in input order while later batches are still
+being embedded. Texts already in the embedding cache are never sent and do not
+count against the rate limits.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import openai
+
+from .embedding_cache import CachedEmbeddings
+
+# Errors worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens the way the embeddings API does (cl100k_base).
+
+    Falls back to a ~4 characters/token estimate when the tiktoken encoding
+    cannot be loaded (it is downloaded on first use).
+    """
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"[EMBEDDER] tiktoken unavailable ({e}); estimating tokens from text length")
+                _encoding = False
+
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests per minute and tokens per minute (thread-safe)."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+
+    def acquire(self, tokens: int):
+        """Block until one request carrying this many tokens fits within both limits."""
+        tokens = min(tokens, self.tokens_per_minute)  # An oversized batch waits for a full bucket
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._updated = now
+                self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+                self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+
+                wait = max(
+                    (1 - self._requests) * 60 / self.requests_per_minute,
+                    (tokens - self._tokens) * 60 / self.tokens_per_minute
+                )
+            time.sleep(max(wait, 0.01))
+
+
+class PipelinedEmbedder:
+    """Embed many texts concurrently in token-bounded batches, delivering results in order."""
+
+    def __init__(
+        self,
+        embeddings: CachedEmbeddings,
+        max_batch_tokens: int = 20000,
+        max_batch_size: int = 256,
+        concurrency: int = 4,
+        requests_per_minute: int = 3000,
+        tokens_per_minute: int = 1000000,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0
+    ):
+        """
+        Initialize pipelined embedder.
+
+        Args:
+            embeddings: Cached embeddings to embed through
+            max_batch_tokens: Maximum uncached tokens per embeddings request
+            max_batch_size: Maximum texts per batch (also the sink write size)
+            concurrency: Embeddings requests in flight at once
+            requests_per_minute: Request rate limit
+            tokens_per_minute: Token rate limit
+            max_retries: Retries per batch for transient API errors
+            backoff_seconds: Initial retry delay (doubles per attempt, with jitter)
+        """
+        self.embeddings = embeddings
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+
+    @staticmethod
+    def options_from_settings(settings) -> Dict[str, int]:
+        """
+        Batch and rate limits configured in the application settings.
+
+        Args:
+            settings: Application settings (config.settings, embed_* fields)
+
+        Returns:
+            Constructor keyword arguments
+        """
+        return {
+            "max_batch_tokens": settings.embed_max_batch_tokens,
+            "max_batch_size": settings.embed_max_batch_size,
+            "concurrency": settings.embed_concurrency,
+            "requests_per_minute": settings.embed_requests_per_minute,
+            "tokens_per_minute": settings.embed_tokens_per_minute,
+        }
+
+    def make_batches(self, texts: List[str], cached: List[Optional[List[float]]]) -> List[Tuple[int, int, int]]:
+        """
+        Split texts into consecutive request batches.
+
+        Args:
+            texts: Texts to embed
+            cached: Cached vector per text (None where it must be embedded)
+
+        Returns:
+            (start, end, uncached_token_count) per batch, covering texts in order
+        """
+        batches = []
+        start, batch_tokens = 0, 0
+        for i, text in enumerate(texts):
+            tokens = 0 if cached[i] is not None else count_tokens(text)
+            if i > start and (batch_tokens + tokens > self.max_batch_tokens or i - start >= self.max_batch_size):
+                batches.append((start, i, batch_tokens))
+                start, batch_tokens = i, 0
+            batch_tokens += tokens
+        if start < len(texts):
+            batches.append((start, len(texts), batch_tokens))
+        return batches
+
+    def run(
+        self,
+        texts: List[str],
+        sink: Optional[Callable[[int, int, List[List[float]]], None]] = None
+    ) -> List[List[float]]:
+        """
+        Embed texts, passing each finished batch to sink in input order.
+
+        The sink runs on the calling thread while the next batches are being
+        embedded, so writing batch N overlaps with embedding batch N+1.
+
+        Args:
+            texts: Texts to embed
+            sink: Called as sink(start, end, vectors) for texts[start:end]
+
+        Returns:
+            All vectors when no sink is given (otherwise an empty list, so
+            callers streaming into a sink don't hold every vector in memory)
+        """
+        if not texts:
+            return []
+
+        start_time = time.time()
+        cached = self.embeddings.lookup(texts)
+        batches = self.make_batches(texts, cached)
+        total_tokens = sum(tokens for _, _, tokens in batches)
+        uncached = sum(1 for vector in cached if vector is None)
+        print(f"[EMBEDDER] {len(texts)} texts ({uncached} to embed, {total_tokens} tokens) "
+              f"in {len(batches)} batches (concurrency {self.concurrency})")
+
+        results = []
+        window = self.concurrency * 2  # Bounded read-ahead keeps memory flat on large runs
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = []
+            next_batch = 0
+            try:
+                while next_batch < len(batches) or pending:
+                    while next_batch < len(batches) and len(pending) < window:
+                        start, end, tokens = batches[next_batch]
+                        future = executor.submit(self._embed_batch, texts[start:end], cached[start:end], tokens)
+                        pending.append((start, end, future))
+                        next_batch += 1
+
+                    start, end, future = pending.pop(0)
+                    vectors = future.result()
+                    if sink:
+                        sink(start, end, vectors)
+                    else:
+                        results.extend(vectors)
+            except BaseException:
+                for _, _, future in pending:
+                    future.cancel()
+                raise
+
+        elapsed = time.time() - start_time
+        print(f"[EMBEDDER] Embedded {len(texts)} texts in {elapsed:.1f}s "
+              f"({total_tokens / max(elapsed, 1e-6):.0f} tokens/s)")
+        return results
+
+    def _embed_batch(
+        self,
+        texts: List[str],
+        cached: List[Optional[List[float]]],
+        tokens: int
+    ) -> List[List[float]]:
+        """Embed one batch's uncached texts within the rate limits, retrying transient errors with backoff."""
+        missing = [text for text, vector in zip(texts, cached) if vector is None]
+        if not missing:
+            return list(cached)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(tokens)
+            try:
+                computed = iter(self.embeddings.embed_uncached(missing))
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_seconds * (2 ** attempt) * (1 + random.random())
+                print(f"[EMBEDDER] {type(e).__name__} - retrying batch of {len(missing)} in {delay:.1f}s "
+                      f"(attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+
+        return [vector if vector is not None else next(computed) for vector in cached]
@@ -0,0 +1,35 @@
+"""ChromaDB client settings shared by every client this application opens."""
+from chromadb.config import Settings
+from chromadb.telemetry.product import ProductTelemetryClient, ProductTelemetryEvent
+from overrides import override
+
+
+class NoProductTelemetry(ProductTelemetryClient):
+    """
+    Product telemetry client that drops every event.
+
+    chromadb 0.5.0's default client batches get() and query() events in a
+    dict without a lock (even with anonymized_telemetry=False), so
+    concurrent reads through one client can fail with a KeyError. With
+    this client nothing is batched and collections can be read from
+    several threads at once.
+    """
+
+    @override
+    def capture(self, event: ProductTelemetryEvent) -> None:
+        """Discard the event."""
+
+
+def chroma_settings() -> Settings:
+    """
+    Settings for a ChromaDB client.
+
+    Every client opened on one path in a process must use equal settings,
+    so all of them are built here.
+    """
+    telemetry = f"{NoProductTelemetry.__module__}.{NoProductTelemetry.__name__}"
+    return Settings(
+        anonymized_telemetry=False,
+        chroma_product_telemetry_impl=telemetry,
+        chroma_telemetry_impl=telemetry
+    )
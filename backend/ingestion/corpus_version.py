@@ -0,0 +1,72 @@
+"""Corpus version stamp shared between ingestion scripts and the API.
+
+Every ingestion path that changes what answers are derived from (ChromaDB
+collections or the compliance/audit tables) bumps the stamp. The API folds
+the current stamp into cache keys, so re-ingesting invalidates cached answers
+without having to reach into a running server.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+VERSION_FILE = "corpus_version.json"
+
+
+def bump_corpus_version(db_path: str, reason: str = "") -> str:
+    """
+    Write a new corpus version stamp.
+
+    Args:
+        db_path: ChromaDB directory the stamp lives in
+        reason: Short description of what changed (for operators)
+
+    Returns:
+        The new version string
+    """
+    path = Path(db_path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    version = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    payload = {"version": version, "updated_at": time.time(), "reason": reason}
+
+    # Write then rename so readers never see a partial file
+    tmp_path = path / f".{VERSION_FILE}.{os.getpid()}.tmp"
+    tmp_path.write_text(json.dumps(payload))
+    os.replace(tmp_path, path / VERSION_FILE)
+
+    print(f"[CORPUS] Version bumped to {version} ({reason or 'no reason given'})")
+    return version
+
+
+def read_corpus_version(db_path: str) -> str:
+    """Read the current corpus version ("0" if nothing was ever ingested with stamping)."""
+    try:
+        return json.loads((Path(db_path) / VERSION_FILE).read_text())["version"]
+    except (OSError, ValueError, KeyError):
+        return "0"
+
+
+class CorpusVersion:
+    """Cheap, cached reader of the corpus version for the request path."""
+
+    def __init__(self, db_path: str):
+        self.path = Path(db_path) / VERSION_FILE
+        self._lock = threading.Lock()
+        self._mtime_ns = None
+        self._version = "0"
+
+    def get(self) -> str:
+        """Return the current version, re-reading the file only when it changed."""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            return "0"
+
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                self._version = read_corpus_version(str(self.path.parent))
+                self._mtime_ns = mtime_ns
+            return self._version
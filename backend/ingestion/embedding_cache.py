@@ -0,0 +1,315 @@
+"""Embedding caches.
+
+EmbeddingCache is a persistent, content-addressed cache of document
+embeddings: ingestion re-embeds every chunk on every run, and with this cache
+only new or changed texts are sent to the embeddings API. Entries are keyed by
+sha256(model, dimensions, text) and stored as raw float32 blobs in a single
+SQLite file, evicting least recently used entries beyond a size budget.
+
+QueryEmbeddingCache is a small in-process LRU for query embeddings, so a
+question asked again is not re-embedded over the network.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_FILE = "embedding_cache.sqlite3"
+DEFAULT_MAX_MB = 256  # Shares the ChromaDB disk (1 GB on Render)
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed store of float32 embedding vectors with LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        """
+        Open (or create) an embedding cache.
+
+        Args:
+            path: SQLite file path
+            max_bytes: Size budget for stored vectors; oldest entries are evicted beyond it
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key BLOB PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, dimensions: Optional[int], text: str) -> bytes:
+        """Content address of one embedding."""
+        return hashlib.sha256(f"{model}\x00{dimensions}\x00{text}".encode("utf-8")).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[float]]:
+        """
+        Look up vectors and mark them as recently used.
+
+        Args:
+            keys: Keys from make_key
+
+        Returns:
+            Found vectors by key (missing keys are absent)
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, vectors: Dict[bytes, List[float]]):
+        """
+        Store vectors, then evict old entries if over budget.
+
+        Args:
+            vectors: Vectors by key
+        """
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in vectors.items()]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def size_bytes(self) -> int:
+        """Total size of stored vectors."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _evict(self):
+        """Delete least recently used entries until under budget (caller holds the lock)."""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        if total <= self.max_bytes or not count:
+            return
+
+        # Evict down to 90% of the budget so every insert doesn't trigger another eviction
+        average = total / count
+        excess = int((total - 0.9 * self.max_bytes) / average) + 1
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        print(f"[EMBEDDING CACHE] Evicted {excess} least recently used embeddings")
+
+
+class CachedEmbeddings:
+    """
+    Wrap a LangChain embeddings object so repeated texts are served from an EmbeddingCache.
+
+    Only texts that miss the cache are sent to the wrapped model, in one
+    embed_documents call per request; results come back in input order.
+    lookup() and embed_uncached() expose the two halves separately for
+    PipelinedEmbedder, which rate-limits only the texts it actually sends.
+    """
+
+    def __init__(self, embeddings, cache: EmbeddingCache, model: str, dimensions: Optional[int] = None):
+        """
+        Initialize cached embeddings.
+
+        Args:
+            embeddings: LangChain embeddings object (e.g. OpenAIEmbeddings)
+            cache: Persistent cache
+            model: Embedding model name (part of the cache key)
+            dimensions: Requested output dimensions (part of the cache key)
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.dimensions = dimensions
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look texts up in the cache without calling the API.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Cached vector per text, None where it is not cached
+        """
+        keys = [self.cache.make_key(self.model, self.dimensions, text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        # A miss is a text that has to be sent to the API (duplicates are embedded once)
+        misses = len({key for key in keys if key not in found})
+        with self._lock:
+            self.misses += misses
+            self.hits += len(texts) - misses
+        return [found.get(key) for key in keys]
+
+    def embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with the API (no lookup) and store the results.
+
+        Args:
+            texts: Texts known to be missing from the cache
+
+        Returns:
+            One vector per text, in order
+        """
+        unique = list(dict.fromkeys(texts))
+        vectors = dict(zip(unique, self.embeddings.embed_documents(unique)))
+        self.cache.put_many({
+            self.cache.make_key(self.model, self.dimensions, text): vector
+            for text, vector in vectors.items()
+        })
+        return [vectors[text] for text in texts]
+
+    def remember(self, vectors: Dict[str, List[float]]):
+        """
+        Store vectors computed elsewhere with this model and dimensions (e.g. read back from ChromaDB).
+
+        Args:
+            vectors: Vector per text
+        """
+        self.cache.put_many({
+            self.cache.make_key(self.model, self.dimensions, text): vector
+            for text, vector in vectors.items()
+        })
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, calling the API only for texts not in the cache.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        vectors = self.lookup(texts)
+        missing = [text for text, vector in zip(texts, vectors) if vector is None]
+        if missing:
+            computed = iter(self.embed_uncached(missing))
+            vectors = [vector if vector is not None else next(computed) for vector in vectors]
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single text through the cache."""
+        return self.embed_documents([text])[0]
+
+    def report(self) -> str:
+        """One-line hit/miss summary for ingestion logs."""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return (f"Embedding cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+                f"{len(self.cache)} entries in {self.cache.path}")
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU of query embeddings keyed on (model, normalized text).
+
+    Vectors are held as float32 numpy arrays (half the size of Python float
+    lists) and returned as lists, the form ChromaDB and LangChain expect.
+    """
+
+    def __init__(self, model: str, max_entries: int = 2048):
+        """
+        Initialize query embedding cache.
+
+        Args:
+            model: Embedding model name (part of the key)
+            max_entries: Maximum cached queries
+        """
+        self.model = model
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> tuple:
+        """Case and whitespace insensitive key."""
+        return (self.model, " ".join(text.lower().split()))
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for a query, or None."""
+        key = self._key(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return vector.tolist()
+
+    def put(self, text: str, embedding: List[float]):
+        """Cache the embedding of a query, evicting the least recently used beyond capacity."""
+        if self.max_entries <= 0:
+            return
+        key = self._key(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def open_embedding_cache(db_path: str, path: Optional[str] = None, max_mb: int = DEFAULT_MAX_MB) -> EmbeddingCache:
+    """
+    Open the embedding cache used by ingestion.
+
+    The location defaults to a file inside the ChromaDB directory, so it
+    lives on the same persistent disk (and stays out of the source tree);
+    deleting a collection keeps it.
+
+    Args:
+        db_path: ChromaDB directory
+        path: Cache file (settings.embedding_cache_path; None = inside db_path)
+        max_mb: Size budget in MB (settings.embedding_cache_max_mb)
+
+    Returns:
+        Opened cache
+    """
+    return EmbeddingCache(path or str(Path(db_path) / DEFAULT_CACHE_FILE), max_bytes=max_mb * 1024 * 1024)
@@ -0,0 +1,135 @@
+"""Reduced-dimension embeddings and the dimension stamp on ChromaDB collections.
+
+text-embedding-3 models are trained Matryoshka-style: the first d components
+of a vector, re-normalized to unit length, are themselves a usable
+d-dimension embedding. The API's `dimensions` parameter returns exactly that,
+so a collection can be built at 256/512/1024 dimensions for a fraction of the
+disk, HNSW memory and query cost of the full 3072.
+
+Vectors of different sizes cannot be compared, so every collection records
+the model and dimension count it was built with in its metadata, and both
+ingestion and the API check it before adding to or querying a collection.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MODEL_KEY = "embedding_model"
+DIMENSIONS_KEY = "embedding_dimensions"
+
+# Full output size of OpenAI embedding models
+NATIVE_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
+
+# Models that accept the `dimensions` parameter
+REDUCIBLE_MODELS = frozenset({"text-embedding-3-large", "text-embedding-3-small"})
+
+
+class EmbeddingDimensionMismatch(ValueError):
+    """Raised when a collection was built with a different model or dimension count."""
+
+
+def resolve_dimensions(model: str, dimensions: Optional[int]) -> Optional[int]:
+    """
+    Validate a configured dimension count for a model.
+
+    Args:
+        model: Embedding model name
+        dimensions: Requested dimensions (None = the model's full size)
+
+    Returns:
+        Dimension count of the model's vectors (None for an unknown model at its full size)
+
+    Raises:
+        ValueError: If the model cannot produce the requested size
+    """
+    native = NATIVE_DIMENSIONS.get(model)
+    if dimensions is None:
+        return native
+    if model not in REDUCIBLE_MODELS:
+        if dimensions == native:
+            return dimensions
+        raise ValueError(f"{model} does not support reduced dimensions")
+    if not 0 < dimensions <= native:
+        raise ValueError(f"{model} supports 1-{native} dimensions, got {dimensions}")
+    return dimensions
+
+
+def truncate_embeddings(vectors, dimensions: int) -> np.ndarray:
+    """
+    Shorten embeddings to their first `dimensions` components and re-normalize.
+
+    Equivalent to requesting `dimensions` from the API, so existing
+    full-size vectors can be reduced without re-embedding.
+
+    Args:
+        vectors: Embedding vectors (n x full_dimensions)
+        dimensions: Target dimension count
+
+    Returns:
+        float32 array of unit vectors (n x dimensions)
+    """
+    truncated = np.asarray(vectors, dtype=np.float32)[:, :dimensions]
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    return truncated / np.maximum(norms, 1e-12)
+
+
+def dimension_metadata(model: str, dimensions: Optional[int]) -> Dict[str, Any]:
+    """Collection metadata entries recording how its vectors were produced."""
+    metadata = {MODEL_KEY: model}
+    if dimensions is not None:
+        metadata[DIMENSIONS_KEY] = dimensions
+    return metadata
+
+
+def check_collection_dimensions(collection, model: str, dimensions: Optional[int]) -> Optional[int]:
+    """
+    Verify that a collection was built with this model and dimension count.
+
+    Collections created before the stamp existed are checked against the
+    size of a stored vector, then stamped.
+
+    Args:
+        collection: ChromaDB collection
+        model: Embedding model used for queries
+        dimensions: Dimension count of query embeddings
+
+    Returns:
+        The collection's dimension count (None if empty and unstamped)
+
+    Raises:
+        EmbeddingDimensionMismatch: If the collection's vectors are incompatible
+    """
+    metadata = dict(collection.metadata or {})
+    recorded_model = metadata.get(MODEL_KEY)
+    recorded = metadata.get(DIMENSIONS_KEY)
+
+    if recorded is None:
+        recorded = _stored_dimensions(collection)
+        if recorded is None:
+            recorded = dimensions
+        elif recorded_model is None:
+            recorded_model = model  # Legacy collections were all built with the configured model
+
+        if recorded is not None:
+            metadata.update(dimension_metadata(recorded_model or model, recorded))
+            collection.modify(metadata=metadata)
+            print(f"[EMBEDDINGS] Recorded {recorded} dimensions on collection '{collection.name}'")
+
+    if recorded != dimensions or (recorded_model and recorded_model != model):
+        raise EmbeddingDimensionMismatch(
+            f"Collection '{collection.name}' holds {recorded_model} vectors with {recorded} dimensions, "
+            f"but queries use {model} with {dimensions}; re-ingest it or set EMBEDDING_DIMENSIONS={recorded}"
+        )
+    return recorded
+
+
+def _stored_dimensions(collection) -> Optional[int]:
+    """Size of one stored vector (None for an empty collection)."""
+    if not collection.count():
+        return None
+    embeddings: List = collection.peek(limit=1)["embeddings"]
+    return len(embeddings[0]) if embeddings is not None and len(embeddings) else None
@@ -0,0 +1,158 @@
+"""Embedding providers.
+
+Every provider returns a LangChain `Embeddings` object that also exposes
+`model` and `dimensions` (None = the model's full size); output_dimensions
+gives the size that names its vectors in collection metadata and in the
+embedding caches. "openai" calls the OpenAI embeddings API;
+"hashing" is a deterministic local embedder that needs no network and no
+model files, for offline ingestion, tests and benchmarks, or as a cheap
+first-stage retriever (see retrieval.first_stage). Further backends (e.g. an
+ONNX sentence model) plug in with register_embedding_provider.
+"""
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .embedding_dimensions import NATIVE_DIMENSIONS, REDUCIBLE_MODELS, resolve_dimensions
+
+HASHING_MODEL = "hashing-v1"
+DEFAULT_HASHING_DIMENSIONS = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['.-][a-z0-9]+)*")
+
+# Function words that would otherwise dominate hashed bag-of-words similarity
+_STOP_WORDS = frozenset(
+    "a an and are as at be been but by can could do does for from had has have how i if in into is it its "
+    "may must not of on or our shall should so such than that the their them then there these they this "
+    "to was were what when where which who why will with would you your".split()
+)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic feature-hashing embedder.
+
+    Word unigrams and bigrams (minus stop words) are hashed into a fixed
+    number of signed buckets with sublinear term-frequency weights, then
+    L2-normalized. Similar wording gives similar vectors; there is no
+    notion of synonyms, so it suits candidate generation and offline runs
+    rather than replacing a trained model's ranking.
+    """
+
+    def __init__(self, dimensions: Optional[int] = None):
+        """
+        Initialize hashing embeddings.
+
+        Args:
+            dimensions: Number of hash buckets (default 1024)
+        """
+        self.model = HASHING_MODEL
+        self.dimensions = dimensions or DEFAULT_HASHING_DIMENSIONS
+        if self.dimensions <= 0:
+            raise ValueError(f"Hashing embeddings need a positive dimension count, got {self.dimensions}")
+
+    def _features(self, text: str) -> Counter:
+        """Unigram and bigram counts of a text."""
+        tokens = [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOP_WORDS]
+        return Counter(tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])])
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed one text."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            sign = 1.0 if digest >> 63 else -1.0
+            vector[digest % self.dimensions] += sign * (1.0 + math.log(count))
+
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed document texts."""
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query."""
+        return self._embed(text)
+
+
+def _openai_provider(model: str, dimensions: Optional[int], api_key: Optional[str]) -> Embeddings:
+    """OpenAI embeddings API (text-embedding-3 models support reduced dimensions)."""
+    from langchain_openai import OpenAIEmbeddings
+
+    resolve_dimensions(model, dimensions)  # Fail at startup on a size the model cannot produce
+    return OpenAIEmbeddings(
+        model=model,
+        dimensions=dimensions if model in REDUCIBLE_MODELS else None,  # Only sent when set explicitly
+        openai_api_key=api_key
+    )
+
+
+def _hashing_provider(model: str, dimensions: Optional[int], api_key: Optional[str]) -> Embeddings:
+    """Local feature-hashing embeddings (model name and API key are ignored)."""
+    return HashingEmbeddings(dimensions)
+
+
+EMBEDDING_PROVIDERS: Dict[str, Callable[[str, Optional[int], Optional[str]], Embeddings]] = {
+    "openai": _openai_provider,
+    "hashing": _hashing_provider,
+}
+
+
+def register_embedding_provider(name: str, factory: Callable[[str, Optional[int], Optional[str]], Embeddings]):
+    """
+    Make an embedding backend selectable by name.
+
+    Args:
+        name: Provider name used in settings (EMBEDDING_PROVIDER)
+        factory: Called as factory(model, dimensions, api_key); must return an
+            Embeddings object with `model` and `dimensions` attributes
+    """
+    EMBEDDING_PROVIDERS[name] = factory
+
+
+def output_dimensions(embeddings: Embeddings) -> Optional[int]:
+    """
+    Size of the vectors an embeddings object produces.
+
+    Args:
+        embeddings: Object returned by create_embeddings
+
+    Returns:
+        Dimension count (None for an unknown model at its full size)
+    """
+    return embeddings.dimensions or NATIVE_DIMENSIONS.get(embeddings.model)
+
+
+def create_embeddings(
+    provider: str,
+    model: str,
+    dimensions: Optional[int] = None,
+    api_key: Optional[str] = None
+) -> Embeddings:
+    """
+    Create embeddings for a configured provider.
+
+    Args:
+        provider: Provider name ("openai", "hashing", or a registered one)
+        model: Model name (for providers that have several)
+        dimensions: Output dimensions (None = the provider's default)
+        api_key: API key (for remote providers)
+
+    Returns:
+        Embeddings object with `model` and `dimensions` attributes
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    factory = EMBEDDING_PROVIDERS.get(provider)
+    if factory is None:
+        raise ValueError(f"Unknown embedding provider '{provider}' (available: {', '.join(EMBEDDING_PROVIDERS)})")
+    return factory(model, dimensions, api_key)
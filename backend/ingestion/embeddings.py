@@ -1,36 +1,167 @@
 """Embedding generation and vector database management."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import chromadb
-from chromadb.config import Settings as ChromaSettings
-from langchain_openai import OpenAIEmbeddings
-from typing import List, Dict
+from chromadb.api.client import SharedSystemClient
+from typing import Any, Callable, List, Dict, Optional, Union
 from pathlib import Path
+from .batch_embedder import PipelinedEmbedder
+from .chroma_settings import chroma_settings
+from .corpus_version import bump_corpus_version
+from .embedding_cache import DEFAULT_MAX_MB, CachedEmbeddings, QueryEmbeddingCache, open_embedding_cache
+from .embedding_dimensions import check_collection_dimensions, dimension_metadata
+from .embedding_providers import create_embeddings, output_dimensions
+from .incremental import ChunkManifest, SyncReport, clear_source, sync_collection
+from .vector_query import MultiCollectionResult, build_hits
+
+
+HISTORICAL_COLLECTION = "historical_audits"
 
 
 class EmbeddingManager:
     """Manage embeddings and ChromaDB operations."""
 
-    def __init__(self, db_path: str, openai_api_key: str, embedding_model: str = "text-embedding-3-large"):
+    def __init__(
+        self,
+        db_path: str,
+        openai_api_key: str,
+        embedding_model: str = "text-embedding-3-large",
+        admission=None,  # AdmissionGate limiting concurrent query-time embedding calls (optional)
+        query_cache_size: int = 2048,
+        dimensions: Optional[int] = None,  # Reduced output size (e.g. 256/512/1024); None = model's full size
+        provider: str = "openai",  # Embedding backend (see ingestion.embedding_providers)
+        embedding_cache_path: Optional[str] = None,  # Ingestion embedding cache file (None = inside db_path)
+        embedding_cache_max_mb: int = DEFAULT_MAX_MB,  # Ingestion embedding cache size budget
+        embedder_options: Optional[Dict[str, int]] = None  # PipelinedEmbedder batch/rate limits (None = its defaults)
+    ):
         self.db_path = Path(db_path)
+        self.admission = admission
+        self.embedding_cache_path = embedding_cache_path
+        self.embedding_cache_max_mb = embedding_cache_max_mb
+        self.embedder_options = embedder_options or {}
         self.db_path.mkdir(parents=True, exist_ok=True)
 
-        # Initialize ChromaDB client
+        # Initialize ChromaDB client (safe to query from several threads, see chroma_settings)
         self.client = chromadb.PersistentClient(
             path=str(self.db_path),
-            settings=ChromaSettings(anonymized_telemetry=False)
+            settings=chroma_settings()
         )
 
-        # Initialize OpenAI embeddings
-        self.embeddings = OpenAIEmbeddings(
-            model=embedding_model,
-            openai_api_key=openai_api_key
+        # Initialize embeddings (OpenAI by default; "hashing" runs locally without network access)
+        self.embeddings = create_embeddings(provider, embedding_model, dimensions, openai_api_key)
+        self.embedding_model = self.embeddings.model
+        self.dimensions = output_dimensions(self.embeddings)
+        self._document_embedder = None  # Opened on first ingest (query-time use doesn't need it)
+        self.first_stage = None  # Optional FirstStageIndex (local candidate retrieval ahead of rescoring)
+        self._query_executor = None  # Created on first query_many
+
+        # Repeated questions skip the embeddings API round trip
+        self.query_cache = QueryEmbeddingCache(f"{self.embedding_model}/{self.dimensions}", max_entries=query_cache_size)
+
+        # Get or create collection (a new collection is stamped with the embedding dimensions)
+        self.collection = self._get_or_create_collection()
+
+    @classmethod
+    def from_settings(cls, settings, **kwargs) -> "EmbeddingManager":
+        """
+        Create a manager for the configured database, embedding provider, model, dimensions,
+        embedding cache and ingestion batch/rate limits.
+
+        Every process that writes or queries vectors must use the same
+        embedding configuration, so they all build their manager from
+        the application settings.
+
+        Args:
+            settings: Application settings (config.settings)
+            **kwargs: Other constructor arguments (admission, query_cache_size)
+
+        Returns:
+            The manager
+        """
+        return cls(
+            db_path=settings.chroma_db_path,
+            openai_api_key=settings.openai_api_key,
+            embedding_model=settings.embedding_model,
+            dimensions=settings.embedding_dimensions,
+            provider=settings.embedding_provider,
+            embedding_cache_path=settings.embedding_cache_path,
+            embedding_cache_max_mb=settings.embedding_cache_max_mb,
+            embedder_options=PipelinedEmbedder.options_from_settings(settings),
+            **kwargs
         )
 
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
+    def reconnect(self):
+        """
+        Replace the ChromaDB client with a new one that reads the database as it is on disk now.
+
+        chromadb shares one system per path within a process and keeps each
+        collection's HNSW index in memory, so writes by other processes
+        (ingestion jobs, CLI scripts) never show up in vector searches through
+        an open client. Collections opened before this call keep working on
+        the previous client; reopen them from the new one.
+        """
+        SharedSystemClient.clear_system_cache()
+        self.client = chromadb.PersistentClient(
+            path=str(self.db_path),
+            settings=chroma_settings()
+        )
+
+    def _get_or_create_collection(self):
+        """Open the compliance guide collection, creating it stamped with this model's dimensions."""
+        return self.client.get_or_create_collection(
             name="fta_compliance_guide",
-            metadata={"description": "FTA Compliance Guide RAG Collection"}
+            metadata={
+                "description": "FTA Compliance Guide RAG Collection",
+                **dimension_metadata(self.embedding_model, self.dimensions)
+            }
         )
 
+    def open_historical_collection(self):
+        """
+        Open the historical audits collection, creating it stamped with this model's dimensions.
+
+        Returns:
+            The collection
+
+        Raises:
+            EmbeddingDimensionMismatch: If it holds vectors of another model or dimensions
+        """
+        collection = self.client.get_or_create_collection(
+            name=HISTORICAL_COLLECTION,
+            metadata={
+                "description": "Historical FTA audit review narratives for semantic search",
+                **dimension_metadata(self.embedding_model, self.dimensions)
+            }
+        )
+        check_collection_dimensions(collection, self.embedding_model, self.dimensions)
+        return collection
+
+    def get_collection(self, name: str):
+        """
+        Open another collection of this database.
+
+        Args:
+            name: Collection name
+
+        Returns:
+            The collection
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        return self.client.get_collection(name)
+
+    def check_dimensions(self):
+        """
+        Verify the collection was built with the configured model and dimensions.
+
+        Raises:
+            EmbeddingDimensionMismatch: If stored vectors cannot be compared with query embeddings
+        """
+        check_collection_dimensions(self.collection, self.embedding_model, self.dimensions)
+
     def get_collection_count(self) -> int:
         """Get count of documents in collection."""
         return self.collection.count()
@@ -38,42 +169,140 @@ class EmbeddingManager:
     def clear_collection(self):
         """Clear all documents from collection."""
         self.client.delete_collection("fta_compliance_guide")
-        self.collection = self.client.get_or_create_collection(
-            name="fta_compliance_guide",
-            metadata={"description": "FTA Compliance Guide RAG Collection"}
-        )
+        self.collection = self._get_or_create_collection()
+        self.manifest().clear()
+        bump_corpus_version(str(self.db_path), "fta_compliance_guide cleared")
+
+    def clear_source(self, source: str, adopt: Optional[Callable[[str, Dict], bool]] = None) -> int:
+        """
+        Delete the compliance guide chunks one ingest source wrote (other sources' chunks are kept).
+
+        Args:
+            source: Ingest source (see sync_documents)
+            adopt: Recognizes the source's chunks stored before sources were recorded (see sync_documents)
 
-    def ingest_documents(self, documents: List[Dict[str, any]], batch_size: int = 10):
+        Returns:
+            Number of chunks deleted
+        """
+        return clear_source(self.collection, self.manifest(), source, adopt=adopt)
+
+    def ingest_documents(self, documents: List[Dict[str, any]], batch_size: Optional[int] = None):
         """
         Ingest documents into ChromaDB with embeddings.
 
+        Embedding runs in token-bounded batches, several in flight at once
+        (see pipelined_embedder), and each
+        batch is written to ChromaDB while the next ones are being embedded.
+
         Args:
             documents: List of dicts with 'text' and 'metadata' keys
-            batch_size: Number of documents to process at once
+            batch_size: Maximum documents per batch (default: settings.embed_max_batch_size)
         """
         print(f"Ingesting {len(documents)} documents into ChromaDB...")
+        self.check_dimensions()
 
-        # Process in batches
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i + batch_size]
-            texts = [doc["text"] for doc in batch]
-            metadatas = [doc["metadata"] for doc in batch]
-            ids = [doc["metadata"]["chunk_id"] for doc in batch]
-
-            print(f"Processing batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}...")
+        embedder = self.pipelined_embedder(**({"max_batch_size": batch_size} if batch_size else {}))
 
-            # Generate embeddings
-            embedding_vectors = self.embeddings.embed_documents(texts)
-
-            # Add to ChromaDB
+        def write_batch(start: int, end: int, embedding_vectors: List[List[float]]):
+            batch = documents[start:end]
             self.collection.add(
-                ids=ids,
+                ids=[doc["metadata"]["chunk_id"] for doc in batch],
                 embeddings=embedding_vectors,
-                documents=texts,
-                metadatas=metadatas
+                documents=[doc["text"] for doc in batch],
+                metadatas=[doc["metadata"] for doc in batch]
             )
+            print(f"Stored documents {start + 1}-{end}/{len(documents)}")
+
+        # Unchanged texts come from the embedding cache and are never sent
+        embedder.run([doc["text"] for doc in documents], sink=write_batch)
 
+        bump_corpus_version(str(self.db_path), f"fta_compliance_guide ingested {len(documents)} documents")
         print(f"Ingestion complete! Total documents in collection: {self.get_collection_count()}")
+        print(self.document_embedder.report())
+
+    def manifest(self) -> ChunkManifest:
+        """Chunk manifest of the compliance guide collection."""
+        return ChunkManifest(str(self.db_path), "fta_compliance_guide")
+
+    def sync_documents(
+        self,
+        documents: List[Dict[str, any]],
+        source: str,
+        sources: Optional[Dict[str, str]] = None,
+        batch_size: Optional[int] = None,
+        adopt: Optional[Callable[[str, Dict], bool]] = None
+    ) -> SyncReport:
+        """
+        Incrementally make the collection hold exactly these documents for one ingest source.
+
+        Only new or changed chunks (by hash of text and metadata) are
+        embedded and upserted, and chunks this source no longer produces
+        are deleted; other sources' chunks are kept. The corpus version is
+        bumped only if something changed.
+
+        Args:
+            documents: List of dicts with 'text' and 'metadata' keys (metadata must include 'chunk_id')
+            source: Ingest source that owns the documents (e.g. the script's name)
+            sources: Source fingerprints to record in the manifest (e.g. PDF hash)
+            batch_size: Maximum documents per batch (default: settings.embed_max_batch_size)
+            adopt: Called with (chunk ID, stored metadata) of chunks stored before
+                sources were recorded; True for the ones this source wrote
+
+        Returns:
+            What changed
+        """
+        print(f"Syncing {len(documents)} documents into ChromaDB...")
+        self.check_dimensions()
+
+        report = sync_collection(
+            self.collection,
+            ids=[doc["metadata"]["chunk_id"] for doc in documents],
+            texts=[doc["text"] for doc in documents],
+            metadatas=[doc["metadata"] for doc in documents],
+            embedder=self.pipelined_embedder(**({"max_batch_size": batch_size} if batch_size else {})),
+            manifest=self.manifest(),
+            source=source,
+            sources=sources,
+            adopt=adopt
+        )
+        print(self.document_embedder.report())
+        return report
+
+    @property
+    def document_embedder(self) -> CachedEmbeddings:
+        """Document embedder backed by the persistent embedding cache."""
+        if self._document_embedder is None:
+            self._document_embedder = CachedEmbeddings(
+                self.embeddings,
+                open_embedding_cache(str(self.db_path), self.embedding_cache_path, self.embedding_cache_max_mb),
+                model=self.embedding_model,
+                dimensions=self.dimensions
+            )
+        return self._document_embedder
+
+    def pipelined_embedder(self, **overrides) -> PipelinedEmbedder:
+        """
+        Pipelined embedder over the document embedder, with this manager's batch and rate limits.
+
+        Args:
+            **overrides: PipelinedEmbedder options taking precedence (e.g. max_batch_size)
+
+        Returns:
+            The embedder
+        """
+        return PipelinedEmbedder(self.document_embedder, **{**self.embedder_options, **overrides})
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed document texts for ingestion, only calling the API for texts not seen before.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per text, in order
+        """
+        return self.document_embedder.embed_documents(texts)
 
     def query_collection(self, query_text: str, n_results: int = 5, filter_metadata: Dict = None):
         """
@@ -88,13 +317,180 @@ class EmbeddingManager:
             Query results from ChromaDB
         """
         # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query_text)
+        query_embedding = self.embed_query(query_text)
+
+        return self.query_by_embedding(query_embedding, n_results, filter_metadata, query_text)
 
-        # Query ChromaDB
-        results = self.collection.query(
+    def query_by_embedding(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        filter_metadata: Dict = None,
+        query_text: Optional[str] = None
+    ):
+        """
+        Query the collection with a precomputed query embedding.
+
+        Args:
+            query_embedding: Embedding vector of the query
+            n_results: Number of results to return
+            filter_metadata: Optional metadata filter
+            query_text: The query string; when given, an up-to-date first stage
+                picks candidates locally and query_embedding only ranks them
+
+        Returns:
+            Query results from ChromaDB
+        """
+        if query_text and not filter_metadata and self.first_stage and self.first_stage.is_current():
+            return self.first_stage.search(query_text, query_embedding, n_results)
+
+        return self.collection.query(
             query_embeddings=[query_embedding],
             n_results=n_results,
             where=filter_metadata
         )
 
-        return results
+    def query_many(
+        self,
+        collections: Dict[str, Any],
+        embedding: List[float],
+        per_collection_k: Union[int, Dict[str, int]] = 5,
+        filters: Optional[Dict[str, Dict]] = None,
+        query_text: Optional[str] = None
+    ) -> MultiCollectionResult:
+        """
+        Search several collections with one query embedding.
+
+        Each collection's search, including its ChromaDB query, runs on the
+        query thread pool, so the searches overlap and the slowest one sets
+        the latency. Hits from all collections are ranked
+        together on cosine similarity (see vector_query.build_hits).
+
+        Args:
+            collections: ChromaDB collections by label (the label becomes VectorHit.collection)
+            embedding: Query embedding shared by all searches
+            per_collection_k: Results per collection, or per label
+            filters: Optional metadata filter per label
+            query_text: The query string, which enables the first stage for this manager's collection
+
+        Returns:
+            Ranked hits from all collections
+        """
+        filters = filters or {}
+
+        def search(label: str, collection):
+            start_time = time.time()
+            k = per_collection_k.get(label, 5) if isinstance(per_collection_k, dict) else per_collection_k
+            if collection is self.collection:
+                results = self.query_by_embedding(embedding, k, filters.get(label), query_text)
+            else:
+                results = collection.query(query_embeddings=[embedding], n_results=k, where=filters.get(label))
+            space = (collection.metadata or {}).get("hnsw:space", "l2")
+            return build_hits(label, results, space), (time.time() - start_time) * 1000
+
+        futures = {label: self._query_pool.submit(search, label, collection) for label, collection in collections.items()}
+        result = MultiCollectionResult()
+        for label, future in futures.items():
+            hits, elapsed_ms = future.result()
+            result.hits.extend(hits)
+            result.latency_ms[label] = round(elapsed_ms, 2)
+        result.hits.sort(key=lambda hit: (-hit.similarity, hit.distance))
+        return result
+
+    async def aquery_many(
+        self,
+        collections: Dict[str, Any],
+        embedding: List[float],
+        per_collection_k: Union[int, Dict[str, int]] = 5,
+        filters: Optional[Dict[str, Dict]] = None,
+        query_text: Optional[str] = None
+    ) -> MultiCollectionResult:
+        """Async variant of query_many (the searches themselves run on the query thread pool)."""
+        return await asyncio.to_thread(self.query_many, collections, embedding, per_collection_k, filters, query_text)
+
+    @property
+    def _query_pool(self) -> ThreadPoolExecutor:
+        """Threads for per-collection searches."""
+        if self._query_executor is None:
+            self._query_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vector-query")
+        return self._query_executor
+
+    def embed_query(self, query_text: str) -> List[float]:
+        """
+        Embed a query (blocking).
+
+        Args:
+            query_text: The query string
+
+        Returns:
+            Query embedding vector
+        """
+        cached = self.query_cache.get(query_text)
+        if cached is not None:
+            return cached
+
+        with self.admission.slot() if self.admission else nullcontext():
+            embedding = self.embeddings.embed_query(query_text)
+        self.query_cache.put(query_text, embedding)
+        return embedding
+
+    async def aembed_query(self, query_text: str) -> List[float]:
+        """
+        Embed a query without blocking the event loop.
+
+        Args:
+            query_text: The query string
+
+        Returns:
+            Query embedding vector
+        """
+        cached = self.query_cache.get(query_text)
+        if cached is not None:
+            return cached
+
+        async with self.admission.aslot() if self.admission else nullcontext():
+            embedding = await self.embeddings.aembed_query(query_text)
+        self.query_cache.put(query_text, embedding)
+        return embedding
+
+    async def aquery_collection(self, query_text: str, n_results: int = 5, filter_metadata: Dict = None):
+        """
+        Async variant of query_collection.
+
+        The embedding call is awaited natively; the ChromaDB client is synchronous,
+        so the vector search itself runs in a worker thread.
+
+        Args:
+            query_text: The query string
+            n_results: Number of results to return
+            filter_metadata: Optional metadata filter
+
+        Returns:
+            Query results from ChromaDB
+        """
+        query_embedding = await self.aembed_query(query_text)
+
+        return await asyncio.to_thread(self.query_by_embedding, query_embedding, n_results, filter_metadata, query_text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts in a single API call without blocking the event loop.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per text, in order
+        """
+        cached = [self.query_cache.get(text) for text in texts]
+        missing = [text for text, vector in zip(texts, cached) if vector is None]
+
+        if missing:
+            async with self.admission.aslot() if self.admission else nullcontext():
+                vectors = await self.embeddings.aembed_documents(missing)
+            for text, vector in zip(missing, vectors):
+                self.query_cache.put(text, vector)
+            computed = iter(vectors)
+            cached = [vector if vector is not None else next(computed) for vector in cached]
+
+        return cached
@@ -0,0 +1,360 @@
+"""Incremental, manifest-driven ingestion.
+
+Each collection has a manifest mapping chunk ID to a hash of the chunk's
+text and metadata. Several ingest scripts can write to one collection, so
+every chunk is tagged with the source that wrote it (SOURCE_KEY metadata).
+Syncing a source's chunks upserts only new or changed chunks, deletes IDs
+that source no longer produces (never another source's), and bumps the
+corpus version when anything changed; unchanged chunks are not re-embedded.
+Re-embedding is cheap even when chunk IDs shift, since unchanged texts come
+from the embedding cache (or from the stored vectors of the chunks they
+replace). Chunks stored before sources were recorded are untagged; a source
+adopts the ones it recognizes as its own (see sync_collection).
+"""
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .batch_embedder import PipelinedEmbedder
+from .corpus_version import bump_corpus_version
+from .embedding_cache import CachedEmbeddings
+
+MANIFEST_DIR = "manifests"
+SOURCE_KEY = "ingest_source"  # Chunk metadata naming the ingest source that owns the chunk
+_PAGE = 1000
+
+
+def chunk_hash(text: str, metadata: Dict[str, Any]) -> str:
+    """Hash of what is stored for a chunk (text and metadata, apart from the source tag)."""
+    metadata = {key: value for key, value in metadata.items() if key != SOURCE_KEY}
+    payload = json.dumps({"text": text, "metadata": metadata}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class SyncReport:
+    """What a sync changed."""
+    added: int = 0
+    changed: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+    deleted_ids: List[str] = field(default_factory=list)
+
+    @property
+    def modified(self) -> bool:
+        return bool(self.added or self.changed or self.deleted)
+
+    def summary(self) -> str:
+        return (f"{self.added} added, {self.changed} changed, {self.deleted} deleted, "
+                f"{self.unchanged} unchanged in {self.seconds:.1f}s")
+
+
+class ChunkManifest:
+    """Chunk hashes (and source file fingerprints) of one collection, stored as JSON next to ChromaDB."""
+
+    def __init__(self, db_path: str, collection_name: str):
+        """
+        Initialize manifest.
+
+        Args:
+            db_path: ChromaDB directory
+            collection_name: Collection the manifest describes
+        """
+        self.db_path = str(db_path)
+        self.collection_name = collection_name
+        self.path = Path(db_path) / MANIFEST_DIR / f"{collection_name}.json"
+        self.chunks: Dict[str, str] = {}
+        self.owners: Dict[str, str] = {}  # Chunk ID -> ingest source (untagged chunks are absent)
+        self.sources: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+            self.chunks = data.get("chunks", {})
+            self.owners = data.get("owners", {})
+            self.sources = data.get("sources", {})
+        except (OSError, ValueError):
+            self.chunks, self.owners, self.sources = {}, {}, {}
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({
+            "collection": self.collection_name,
+            "updated_at": time.time(),
+            "sources": self.sources,
+            "chunks": self.chunks,
+            "owners": self.owners,
+        }))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Forget every chunk and source (e.g. after the collection was deleted)."""
+        self.chunks, self.owners, self.sources = {}, {}, {}
+        self.path.unlink(missing_ok=True)
+
+    def owned_by(self, source: str) -> List[str]:
+        """IDs of the chunks an ingest source wrote."""
+        return [chunk_id for chunk_id, owner in self.owners.items() if owner == source]
+
+    def source_unchanged(self, name: str, fingerprint: str) -> bool:
+        """True if a source was last synced with this fingerprint."""
+        return self.sources.get(name) == fingerprint
+
+    def describes(self, collection) -> bool:
+        """
+        True if the manifest lists exactly the chunk IDs the collection holds.
+
+        IDs are compared rather than counts: a full ingest that replaced
+        some chunks with as many others leaves the count unchanged.
+
+        Args:
+            collection: ChromaDB collection the manifest describes
+        """
+        count = collection.count()
+        if len(self.chunks) != count:
+            return False
+        stored = set()
+        for start in range(0, count, _PAGE):
+            stored.update(collection.get(include=[], limit=_PAGE, offset=start)["ids"])
+        return stored == self.chunks.keys()
+
+    def reconcile(self, collection):
+        """
+        Rebuild the manifest from the collection if they disagree.
+
+        Covers collections ingested before manifests existed, or written
+        by a full (non-incremental) ingest since the last sync.
+
+        Args:
+            collection: ChromaDB collection the manifest describes
+        """
+        if self.describes(collection):
+            return
+
+        count = collection.count()
+        print(f"[INCREMENTAL] Manifest for '{self.collection_name}' does not match the {count} chunks "
+              f"in the collection - rebuilding it from the collection")
+        chunks, owners = {}, {}
+        for start in range(0, count, _PAGE):
+            page = collection.get(include=["documents", "metadatas"], limit=_PAGE, offset=start)
+            for chunk_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                chunks[chunk_id] = chunk_hash(text, metadata or {})
+                if (metadata or {}).get(SOURCE_KEY):
+                    owners[chunk_id] = metadata[SOURCE_KEY]
+        self.chunks = chunks
+        self.owners = owners
+        self.sources = {}
+
+
+def adopt_untagged(collection, manifest: ChunkManifest, source: str,
+                   adopt: Callable[[str, Dict[str, Any]], bool]) -> Set[str]:
+    """
+    Make a source the owner of the untagged chunks it recognizes as its own.
+
+    Only the manifest records the new owner; sync_collection stores the
+    tag in the metadata of the adopted chunks it keeps.
+
+    Args:
+        collection: ChromaDB collection
+        manifest: The collection's manifest (reconciled)
+        source: Ingest source
+        adopt: Called with (chunk ID, stored metadata) of each untagged chunk
+
+    Returns:
+        IDs of the adopted chunks
+    """
+    untagged = [chunk_id for chunk_id in manifest.chunks if chunk_id not in manifest.owners]
+    adopted = set()
+    for start in range(0, len(untagged), _PAGE):
+        page = collection.get(ids=untagged[start:start + _PAGE], include=["metadatas"])
+        for chunk_id, metadata in zip(page["ids"], page["metadatas"]):
+            if adopt(chunk_id, metadata or {}):
+                adopted.add(chunk_id)
+                manifest.owners[chunk_id] = source
+    if adopted:
+        print(f"[INCREMENTAL] '{collection.name}': {source} adopted {len(adopted)} untagged chunks")
+    return adopted
+
+
+def clear_source(collection, manifest: ChunkManifest, source: str,
+                 adopt: Optional[Callable[[str, Dict[str, Any]], bool]] = None) -> int:
+    """
+    Delete every chunk one ingest source wrote, leaving other sources' chunks.
+
+    Args:
+        collection: ChromaDB collection
+        manifest: The collection's manifest
+        source: Ingest source whose chunks to delete
+        adopt: Recognizes the source's untagged chunks (see sync_collection)
+
+    Returns:
+        Number of chunks deleted
+    """
+    manifest.reconcile(collection)
+    if adopt:
+        adopt_untagged(collection, manifest, source, adopt)
+    owned = manifest.owned_by(source)
+    for start in range(0, len(owned), _PAGE):
+        batch = owned[start:start + _PAGE]
+        collection.delete(ids=batch)
+        for chunk_id in batch:
+            manifest.chunks.pop(chunk_id, None)
+            manifest.owners.pop(chunk_id, None)
+    manifest.save()
+
+    if owned:
+        bump_corpus_version(manifest.db_path, f"{collection.name}: {len(owned)} chunks of {source} cleared")
+    print(f"[INCREMENTAL] '{collection.name}': cleared {len(owned)} chunks of {source}")
+    return len(owned)
+
+
+def reuse_stored_vectors(collection, chunk_ids: List[str], texts: Set[str], embeddings: CachedEmbeddings):
+    """
+    Put the stored vectors of chunks about to be deleted into the embedding cache, for texts that moved to new IDs.
+
+    Args:
+        collection: ChromaDB collection
+        chunk_ids: IDs of the chunks being deleted
+        texts: Texts about to be embedded
+        embeddings: Cached embeddings the sync embeds with
+    """
+    reused = {}
+    for start in range(0, len(chunk_ids), _PAGE):
+        page = collection.get(ids=chunk_ids[start:start + _PAGE], include=["documents", "embeddings"])
+        for text, vector in zip(page["documents"], page["embeddings"]):
+            if text in texts:
+                reused[text] = [float(value) for value in vector]
+    embeddings.remember(reused)
+
+
+def sync_collection(
+    collection,
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    embedder: PipelinedEmbedder,
+    manifest: ChunkManifest,
+    source: str,
+    sources: Optional[Dict[str, str]] = None,
+    adopt: Optional[Callable[[str, Dict[str, Any]], bool]] = None
+) -> SyncReport:
+    """
+    Make a collection hold exactly these chunks for one ingest source, writing only what changed.
+
+    Chunks written by other sources are left alone, and so are untagged
+    chunks from before sources were recorded unless adopt recognizes them:
+    adopted chunks belong to this source from then on, so the ones it no
+    longer produces are deleted. Unchanged chunks stored without the
+    source tag get it through a metadata update, without re-embedding.
+
+    Args:
+        collection: ChromaDB collection
+        ids: Chunk IDs (unique)
+        texts: Chunk texts
+        metadatas: Chunk metadata (tagged with the source before storing)
+        embedder: Embeds new or changed chunks (its max_batch_size is also the upsert size)
+        manifest: The collection's manifest
+        source: Ingest source that owns these chunks (e.g. the script's name)
+        sources: Source fingerprints to record (see ChunkManifest.source_unchanged)
+        adopt: Called with (chunk ID, stored metadata) of each untagged chunk;
+            True if this source wrote it
+
+    Returns:
+        What changed
+
+    Raises:
+        ValueError: If chunk IDs are not unique or belong to another source
+    """
+    start_time = time.time()
+    if len(set(ids)) != len(ids):
+        raise ValueError("Chunk IDs must be unique")
+
+    manifest.reconcile(collection)
+    taken = sorted(chunk_id for chunk_id in ids if manifest.owners.get(chunk_id, source) != source)
+    if taken:
+        raise ValueError(f"{len(taken)} chunk IDs of '{source}' belong to another ingest source "
+                         f"(e.g. '{taken[0]}' of '{manifest.owners[taken[0]]}')")
+
+    tagged = dict(manifest.owners)  # Owners as stored in chunk metadata
+    if adopt:
+        adopt_untagged(collection, manifest, source, adopt)
+
+    metadatas = [{**metadata, SOURCE_KEY: source} for metadata in metadatas]
+    hashes = [chunk_hash(text, metadata) for text, metadata in zip(texts, metadatas)]
+
+    report = SyncReport()
+    pending, retag = [], []
+    for i, (chunk_id, digest) in enumerate(zip(ids, hashes)):
+        previous = manifest.chunks.get(chunk_id)
+        if previous == digest:
+            if tagged.get(chunk_id) != source:
+                retag.append(i)
+            report.unchanged += 1
+            continue
+        if previous is None:
+            report.added += 1
+        else:
+            report.changed += 1
+        pending.append(i)
+
+    wanted = set(ids)
+    report.deleted_ids = [chunk_id for chunk_id in manifest.owned_by(source) if chunk_id not in wanted]
+    report.deleted = len(report.deleted_ids)
+
+    for start in range(0, len(retag), _PAGE):
+        batch = retag[start:start + _PAGE]
+        collection.update(ids=[ids[i] for i in batch], metadatas=[metadatas[i] for i in batch])
+        for i in batch:
+            manifest.owners[ids[i]] = source
+
+    if pending and report.deleted_ids:
+        reuse_stored_vectors(collection, report.deleted_ids, {texts[i] for i in pending}, embedder.embeddings)
+
+    if pending:
+        def upsert_batch(start: int, end: int, vectors: List[List[float]]):
+            batch = pending[start:end]
+            collection.upsert(
+                ids=[ids[i] for i in batch],
+                embeddings=vectors,
+                documents=[texts[i] for i in batch],
+                metadatas=[metadatas[i] for i in batch]
+            )
+            for i in batch:
+                manifest.chunks[ids[i]] = hashes[i]
+                manifest.owners[ids[i]] = source
+
+        embedder.run([texts[i] for i in pending], sink=upsert_batch)
+
+    for start in range(0, len(report.deleted_ids), _PAGE):
+        batch = report.deleted_ids[start:start + _PAGE]
+        collection.delete(ids=batch)
+        for chunk_id in batch:
+            manifest.chunks.pop(chunk_id, None)
+            manifest.owners.pop(chunk_id, None)
+
+    if sources:
+        manifest.sources.update(sources)
+    manifest.save()
+
+    report.seconds = time.time() - start_time
+    if report.modified:
+        bump_corpus_version(manifest.db_path, f"{collection.name} synced from {source}: {report.summary()}")
+    print(f"[INCREMENTAL] '{collection.name}' ({source}): {report.summary()}")
+    return report
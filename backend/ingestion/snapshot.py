@@ -0,0 +1,242 @@
+"""Portable embedding snapshots of ChromaDB collections.
+
+A snapshot is one compressed NumPy archive (.npz) holding, per collection,
+columnar arrays of chunk IDs, documents and metadata (UTF-8 blobs plus
+offsets), the float32 vectors, and a JSON header with the collection's
+metadata (embedding model and dimension stamp, distance space), its chunk
+manifest sources and the corpus version it was exported at.
+
+Importing bulk-loads the vectors into ChromaDB without calling the embeddings
+API, rewrites the collection's chunk manifest so the next incremental ingest
+sees it as up to date, and seeds the embedding cache with the vectors.
+"""
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .corpus_version import bump_corpus_version, read_corpus_version
+from .embedding_cache import EmbeddingCache, open_embedding_cache
+from .embedding_dimensions import DIMENSIONS_KEY, MODEL_KEY, EmbeddingDimensionMismatch
+from .incremental import SOURCE_KEY, ChunkManifest, chunk_hash
+
+SNAPSHOT_FORMAT = 1
+_READ_PAGE = 1000
+_WRITE_BATCH = 5000
+
+
+@dataclass
+class CollectionSnapshot:
+    """One collection's contents as stored in a snapshot."""
+    name: str
+    metadata: Dict[str, Any]
+    ids: List[str]
+    documents: List[str]
+    metadatas: List[Dict[str, Any]]
+    vectors: np.ndarray  # n x dimensions, float32
+    sources: Dict[str, str] = field(default_factory=dict)  # Chunk manifest source fingerprints
+    corpus_version: Optional[str] = None
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.metadata.get(MODEL_KEY)
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        """Recorded dimension count (vector width for unstamped collections)."""
+        if DIMENSIONS_KEY in self.metadata:
+            return self.metadata[DIMENSIONS_KEY]
+        return int(self.vectors.shape[1]) if len(self.ids) else None
+
+
+def _pack_strings(values: List[str]):
+    """UTF-8 blob and end offsets of a list of strings."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of _pack_strings."""
+    data = blob.tobytes()
+    starts = np.concatenate(([0], offsets[:-1])) if len(offsets) else offsets
+    return [data[start:end].decode("utf-8") for start, end in zip(starts.tolist(), offsets.tolist())]
+
+
+def read_collection(collection, db_path: Optional[str] = None) -> CollectionSnapshot:
+    """
+    Read a collection's chunks and vectors.
+
+    Args:
+        collection: ChromaDB collection
+        db_path: ChromaDB directory (to include manifest sources and corpus version)
+
+    Returns:
+        Snapshot of the collection
+    """
+    ids, documents, metadatas, rows = [], [], [], []
+    for start in range(0, collection.count(), _READ_PAGE):
+        page = collection.get(include=["embeddings", "documents", "metadatas"], limit=_READ_PAGE, offset=start)
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(metadata or {} for metadata in page["metadatas"])
+        rows.extend(page["embeddings"])
+
+    vectors = np.asarray(rows, dtype=np.float32).reshape(len(ids), -1) if ids else np.empty((0, 0), np.float32)
+    sources, version = {}, None
+    if db_path:
+        sources = ChunkManifest(db_path, collection.name).sources
+        version = read_corpus_version(db_path)
+    return CollectionSnapshot(collection.name, dict(collection.metadata or {}), ids, documents, metadatas,
+                              vectors, sources, version)
+
+
+def write_snapshot(path: str, snapshots: List[CollectionSnapshot]):
+    """
+    Write collections to a compressed snapshot file.
+
+    Args:
+        path: Output file (.npz)
+        snapshots: Collections to include
+    """
+    arrays = {}
+    header = {"format": SNAPSHOT_FORMAT, "exported_at": time.time(), "collections": []}
+    for i, snapshot in enumerate(snapshots):
+        prefix = f"c{i}_"
+        arrays[prefix + "ids"], arrays[prefix + "ids_offsets"] = _pack_strings(snapshot.ids)
+        arrays[prefix + "documents"], arrays[prefix + "documents_offsets"] = _pack_strings(snapshot.documents)
+        arrays[prefix + "metadatas"], arrays[prefix + "metadatas_offsets"] = _pack_strings(
+            [json.dumps(metadata, ensure_ascii=False) for metadata in snapshot.metadatas]
+        )
+        arrays[prefix + "vectors"] = np.ascontiguousarray(snapshot.vectors, dtype=np.float32)
+        header["collections"].append({
+            "name": snapshot.name,
+            "prefix": prefix,
+            "metadata": snapshot.metadata,
+            "count": len(snapshot.ids),
+            "sources": snapshot.sources,
+            "corpus_version": snapshot.corpus_version,
+        })
+
+    arrays["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_snapshot(path: str, names: Optional[List[str]] = None) -> List[CollectionSnapshot]:
+    """
+    Read collections from a snapshot file.
+
+    Args:
+        path: Snapshot file written by write_snapshot
+        names: Collections to read (default: all)
+
+    Returns:
+        Collection snapshots
+
+    Raises:
+        ValueError: If the file is not a snapshot in a supported format
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if "header" not in archive.files:
+            raise ValueError(f"{path} is not an embedding snapshot")
+        header = json.loads(archive["header"].tobytes().decode("utf-8"))
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {header.get('format')} in {path}")
+
+        snapshots = []
+        for entry in header["collections"]:
+            if names and entry["name"] not in names:
+                continue
+            prefix = entry["prefix"]
+            snapshots.append(CollectionSnapshot(
+                name=entry["name"],
+                metadata=entry["metadata"],
+                ids=_unpack_strings(archive[prefix + "ids"], archive[prefix + "ids_offsets"]),
+                documents=_unpack_strings(archive[prefix + "documents"], archive[prefix + "documents_offsets"]),
+                metadatas=[json.loads(value) for value in _unpack_strings(
+                    archive[prefix + "metadatas"], archive[prefix + "metadatas_offsets"]
+                )],
+                vectors=archive[prefix + "vectors"],
+                sources=entry.get("sources") or {},
+                corpus_version=entry.get("corpus_version"),
+            ))
+    return snapshots
+
+
+def import_collection(
+    client,
+    snapshot: CollectionSnapshot,
+    db_path: str,
+    model: Optional[str] = None,
+    dimensions: Optional[int] = None,
+    replace: bool = False,
+    cache: Optional[EmbeddingCache] = None
+):
+    """
+    Bulk-load a snapshot into ChromaDB.
+
+    Args:
+        client: ChromaDB client
+        snapshot: Collection to load
+        db_path: ChromaDB directory (manifest and corpus version)
+        model: Model name the configured embeddings stamp on collections (their `model`, e.g.
+            "hashing-v1" for the hashing provider), checked against the snapshot (None = don't check)
+        dimensions: Dimensions of the configured embeddings, checked against the snapshot
+        replace: Replace a non-empty collection (otherwise it is left alone)
+        cache: Embedding cache to seed with the snapshot's vectors (None = open the default one)
+
+    Returns:
+        The loaded collection, or None if an existing non-empty one was kept
+
+    Raises:
+        EmbeddingDimensionMismatch: If the snapshot was built with another model or dimension count
+    """
+    if model is not None and (snapshot.model not in (None, model)
+                              or (dimensions is not None and snapshot.dimensions != dimensions)):
+        raise EmbeddingDimensionMismatch(
+            f"Snapshot of '{snapshot.name}' holds {snapshot.model} vectors with {snapshot.dimensions} dimensions, "
+            f"but the configuration uses {model} with {dimensions}"
+        )
+
+    existing = {collection.name: collection for collection in client.list_collections()}
+    if snapshot.name in existing:
+        if existing[snapshot.name].count() and not replace:
+            print(f"[SNAPSHOT] Collection '{snapshot.name}' already has "
+                  f"{existing[snapshot.name].count()} documents - keeping it")
+            return None
+        client.delete_collection(snapshot.name)
+
+    start_time = time.time()
+    collection = client.create_collection(name=snapshot.name, metadata=snapshot.metadata or None)
+    for start in range(0, len(snapshot.ids), _WRITE_BATCH):
+        end = start + _WRITE_BATCH
+        collection.add(
+            ids=snapshot.ids[start:end],
+            embeddings=snapshot.vectors[start:end].tolist(),
+            documents=snapshot.documents[start:end],
+            metadatas=[metadata or None for metadata in snapshot.metadatas[start:end]]  # ChromaDB rejects {}
+        )
+
+    # The next incremental ingest sees every chunk (and the source files) as unchanged
+    manifest = ChunkManifest(db_path, snapshot.name)
+    manifest.chunks = {chunk_id: chunk_hash(text, metadata)
+                       for chunk_id, text, metadata in zip(snapshot.ids, snapshot.documents, snapshot.metadatas)}
+    manifest.owners = {chunk_id: metadata[SOURCE_KEY] for chunk_id, metadata in zip(snapshot.ids, snapshot.metadatas)
+                       if (metadata or {}).get(SOURCE_KEY)}
+    manifest.sources = dict(snapshot.sources)
+    manifest.save()
+
+    if snapshot.model and snapshot.ids:
+        cache = cache or open_embedding_cache(db_path)
+        cache.put_many({
+            EmbeddingCache.make_key(snapshot.model, snapshot.metadata.get(DIMENSIONS_KEY), text): vector.tolist()
+            for text, vector in zip(snapshot.documents, snapshot.vectors)
+        })
+
+    bump_corpus_version(db_path, f"{snapshot.name} imported from snapshot ({len(snapshot.ids)} documents)")
+    print(f"[SNAPSHOT] Loaded {len(snapshot.ids)} documents into '{snapshot.name}' "
+          f"in {time.time() - start_time:.1f}s")
+    return collection
@@ -0,0 +1,100 @@
+"""Typed results of vector searches across several collections."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class VectorHit:
+    """One chunk returned by a vector search."""
+    chunk_id: str
+    text: str
+    metadata: Dict[str, Any]
+    collection: str  # Label of the collection it came from
+    distance: float  # Raw distance in the collection's space
+    similarity: float  # Cosine similarity derived from the distance (one scale for all collections)
+
+
+@dataclass
+class MultiCollectionResult:
+    """Hits from several collections, ranked together on cosine similarity."""
+    hits: List[VectorHit] = field(default_factory=list)
+    latency_ms: Dict[str, float] = field(default_factory=dict)  # Per-collection search time
+
+    def top(self, n: Optional[int] = None) -> List[VectorHit]:
+        """Best hits overall (all of them when n is None)."""
+        return self.hits if n is None else self.hits[:n]
+
+    def by_collection(self, label: str) -> List[VectorHit]:
+        """Hits from one collection, best first."""
+        return [hit for hit in self.hits if hit.collection == label]
+
+    def to_chroma(self, hits: Optional[List[VectorHit]] = None) -> Dict[str, Any]:
+        """
+        Hits in ChromaDB's query result shape, for code written against it.
+
+        Distances are the raw ones ChromaDB returned, so consumers score
+        the hits exactly as they would a single collection's results.
+
+        Args:
+            hits: Hits to include (default: all)
+
+        Returns:
+            Dict with single-query 'ids', 'documents', 'metadatas' and 'distances'
+        """
+        hits = self.hits if hits is None else hits
+        return {
+            'ids': [[hit.chunk_id for hit in hits]],
+            'documents': [[hit.text for hit in hits]],
+            'metadatas': [[hit.metadata for hit in hits]],
+            'distances': [[hit.distance for hit in hits]],
+        }
+
+
+def distance_to_similarity(distance: float, space: str = "l2") -> float:
+    """
+    Cosine similarity of unit vectors from a ChromaDB distance.
+
+    Args:
+        distance: Distance as reported by ChromaDB
+        space: Collection distance space ("l2" = squared L2, "cosine" or "ip")
+
+    Returns:
+        Similarity in [-1, 1]
+    """
+    if space == "l2":
+        return 1 - distance / 2
+    return 1 - distance
+
+
+def build_hits(label: str, results: Dict[str, Any], space: str = "l2") -> List[VectorHit]:
+    """
+    Convert one collection's ChromaDB results to hits.
+
+    Every collection holds vectors of the same embedding model and
+    dimensions (checked when it is opened), so cosine similarities are on
+    one scale and hits from different collections can be ranked together.
+    The distance space only changes how a distance maps to similarity.
+
+    Args:
+        label: Collection label
+        results: ChromaDB query results for a single query
+        space: Collection distance space
+
+    Returns:
+        Hits, best first
+    """
+    if not results or not results['ids'] or not results['ids'][0]:
+        return []
+
+    hits = []
+    for i, chunk_id in enumerate(results['ids'][0]):
+        hits.append(VectorHit(
+            chunk_id=chunk_id,
+            text=results['documents'][0][i],
+            metadata=results['metadatas'][0][i] or {},
+            collection=label,
+            distance=results['distances'][0][i],
+            similarity=distance_to_similarity(results['distances'][0][i], space)
+        ))
+    hits.sort(key=lambda hit: hit.similarity, reverse=True)
+    return hits
@@ -1,16 +1,37 @@
 """FastAPI application entry point."""
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import router
+from api.ingest_jobs import get_ingest_runner
+from api.service import precompute_answers_loop, refresh_indexes_loop, warm_up_service
 from config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the RAG service in the background; /ready reports when it is done."""
+    tasks = [asyncio.create_task(warm_up_service()), asyncio.create_task(refresh_indexes_loop())]
+    if settings.precompute_enabled:
+        tasks.append(asyncio.create_task(precompute_answers_loop()))
+    if settings.admin_api_key:
+        get_ingest_runner()  # Resumes jobs queued before a restart
+    yield
+    for task in tasks:
+        task.cancel()
+    if settings.admin_api_key:
+        get_ingest_runner().shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="CORTAP-RAG API",
     description="FTA Compliance Guide RAG Q&A System",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -2,15 +2,25 @@
 from .schemas import (
     QueryRequest,
     QueryResponse,
+    BatchQueryRequest,
+    BatchQueryResult,
+    BatchQueryResponse,
     SourceCitation,
     CommonQuestion,
     HealthResponse,
+    IngestJobRequest,
+    IngestJob,
 )
 
 __all__ = [
     "QueryRequest",
     "QueryResponse",
+    "BatchQueryRequest",
+    "BatchQueryResult",
+    "BatchQueryResponse",
     "SourceCitation",
     "CommonQuestion",
     "HealthResponse",
+    "IngestJobRequest",
+    "IngestJob",
 ]
@@ -1,5 +1,5 @@
 """Pydantic models for request/response validation."""
-from typing import List, Optional, Dict
+from typing import Annotated, List, Optional, Dict
 from pydantic import BaseModel, Field
 
 
@@ -36,6 +36,26 @@ class QueryResponse(BaseModel):
     metadata: Optional[Dict] = Field(default={}, description="Query-specific metadata (route type, execution time, etc.)")
 
 
+class BatchQueryRequest(BaseModel):
+    """Request model for answering several independent questions at once."""
+    questions: List[Annotated[str, Field(min_length=1)]] = Field(..., min_length=1, description="Natural language questions (duplicates are answered once)")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Maximum concurrent LLM generations (defaults to, and is capped at, the server setting)")
+    stream: bool = Field(default=False, description="Stream results as NDJSON, one line per question in order")
+
+
+class BatchQueryResult(QueryResponse):
+    """Answer to one question of a batch."""
+    index: int = Field(..., description="Position of the question in the request")
+    question: str
+
+
+class BatchQueryResponse(BaseModel):
+    """Response model for batch queries."""
+    results: List[BatchQueryResult]
+    unique_questions: int
+    execution_time_ms: float
+
+
 class CommonQuestion(BaseModel):
     """Common question suggestion."""
     question: str
@@ -47,3 +67,27 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     database_ready: bool
+
+
+class IngestJobRequest(BaseModel):
+    """Request model for submitting a background ingestion job."""
+    kind: str = Field(..., description="guide, guide_chunks, historical_audits or historical_narratives (one job per collection at a time)")
+    options: Dict[str, bool] = Field(default={}, description="Boolean script options, e.g. {\"rebuild\": true}")
+
+
+class IngestJob(BaseModel):
+    """State of a background ingestion job."""
+    id: str
+    kind: str
+    options: Dict[str, bool]
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    cancel_requested: bool
+    progress: Optional[float] = Field(None, description="Fraction done, from the script's latest n/total counter")
+    progress_done: Optional[int] = None
+    progress_total: Optional[int] = None
+    message: Optional[str] = Field(None, description="Latest output line, or the index refresh result when finished")
+    error: Optional[str] = None
+    log_tail: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
@@ -0,0 +1,121 @@
+"""Versioned LRU cache of complete query answers."""
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from retrieval.batch import normalize_question
+
+# Backends whose results describe a failure and must not be cached
+UNCACHEABLE_BACKENDS = {'error', 'database_error', 'rag_unavailable', 'historical_query_error'}
+
+
+class AnswerCache:
+    """
+    LRU answer cache with per-route TTLs.
+
+    Keys include the corpus version, so entries from before a re-ingest are
+    never returned; they simply age out of the LRU.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        default_ttl_seconds: float = 3600.0,
+        history_window: int = 6
+    ):
+        """
+        Initialize answer cache.
+
+        Args:
+            max_entries: Maximum number of cached answers (least recently used are evicted)
+            ttl_seconds: TTL per route type (e.g. {"rag": 3600, "database": 86400})
+            default_ttl_seconds: TTL for route types not listed in ttl_seconds
+            history_window: Trailing conversation messages that are part of the key
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or {}
+        self.default_ttl_seconds = default_ttl_seconds
+        self.history_window = history_window
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(
+        self,
+        question: str,
+        route_type: str,
+        corpus_version: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> str:
+        """
+        Build the cache key for a query.
+
+        Args:
+            question: User's question
+            route_type: Route the query was classified to
+            corpus_version: Current corpus version stamp
+            conversation_history: Previous conversation messages (optional)
+
+        Returns:
+            Hex digest key
+        """
+        history = [
+            [msg.get('role', 'user'), msg.get('content', '')]
+            for msg in (conversation_history or [])[-self.history_window:]
+        ]
+        payload = json.dumps([normalize_question(question), route_type, corpus_version, history])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached answer, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, response = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(response)
+
+    def put(self, key: str, route_type: str, response: Dict[str, Any]):
+        """
+        Store an answer unless it represents a failure.
+
+        Args:
+            key: Key from make_key
+            route_type: Route type (selects the TTL)
+            response: Response dict to cache
+        """
+        if response.get('backend') in UNCACHEABLE_BACKENDS:
+            return
+
+        ttl = self.ttl_seconds.get(route_type, self.default_ttl_seconds)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, copy.deepcopy(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached answers."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
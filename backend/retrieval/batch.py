@@ -0,0 +1,71 @@
+"""Helpers for answering a batch of questions in one request."""
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for de-duplication (case and whitespace insensitive)."""
+    return " ".join(question.lower().split())
+
+
+def batch_error_result(error: Exception) -> Dict[str, Any]:
+    """Response used for a single batch item that failed."""
+    return {
+        'answer': f"Query processing failed: {str(error)}",
+        'confidence': 'low',
+        'sources': [],
+        'ranked_chunks': [],
+        'backend': 'error',
+        'metadata': {}
+    }
+
+
+async def iter_batch_results(
+    questions: List[str],
+    start_unique: Callable[[List[str]], Awaitable[List[Awaitable[Dict[str, Any]]]]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a de-duplicated batch and yield one result per input question, in order.
+
+    Args:
+        questions: Questions as submitted (may contain duplicates)
+        start_unique: Coroutine that receives the unique questions, does any
+            shared preparation (routing, embedding) and returns one awaitable
+            per unique question
+
+    Yields:
+        Result dicts with 'index' and 'question' added, in input order. Each
+        result is yielded as soon as it and every earlier result are ready.
+    """
+    keys = [normalize_question(q) for q in questions]
+    unique = {}
+    for question, key in zip(questions, keys):
+        unique.setdefault(key, question)
+
+    print(f"[BATCH] {len(questions)} questions, {len(unique)} unique")
+
+    awaitables = await start_unique(list(unique.values()))
+    tasks = {
+        key: asyncio.ensure_future(_guard(awaitable))
+        for key, awaitable in zip(unique.keys(), awaitables)
+    }
+
+    try:
+        for index, (question, key) in enumerate(zip(questions, keys)):
+            result = dict(await tasks[key])
+            result['index'] = index
+            result['question'] = question
+            yield result
+    finally:
+        # Client went away or the consumer stopped early - don't leave LLM calls running
+        for task in tasks.values():
+            task.cancel()
+
+
+async def _guard(awaitable: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn a failure of one batch item into an error result instead of failing the batch."""
+    try:
+        return await awaitable
+    except Exception as e:
+        print(f"[BATCH] Item failed: {e}")
+        return batch_error_result(e)
@@ -0,0 +1,124 @@
+"""First-stage candidate retrieval with a local embedder, rescored with the primary embeddings.
+
+The local embedder (e.g. HashingEmbeddings) embeds every chunk once at
+startup and each query in microseconds, without a network call. Its nearest
+chunks are the candidates; their stored primary (OpenAI) vectors are then
+compared exactly with the primary query embedding, so final ranking is still
+the primary model's, over a candidate set instead of the HNSW graph.
+"""
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .quantized_index import vector_distances
+
+_READ_PAGE = 1000
+
+
+class FirstStageIndex:
+    """In-memory local-embedding matrix of one collection's chunks."""
+
+    def __init__(self, embeddings, collection, ids: List[str], matrix: np.ndarray,
+                 corpus_version, built_version: str, candidates: int = 100):
+        """
+        Initialize first-stage index.
+
+        Args:
+            embeddings: Local embeddings used for the first stage
+            collection: ChromaDB collection holding the primary vectors
+            ids: Chunk IDs, in matrix row order
+            matrix: Local embeddings of the chunks (n x dimensions)
+            corpus_version: CorpusVersion reader, used to detect re-ingestion
+            built_version: Corpus version the index was built from
+            candidates: Candidates passed to rescoring per query
+        """
+        self.embeddings = embeddings
+        self.collection = collection
+        self.ids = ids
+        self.matrix = matrix
+        self.corpus_version = corpus_version
+        self.built_version = built_version
+        self.candidates = candidates
+
+    @classmethod
+    def build(cls, embeddings, collection, corpus_version, candidates: int = 100) -> "FirstStageIndex":
+        """
+        Embed every chunk of a collection with the local embedder.
+
+        Args:
+            embeddings: Local embeddings (no API calls)
+            collection: ChromaDB collection
+            corpus_version: CorpusVersion reader
+            candidates: Candidates passed to rescoring per query
+
+        Returns:
+            Built index
+        """
+        start_time = time.time()
+        version = corpus_version.get()
+        ids, rows = [], []
+        for start in range(0, collection.count(), _READ_PAGE):
+            page = collection.get(include=["documents"], limit=_READ_PAGE, offset=start)
+            ids.extend(page["ids"])
+            rows.extend(embeddings.embed_documents(page["documents"]))
+
+        matrix = np.asarray(rows, dtype=np.float32).reshape(len(ids), -1)
+        print(f"[FIRST STAGE] Embedded {len(ids)} chunks of '{collection.name}' with {embeddings.model} "
+              f"in {round((time.time() - start_time) * 1000, 2)}ms")
+        return cls(embeddings, collection, ids, matrix, corpus_version, version, candidates)
+
+    def is_current(self) -> bool:
+        """False once the corpus changed since the index was built."""
+        return self.corpus_version.get() == self.built_version
+
+    def candidate_ids(self, query_text: str, n: int) -> List[str]:
+        """
+        Nearest chunks by local embedding similarity.
+
+        Args:
+            query_text: Query string
+            n: Number of candidates
+
+        Returns:
+            Candidate chunk IDs, most similar first
+        """
+        if not self.ids or n <= 0:
+            return []
+        scores = self.matrix @ np.asarray(self.embeddings.embed_query(query_text), dtype=np.float32)
+        n = min(n, len(self.ids))
+        top = np.argpartition(-scores, n - 1)[:n]
+        return [self.ids[row] for row in top[np.argsort(-scores[top])]]
+
+    def search(self, query_text: str, query_embedding: List[float], n_results: int) -> Dict[str, Any]:
+        """
+        Retrieve candidates locally, then rank them by the primary query embedding.
+
+        Args:
+            query_text: Query string (for the local first stage)
+            query_embedding: Primary embedding of the query (for rescoring)
+            n_results: Number of results
+
+        Returns:
+            Results shaped like ChromaDB's Collection.query
+        """
+        ids = self.candidate_ids(query_text, max(self.candidates, n_results))
+        stored = self.collection.get(ids=ids, include=["embeddings", "documents", "metadatas"]) if ids else None
+        if not stored or not stored["ids"]:
+            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]],
+                    "embeddings": None, "uris": None, "data": None}
+
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        distances = vector_distances(
+            np.asarray(query_embedding, dtype=np.float32),
+            np.asarray(stored["embeddings"], dtype=np.float32),
+            space
+        )
+        order = np.argsort(distances)[:n_results]
+        return {
+            "ids": [[stored["ids"][i] for i in order]],
+            "documents": [[stored["documents"][i] for i in order]],
+            "metadatas": [[stored["metadatas"][i] for i in order]],
+            "distances": [distances[order].tolist()],
+            "embeddings": None, "uris": None, "data": None,
+        }
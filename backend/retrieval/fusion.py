@@ -0,0 +1,293 @@
+"""Fusion of vector and BM25 retrieval into one ranked candidate list.
+
+HybridRetriever.merge_results only rescores what the vector search returned,
+so a chunk that contains the exact regulatory phrase but misses the semantic
+top-n is never seen. FusionRetriever runs both searches as independent
+first-stage retrievers (the BM25 top-k alongside the vector top-k) and fuses
+the two rankings, so either source can bring a chunk into the final top_k.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+FUSION_METHODS = ("rrf", "score")
+
+
+@dataclass
+class KeywordHit:
+    """One chunk returned by a BM25 search."""
+    chunk_id: str
+    text: str
+    metadata: Dict[str, Any]
+    collection: str  # Label of the collection it came from
+    score: float  # BM25 score scaled by the best BM25 hit of any collection (best = 1.0)
+
+
+@dataclass
+class FusedCandidate:
+    """One chunk of a fused ranking, with what each source said about it."""
+    chunk_id: str
+    text: str
+    metadata: Dict[str, Any]
+    collection: str  # Label of the collection it came from
+    semantic_score: float  # Cosine similarity (0.0 if outside the vector top-k)
+    bm25_score: float  # Normalized BM25 score
+    semantic_rank: Optional[int]  # 1-based rank in the vector results (None = not retrieved by it)
+    bm25_rank: Optional[int]  # 1-based rank in the BM25 results (None = not retrieved by it)
+    fused_score: float  # 0-1, what the candidates are ranked on
+
+    @property
+    def best_rank(self) -> int:
+        """Best rank the chunk reached in either source."""
+        return min(rank for rank in (self.semantic_rank, self.bm25_rank) if rank is not None)
+
+    def to_chunk(self) -> Dict[str, Any]:
+        """The chunk in the dict shape RAGPipeline consumes (as produced by HybridRetriever.merge_results)."""
+        return {
+            'chunk_id': self.chunk_id,
+            'text': self.text,
+            'metadata': {**self.metadata, 'source_collection': self.collection},
+            'semantic_score': self.semantic_score,
+            'bm25_score': self.bm25_score,
+            'hybrid_score': self.fused_score,
+            'semantic_rank': self.semantic_rank,
+            'bm25_rank': self.bm25_rank,
+        }
+
+
+def fuse_rankings(
+    vector_hits: List[Any],
+    keyword_hits: List[KeywordHit],
+    method: str = "rrf",
+    top_k: int = 5,
+    rrf_k: int = 60,
+    semantic_weight: float = 0.7,
+    keyword_weight: float = 0.3,
+    bm25_scores: Optional[Dict[Tuple[str, str], float]] = None
+) -> List[FusedCandidate]:
+    """
+    Fuse a vector ranking and a BM25 ranking.
+
+    "rrf" (reciprocal rank fusion) scores a chunk by 1 / (rrf_k + rank) in
+    each ranking it appears in, with both sources counting equally; only
+    ranks are used, so the sources' score scales don't matter. "score" adds
+    the normalized scores with the semantic and keyword weights, like
+    merge_results does, over the union of both rankings. Both are scaled
+    to 0-1. Ties are broken by best rank, then collection and chunk ID, so
+    the same inputs always give the same order.
+
+    Args:
+        vector_hits: VectorHits, best first
+        keyword_hits: BM25 hits, best first
+        method: "rrf" or "score"
+        top_k: Number of candidates to return
+        rrf_k: RRF rank constant (larger = flatter weighting of ranks)
+        semantic_weight: Weight of the vector score ("score" only)
+        keyword_weight: Weight of the BM25 score ("score" only)
+        bm25_scores: Known BM25 scores of chunks outside the BM25 ranking, by (collection, chunk ID)
+
+    Returns:
+        Fused candidates, best first
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}' (expected one of {FUSION_METHODS})")
+    bm25_scores = bm25_scores or {}
+
+    candidates: Dict[Tuple[str, str], FusedCandidate] = {}
+    for rank, hit in enumerate(vector_hits, 1):
+        key = (hit.collection, hit.chunk_id)
+        if key in candidates:
+            continue
+        candidates[key] = FusedCandidate(
+            chunk_id=hit.chunk_id, text=hit.text, metadata=hit.metadata, collection=hit.collection,
+            semantic_score=hit.similarity, bm25_score=bm25_scores.get(key, 0.0),
+            semantic_rank=rank, bm25_rank=None, fused_score=0.0
+        )
+    for rank, hit in enumerate(keyword_hits, 1):
+        key = (hit.collection, hit.chunk_id)
+        candidate = candidates.get(key)
+        if candidate is None:
+            candidates[key] = FusedCandidate(
+                chunk_id=hit.chunk_id, text=hit.text, metadata=hit.metadata, collection=hit.collection,
+                semantic_score=0.0, bm25_score=hit.score,
+                semantic_rank=None, bm25_rank=rank, fused_score=0.0
+            )
+        elif candidate.bm25_rank is None:
+            candidate.bm25_rank = rank
+            candidate.bm25_score = hit.score
+
+    for candidate in candidates.values():
+        if method == "rrf":
+            fused = sum(1 / (rrf_k + rank) for rank in (candidate.semantic_rank, candidate.bm25_rank)
+                        if rank is not None)
+            candidate.fused_score = fused / (2 / (rrf_k + 1))
+        else:
+            fused = semantic_weight * candidate.semantic_score + keyword_weight * candidate.bm25_score
+            candidate.fused_score = fused / (semantic_weight + keyword_weight)
+
+    ranked = sorted(
+        candidates.values(),
+        key=lambda candidate: (-candidate.fused_score, candidate.best_rank, candidate.collection, candidate.chunk_id)
+    )
+    return ranked[:top_k]
+
+
+class FusionRetriever:
+    """
+    Union retrieval: vector and BM25 searches run concurrently, then their rankings are fused.
+
+    The BM25 searches (one per collection namespace) run on a thread pool
+    while the vector searches run. Texts of chunks only BM25 found are then
+    read from ChromaDB in one call per collection, after the vector
+    searches, so chunks both searches found are never read twice.
+    """
+
+    def __init__(
+        self,
+        embedding_manager,
+        hybrid_retriever,
+        method: str = "rrf",
+        semantic_depth: int = 10,
+        keyword_depth: int = 10,
+        rrf_k: int = 60
+    ):
+        """
+        Initialize the fusion retriever.
+
+        Args:
+            embedding_manager: EmbeddingManager for the vector searches
+            hybrid_retriever: HybridRetriever holding the BM25 indexes (replaced on index refresh)
+            method: "rrf" or "score" (see fuse_rankings)
+            semantic_depth: Vector results per collection that enter fusion
+            keyword_depth: BM25 results per collection that enter fusion
+            rrf_k: RRF rank constant
+
+        Raises:
+            ValueError: If the method is unknown
+        """
+        if method not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method '{method}' (expected one of {FUSION_METHODS})")
+        self.embedding_manager = embedding_manager
+        self.hybrid_retriever = hybrid_retriever
+        self.method = method
+        self.semantic_depth = semantic_depth
+        self.keyword_depth = keyword_depth
+        self.rrf_k = rrf_k
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def retrieve(
+        self,
+        question: str,
+        query_embedding: List[float],
+        collections: Dict[str, Any],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Dict]] = None
+    ) -> List[FusedCandidate]:
+        """
+        Retrieve the top_k chunks of the fused vector and BM25 rankings.
+
+        Each source ranks its hits from all collections together on one
+        scale: vector hits on cosine similarity, BM25 hits on raw BM25
+        score. Collections with a metadata
+        filter are searched by vector only (the BM25 index has no metadata).
+
+        Args:
+            question: User's question (BM25 query)
+            query_embedding: Embedding of the question
+            collections: ChromaDB collections by label (the label becomes FusedCandidate.collection)
+            top_k: Number of candidates to return
+            filters: Optional metadata filter per label
+
+        Returns:
+            Fused candidates, best first
+        """
+        start_time = time.time()
+        filters = filters or {}
+        retriever = self.hybrid_retriever  # One index generation for the whole query
+
+        keyword_futures = {}
+        if retriever:
+            keyword_futures = {
+                label: self._pool.submit(
+                    retriever.keyword_search, question, self.keyword_depth, collection.name, normalize=False
+                )
+                for label, collection in collections.items() if not filters.get(label)
+            }
+        vector = self.embedding_manager.query_many(
+            collections,
+            query_embedding,
+            per_collection_k=max(self.semantic_depth, top_k),
+            filters=filters,
+            query_text=question
+        )
+        keyword_hits = [
+            hit
+            for label, future in keyword_futures.items()
+            for hit in self._keyword_hits(label, collections[label], future.result(), vector.hits)
+        ]
+        keyword_hits.sort(key=lambda hit: (-hit.score, hit.collection, hit.chunk_id))
+        best = keyword_hits[0].score if keyword_hits else 0.0
+        for hit in keyword_hits:
+            hit.score = hit.score / best if best > 0 else 0.0
+
+        # BM25 scores of vector hits the BM25 top-k missed, on the same scale (shown with the chunk, used by "score")
+        bm25_scores = {}
+        if best > 0:
+            ranked = {(hit.collection, hit.chunk_id) for hit in keyword_hits}
+            missed: Dict[str, List[str]] = {}
+            for hit in vector.hits:
+                if hit.collection in keyword_futures and (hit.collection, hit.chunk_id) not in ranked:
+                    missed.setdefault(hit.collection, []).append(hit.chunk_id)
+            for label, chunk_ids in missed.items():
+                scores = retriever.get_bm25_scores(question, chunk_ids, collections[label].name, normalize=False)
+                bm25_scores.update({(label, chunk_id): score / best for chunk_id, score in scores.items()})
+
+        candidates = fuse_rankings(
+            vector.hits,
+            keyword_hits,
+            method=self.method,
+            top_k=top_k,
+            rrf_k=self.rrf_k,
+            semantic_weight=retriever.semantic_weight if retriever else 1.0,
+            keyword_weight=retriever.keyword_weight if retriever else 0.0,
+            bm25_scores=bm25_scores
+        )
+        keyword_only = sum(1 for candidate in candidates if candidate.semantic_rank is None)
+        print(f"[FUSION] {self.method}: {len(vector.hits)} vector + {len(keyword_hits)} keyword hits -> "
+              f"{len(candidates)} candidates ({keyword_only} from BM25 only) "
+              f"in {round((time.time() - start_time) * 1000, 2)}ms")
+        return candidates
+
+    def _keyword_hits(
+        self,
+        label: str,
+        collection,
+        matches: List[Tuple[str, float]],
+        vector_hits: List[Any]
+    ) -> List[KeywordHit]:
+        """BM25 matches of one collection as hits, with texts from the vector hits or ChromaDB."""
+        found = {hit.chunk_id: (hit.text, hit.metadata) for hit in vector_hits if hit.collection == label}
+        missing = [chunk_id for chunk_id, _ in matches if chunk_id not in found]
+        if missing:
+            stored = collection.get(ids=missing, include=["documents", "metadatas"])
+            found.update({
+                chunk_id: (text, metadata)
+                for chunk_id, text, metadata in zip(stored['ids'], stored['documents'], stored['metadatas'])
+            })
+        # Chunks deleted since the index was built are skipped
+        return [
+            KeywordHit(chunk_id=chunk_id, text=found[chunk_id][0], metadata=found[chunk_id][1] or {},
+                       collection=label, score=score)
+            for chunk_id, score in matches if chunk_id in found
+        ]
+
+    @property
+    def _pool(self) -> ThreadPoolExecutor:
+        """Threads for the BM25 searches (they run while the vector searches do)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="keyword-query")
+        return self._executor
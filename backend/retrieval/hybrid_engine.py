@@ -1,5 +1,6 @@
 """Hybrid query engine - orchestrates database and RAG retrieval."""
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+import asyncio
 import time
 import sys
 from pathlib import Path
@@ -10,6 +11,8 @@ if __name__ == "__main__":
     sys.path.insert(0, str(backend_dir))
 
 from retrieval.query_router import QueryRouter, QueryRoute
+from retrieval.batch import iter_batch_results
+from retrieval.semantic_cache import mark_semantic_hit, semantic_context_key
 from database.query_builder import QueryBuilder
 from database.connection import DatabaseManager
 from database.audit_queries import AuditQueryHelper
@@ -23,8 +26,12 @@ class HybridQueryEngine:
         db_manager: DatabaseManager,
         rag_pipeline=None,  # RAGPipeline instance (optional for now)
         hybrid_retriever=None,  # HybridRetriever instance (optional)
+        fusion_retriever=None,  # FusionRetriever for fused BM25 + vector retrieval (optional)
         embedding_manager=None,  # EmbeddingManager for ChromaDB access (optional)
-        historical_collection=None  # ChromaDB collection for historical audits (optional)
+        historical_collection=None,  # ChromaDB collection for historical audits (optional)
+        answer_cache=None,  # AnswerCache for complete answers (optional)
+        indexed_version: str = "0",  # Corpus version the serving indexes were built from (cache keys)
+        semantic_cache=None  # SemanticCache for paraphrased RAG questions (optional)
     ):
         """
         Initialize hybrid query engine.
@@ -33,16 +40,25 @@ class HybridQueryEngine:
             db_manager: DatabaseManager for database queries
             rag_pipeline: RAGPipeline for answer generation (optional)
             hybrid_retriever: HybridRetriever for vector search (optional)
+            fusion_retriever: FusionRetriever for fused BM25 + vector retrieval (optional)
             embedding_manager: EmbeddingManager for ChromaDB access (optional)
             historical_collection: ChromaDB collection for historical audits (optional)
+            answer_cache: AnswerCache for complete answers (optional)
+            indexed_version: Corpus version the serving indexes were built from, used in
+                cache keys (the service updates it when it swaps in refreshed indexes)
+            semantic_cache: SemanticCache for paraphrased RAG questions (optional)
         """
         self.router = QueryRouter()
         self.query_builder = QueryBuilder(db_manager)
         self.audit_helper = AuditQueryHelper(db_manager)
         self.rag_pipeline = rag_pipeline
         self.hybrid_retriever = hybrid_retriever
+        self.fusion_retriever = fusion_retriever
         self.embedding_manager = embedding_manager
         self.historical_collection = historical_collection
+        self.answer_cache = answer_cache
+        self.indexed_version = indexed_version
+        self.semantic_cache = semantic_cache
 
     def execute_query(
         self,
@@ -66,6 +82,10 @@ class HybridQueryEngine:
         print(f"[HYBRID ENGINE] Route: {route.route_type.upper()} (confidence: {route.confidence:.2f})")
         print(f"[HYBRID ENGINE] Reasoning: {route.reasoning}")
 
+        cache_key, cached = self._cache_lookup(question, route, conversation_history, start_time)
+        if cached is not None:
+            return cached
+
         # Step 2: Execute based on route type
         if route.route_type == "database":
             result = self._execute_database_query(question, route)
@@ -74,18 +94,290 @@ class HybridQueryEngine:
         else:  # hybrid
             result = self._execute_hybrid_query(question, route, conversation_history)
 
-        # Add execution metadata
+        self._attach_execution_metadata(result, route, start_time)
+        self._cache_store(cache_key, route, result)
+        return result
+
+    async def aexecute_query(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of execute_query that never blocks the event loop.
+
+        RAG queries await the embedding and LLM calls natively. Database and
+        hybrid routes use synchronous SQLAlchemy sessions, so they run in a
+        worker thread.
+
+        Args:
+            question: User's question
+            conversation_history: Previous conversation (optional)
+
+        Returns:
+            Formatted response with answer, sources, and metadata
+        """
+        start_time = time.time()
+
+        # Routing is pure regex matching - cheap enough to run inline
+        route = self.router.classify_query(question)
+        print(f"[HYBRID ENGINE] Route: {route.route_type.upper()} (confidence: {route.confidence:.2f})")
+        print(f"[HYBRID ENGINE] Reasoning: {route.reasoning}")
+
+        cache_key, cached = self._cache_lookup(question, route, conversation_history, start_time)
+        if cached is not None:
+            return cached
+
+        if route.route_type == "database":
+            result = await asyncio.to_thread(self._execute_database_query, question, route)
+        elif route.route_type == "rag":
+            result = await self._aexecute_rag_query(question, conversation_history)
+        else:  # hybrid
+            result = await asyncio.to_thread(self._execute_hybrid_query, question, route, conversation_history)
+
+        self._attach_execution_metadata(result, route, start_time)
+        self._cache_store(cache_key, route, result)
+        return result
+
+    async def astream_query(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Execute a query and stream its progress as (event, payload) pairs.
+
+        Events, in order:
+            route   - routing decision, sent before any retrieval
+            sources - citations, sent as soon as retrieval finishes
+            token   - answer text deltas (one event for database routes)
+            done    - final answer, confidence, backend and metadata
+
+        Args:
+            question: User's question
+            conversation_history: Previous conversation (optional)
+        """
+        start_time = time.time()
+
+        route = self.router.classify_query(question)
+        print(f"[HYBRID ENGINE] Streaming route: {route.route_type.upper()} (confidence: {route.confidence:.2f})")
+        yield "route", {
+            'route_type': route.route_type,
+            'confidence': route.confidence,
+            'reasoning': route.reasoning,
+            'sections': route.section_names
+        }
+
+        cache_key, cached = self._cache_lookup(question, route, conversation_history, start_time)
+        if cached is not None:
+            result = cached
+            yield "sources", {'sources': result.get('sources', []), 'ranked_chunks': result.get('ranked_chunks', [])}
+            yield "token", {'text': result['answer']}
+        elif route.route_type != "rag":
+            if route.route_type == "database":
+                result = await asyncio.to_thread(self._execute_database_query, question, route)
+            else:  # hybrid
+                result = await asyncio.to_thread(self._execute_hybrid_query, question, route, conversation_history)
+
+            yield "sources", {'sources': result.get('sources', []), 'ranked_chunks': result.get('ranked_chunks', [])}
+            yield "token", {'text': result['answer']}
+        elif not self.rag_pipeline or not self.embedding_manager:
+            result = self._rag_unavailable_result()
+            yield "sources", {'sources': [], 'ranked_chunks': []}
+            yield "token", {'text': result['answer']}
+        else:
+            query_embedding = await self.embedding_manager.aembed_query(question)
+            semantic_context, result = self._semantic_lookup(query_embedding, conversation_history)
+
+            if result is not None:
+                yield "sources", {'sources': result.get('sources', []), 'ranked_chunks': result.get('ranked_chunks', [])}
+                yield "token", {'text': result['answer']}
+            else:
+                retrieved_chunks = await asyncio.to_thread(self._retrieve_rag_chunks, question, query_embedding)
+
+                if not retrieved_chunks:
+                    result = self._no_results_result()
+                    yield "sources", {'sources': [], 'ranked_chunks': []}
+                    yield "token", {'text': result['answer']}
+                else:
+                    sources = self.rag_pipeline.format_sources(retrieved_chunks)
+                    yield "sources", {'sources': sources[:3], 'ranked_chunks': sources}
+
+                    async for event, payload in self.rag_pipeline.astream_answer(
+                        question, retrieved_chunks, conversation_history
+                    ):
+                        if event == "token":
+                            yield "token", {'text': payload}
+                        else:
+                            result = payload
+                    result['backend'] = 'rag'
+                    self._semantic_store(semantic_context, question, query_embedding, result)
+
+        if cached is None:
+            self._attach_execution_metadata(result, route, start_time)
+            self._cache_store(cache_key, route, result)
+        yield "done", {
+            'answer': result['answer'],
+            'confidence': result['confidence'],
+            'backend': result.get('backend', 'rag'),
+            'metadata': result['metadata']
+        }
+
+    def astream_batch(
+        self,
+        questions: List[str],
+        max_concurrency: int = 4
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer a batch of independent questions, yielding results in input order.
+
+        Duplicate questions are answered once. All unique questions are routed
+        up front and every RAG-bound question is embedded in a single
+        embed_documents call. Database and hybrid routes run directly; LLM
+        generation is limited to max_concurrency calls at a time.
+
+        Args:
+            questions: Questions to answer (no conversation history)
+            max_concurrency: Maximum concurrent RAG answer generations
+
+        Returns:
+            Async iterator of result dicts (see iter_batch_results)
+        """
+        return iter_batch_results(
+            questions,
+            lambda unique: self._start_batch(unique, max_concurrency)
+        )
+
+    async def _start_batch(self, questions: List[str], max_concurrency: int) -> List[Any]:
+        """Route and embed a batch of unique questions, returning one coroutine per question."""
+        start_time = time.time()
+        routes = [self.router.classify_query(q) for q in questions]
+        cache_entries = {
+            q: self._cache_lookup(q, route, None, start_time)
+            for q, route in zip(questions, routes)
+        }
+
+        rag_questions = [
+            q for q, route in zip(questions, routes)
+            if route.route_type == "rag" and cache_entries[q][1] is None
+        ]
+        embeddings = {}
+        if rag_questions and self.embedding_manager:
+            vectors = await self.embedding_manager.aembed_documents(rag_questions)
+            embeddings = dict(zip(rag_questions, vectors))
+            print(f"[BATCH] Embedded {len(rag_questions)} RAG questions in one call")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(question: str, route: QueryRoute) -> Dict[str, Any]:
+            cache_key, cached = cache_entries[question]
+            if cached is not None:
+                return cached
+
+            start_time = time.time()
+            if route.route_type == "database":
+                result = await asyncio.to_thread(self._execute_database_query, question, route)
+            elif route.route_type == "hybrid":
+                result = await asyncio.to_thread(self._execute_hybrid_query, question, route, None)
+            else:
+                async with semaphore:
+                    result = await self._aexecute_rag_query(question, None, embeddings.get(question))
+            self._attach_execution_metadata(result, route, start_time)
+            self._cache_store(cache_key, route, result)
+            return result
+
+        return [run(q, route) for q, route in zip(questions, routes)]
+
+    def _attach_execution_metadata(
+        self,
+        result: Dict[str, Any],
+        route: QueryRoute,
+        start_time: float,
+        cache_hit: bool = False
+    ) -> Dict[str, Any]:
+        """Add routing and timing metadata to a query result."""
         execution_time = time.time() - start_time
+        semantic_hit = {
+            key: value for key, value in (result.get('metadata') or {}).items()
+            if key in ('semantic_cache_hit', 'semantic_similarity', 'matched_question')
+        }
         result['metadata'] = {
             'route_type': route.route_type,
             'confidence': route.confidence,
             'reasoning': route.reasoning,
             'execution_time_ms': round(execution_time * 1000, 2),
-            'sections': route.section_names
+            'sections': route.section_names,
+            'cache_hit': cache_hit,
+            **semantic_hit
         }
 
         return result
 
+    def _cache_lookup(
+        self,
+        question: str,
+        route: QueryRoute,
+        conversation_history: Optional[List[Dict[str, str]]],
+        start_time: float
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up a cached answer for this question, route and the serving indexes' corpus version.
+
+        Returns:
+            (cache_key, cached_result) - cache_key is None when caching is
+            disabled; cached_result is None on a miss
+        """
+        if self.answer_cache is None:
+            return None, None
+
+        version = self.indexed_version
+        cache_key = self.answer_cache.make_key(question, route.route_type, version, conversation_history)
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            print(f"[HYBRID ENGINE] Answer cache hit (corpus version {version})")
+            self._attach_execution_metadata(cached, route, start_time, cache_hit=True)
+        return cache_key, cached
+
+    def _cache_store(self, cache_key: Optional[str], route: QueryRoute, result: Dict[str, Any]):
+        """Store a freshly computed answer in the cache (semantic cache hits stay approximate matches)."""
+        if cache_key and not (result.get('metadata') or {}).get('semantic_cache_hit'):
+            self.answer_cache.put(cache_key, route.route_type, result)
+
+    def _semantic_lookup(
+        self,
+        query_embedding: List[float],
+        conversation_history: Optional[List[Dict[str, str]]]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up an answer to a semantically equivalent RAG question.
+
+        Returns:
+            (context_key, cached_result) - context_key is None when the
+            semantic cache is disabled; cached_result is None on a miss
+        """
+        if self.semantic_cache is None:
+            return None, None
+
+        context_key = semantic_context_key(self.indexed_version, conversation_history)
+        hit = self.semantic_cache.lookup(query_embedding, "rag", context_key)
+        if hit is None:
+            return context_key, None
+
+        result, similarity, matched_question = hit
+        print(f"[HYBRID ENGINE] Semantic cache hit (similarity {similarity:.3f}): {matched_question[:60]}")
+        return context_key, mark_semantic_hit(result, similarity, matched_question)
+
+    def _semantic_store(
+        self,
+        context_key: Optional[str],
+        question: str,
+        query_embedding: List[float],
+        result: Dict[str, Any]
+    ):
+        """Remember a freshly generated RAG answer in the semantic cache."""
+        if context_key and result.get('backend') == 'rag':
+            self.semantic_cache.add(query_embedding, "rag", context_key, question, result)
+
     def _execute_database_query(self, question: str, route: QueryRoute) -> Dict[str, Any]:
         """
         Execute a pure database query.
@@ -221,85 +513,137 @@ class HybridQueryEngine:
         print(f"[RAG] Executing RAG query")
 
         if not self.rag_pipeline or not self.embedding_manager:
-            return {
-                'answer': "RAG pipeline not initialized. Please use database queries for now.",
-                'confidence': 'low',
-                'sources': [],
-                'ranked_chunks': [],
-                'backend': 'rag_unavailable'
-            }
+            return self._rag_unavailable_result()
 
         # Retrieve documents from ChromaDB collections
         # Need to embed the query using OpenAI embeddings (same as collections)
-        query_embedding = self.embedding_manager.embeddings.embed_query(question)
+        query_embedding = self.embedding_manager.embed_query(question)
+        semantic_context, cached = self._semantic_lookup(query_embedding, conversation_history)
+        if cached is not None:
+            return cached
+
+        retrieved_chunks = self._retrieve_rag_chunks(question, query_embedding)
+        if not retrieved_chunks:
+            return self._no_results_result()
 
-        # Query compliance guide collection (primary)
-        compliance_results = self.embedding_manager.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=3  # Reduced to make room for historical audits
+        # Generate answer
+        result = self.rag_pipeline.process_query(
+            question,
+            retrieved_chunks,
+            conversation_history
         )
 
-        # Query historical audits collection if available
-        historical_results = None
-        if self.historical_collection:
-            print(f"[RAG] Querying historical audits collection...")
-            historical_results = self.historical_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=3  # Get 3 historical examples
-            )
+        result['backend'] = 'rag'
+        self._semantic_store(semantic_context, question, query_embedding, result)
+        return result
 
-        # Merge results from both collections
-        all_results = {
-            'ids': [[]],
-            'documents': [[]],
-            'metadatas': [[]],
-            'distances': [[]]
+    async def _aexecute_rag_query(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _execute_rag_query.
+
+        Args:
+            question: User's question
+            conversation_history: Previous conversation
+            query_embedding: Precomputed question embedding (optional)
+
+        Returns:
+            RAG result
+        """
+        print(f"[RAG] Executing async RAG query")
+
+        if not self.rag_pipeline or not self.embedding_manager:
+            return self._rag_unavailable_result()
+
+        if query_embedding is None:
+            query_embedding = await self.embedding_manager.aembed_query(question)
+
+        semantic_context, cached = self._semantic_lookup(query_embedding, conversation_history)
+        if cached is not None:
+            return cached
+
+        # ChromaDB and BM25 scoring are synchronous - keep them off the event loop
+        retrieved_chunks = await asyncio.to_thread(self._retrieve_rag_chunks, question, query_embedding)
+        if not retrieved_chunks:
+            return self._no_results_result()
+
+        result = await self.rag_pipeline.aprocess_query(
+            question,
+            retrieved_chunks,
+            conversation_history
+        )
+
+        result['backend'] = 'rag'
+        self._semantic_store(semantic_context, question, query_embedding, result)
+        return result
+
+    def _rag_unavailable_result(self) -> Dict[str, Any]:
+        """Response returned when the RAG components were not configured."""
+        return {
+            'answer': "RAG pipeline not initialized. Please use database queries for now.",
+            'confidence': 'low',
+            'sources': [],
+            'ranked_chunks': [],
+            'backend': 'rag_unavailable'
         }
 
-        # Add compliance guide results
-        if compliance_results and compliance_results['ids'][0]:
-            all_results['ids'][0].extend(compliance_results['ids'][0])
-            all_results['documents'][0].extend(compliance_results['documents'][0])
-            # Add source indicator to metadata
-            for meta in compliance_results['metadatas'][0]:
-                meta['source_collection'] = 'compliance_guide'
-            all_results['metadatas'][0].extend(compliance_results['metadatas'][0])
-            all_results['distances'][0].extend(compliance_results['distances'][0])
-
-        # Add historical audit results
-        if historical_results and historical_results['ids'][0]:
-            all_results['ids'][0].extend(historical_results['ids'][0])
-            all_results['documents'][0].extend(historical_results['documents'][0])
-            # Add source indicator to metadata
-            for meta in historical_results['metadatas'][0]:
-                meta['source_collection'] = 'historical_audits'
-            all_results['metadatas'][0].extend(historical_results['metadatas'][0])
-            all_results['distances'][0].extend(historical_results['distances'][0])
-
-        # Sort by distance (lower is better) and take top 5
-        if all_results['ids'][0]:
-            combined = list(zip(
-                all_results['ids'][0],
-                all_results['documents'][0],
-                all_results['metadatas'][0],
-                all_results['distances'][0]
-            ))
-            combined.sort(key=lambda x: x[3])  # Sort by distance
-            combined = combined[:5]  # Take top 5
-
-            all_results = {
-                'ids': [[x[0] for x in combined]],
-                'documents': [[x[1] for x in combined]],
-                'metadatas': [[x[2] for x in combined]],
-                'distances': [[x[3] for x in combined]]
-            }
+    def _no_results_result(self) -> Dict[str, Any]:
+        """Response returned when retrieval finds nothing (no LLM call is made)."""
+        return {
+            'answer': "I couldn't find relevant information in the FTA compliance guide to answer your question.",
+            'confidence': 'low',
+            'sources': [],
+            'ranked_chunks': [],
+            'backend': 'rag'
+        }
+
+    def _retrieve_rag_chunks(self, question: str, query_embedding: List[float]) -> List[Dict[str, Any]]:
+        """
+        Retrieve and rank chunks from the compliance guide and historical audits.
+
+        Args:
+            question: User's question (used for BM25 scoring)
+            query_embedding: Embedding of the question
+
+        Returns:
+            Ranked chunks ready for answer generation
+        """
+        # Search the compliance guide (primary) and historical audits concurrently
+        collections = {'compliance_guide': self.embedding_manager.collection}
+        if self.historical_collection:
+            collections['historical_audits'] = self.historical_collection
+
+        # Union of the BM25 and vector top-k from both collections, fused into the top 5
+        if self.fusion_retriever:
+            candidates = self.fusion_retriever.retrieve(question, query_embedding, collections, top_k=5)
+            return [candidate.to_chunk() for candidate in candidates]
+
+        results = self.embedding_manager.query_many(
+            collections,
+            query_embedding,
+            per_collection_k=3,  # 3 from each collection, top 5 overall
+            query_text=question
+        )
+        print(f"[RAG] Queried {len(collections)} collections: "
+              f"{', '.join(f'{label} {ms}ms' for label, ms in results.latency_ms.items())}")
 
-        # Merge with BM25 if hybrid retriever available
+        # Ranked together on cosine similarity (both collections hold the same model's embeddings)
+        top_hits = results.top(5)
+        for hit in top_hits:
+            hit.metadata['source_collection'] = hit.collection
+        all_results = results.to_chroma(top_hits)
+
+        # Merge with BM25 if hybrid retriever available (each chunk scored in its collection's index)
         if self.hybrid_retriever:
             retrieved_chunks = self.hybrid_retriever.merge_results(
                 all_results,
                 question,
-                top_k=5
+                top_k=5,
+                namespaces=[collections[hit.collection].name for hit in top_hits]
             )
         else:
             # Fallback to semantic only
@@ -314,15 +658,7 @@ class HybridQueryEngine:
                     'hybrid_score': 1 - all_results['distances'][0][i]
                 })
 
-        # Generate answer
-        result = self.rag_pipeline.process_query(
-            question,
-            retrieved_chunks,
-            conversation_history
-        )
-
-        result['backend'] = 'rag'
-        return result
+        return retrieved_chunks
 
     def _execute_hybrid_query(
         self,
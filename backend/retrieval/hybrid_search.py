@@ -1,60 +1,131 @@
 """Hybrid search combining semantic and keyword-based retrieval."""
-from typing import List, Dict, Tuple
-from rank_bm25 import BM25Okapi
+from typing import Iterable, List, Dict, Optional, Tuple
+from .shared_index import tokenize
+from .sparse_bm25 import SparseBM25Index
+
+# Namespace of the compliance guide's BM25 index (the default everywhere)
+PRIMARY_NAMESPACE = "fta_compliance_guide"
 
 
 class HybridRetriever:
-    """Combines semantic (vector) and keyword (BM25) search."""
+    """
+    Combines semantic (vector) and keyword (BM25) search.
+
+    Keeps one BM25 index per namespace (a ChromaDB collection name), so
+    chunks from several collections are each scored against the vocabulary
+    and idf of their own collection.
+    """
 
     def __init__(self, semantic_weight: float = 0.7, keyword_weight: float = 0.3):
         self.semantic_weight = semantic_weight
         self.keyword_weight = keyword_weight
-        self.bm25_index = None
-        self.documents = []
-        self.document_ids = []
+        self.bm25_indexes: Dict[str, SparseBM25Index] = {}
+
+    @property
+    def bm25_index(self) -> Optional[SparseBM25Index]:
+        """Index of the primary (compliance guide) namespace."""
+        return self.bm25_indexes.get(PRIMARY_NAMESPACE)
 
-    def build_bm25_index(self, documents: List[str], document_ids: List[str]):
+    def build_bm25_index(self, documents: List[str], document_ids: List[str], namespace: str = PRIMARY_NAMESPACE):
         """
         Build BM25 index for keyword search.
 
         Args:
             documents: List of document texts
             document_ids: Corresponding document IDs
+            namespace: Collection the documents belong to
         """
-        self.documents = documents
-        self.document_ids = document_ids
+        # Precomputed sparse BM25 weights (same scores as rank_bm25.BM25Okapi)
+        self.bm25_indexes[namespace] = SparseBM25Index.build(documents, document_ids)
 
-        # Tokenize documents (simple whitespace tokenization)
-        tokenized_docs = [doc.lower().split() for doc in documents]
-        self.bm25_index = BM25Okapi(tokenized_docs)
+    def attach_index(self, index: SparseBM25Index, namespace: str = PRIMARY_NAMESPACE):
+        """
+        Use a prebuilt index instead of building one from document texts.
 
-    def get_bm25_scores(self, query: str) -> Dict[str, float]:
+        Args:
+            index: Index to search, e.g. one memory-mapped with SparseBM25Index.open
+            namespace: Collection the index covers
+        """
+        self.bm25_indexes[namespace] = index
+
+    def get_bm25_scores(
+        self,
+        query: str,
+        document_ids: Optional[Iterable[str]] = None,
+        namespace: str = PRIMARY_NAMESPACE,
+        normalize: bool = True
+    ) -> Dict[str, float]:
         """
-        Get BM25 scores for all documents.
+        Get BM25 scores normalized to 0-1 by the best-scoring document of the namespace.
+
+        With document_ids, only those documents are scored, and the best
+        score comes from a pruned top-1 search instead of scoring the whole
+        corpus.
 
         Args:
             query: Query string
+            document_ids: Only return scores of these documents (default: all)
+            namespace: Collection whose index to score
+            normalize: Scale scores by the best-scoring document (False = raw BM25 scores)
 
         Returns:
             Dictionary mapping document_id to BM25 score
         """
-        if not self.bm25_index:
+        index = self.bm25_indexes.get(namespace)
+        if not index:
             return {}
 
-        tokenized_query = query.lower().split()
-        scores = self.bm25_index.get_scores(tokenized_query)
+        tokens = tokenize(query)
+        if document_ids is not None:
+            found, positions = index.positions(list(document_ids))
+            max_score = 1.0
+            if normalize:
+                _, best = index.top_k(tokens, 1)
+                max_score = float(best[0]) if len(best) else 1.0
+            scores = index.score_documents(tokens, positions)
+            return {doc_id: float(score) / max_score for doc_id, score in zip(found, scores)}
+
+        scores = index.get_scores(tokens)
+        max_score = float(scores.max()) if len(scores) and normalize else 0.0
+        if max_score <= 0:
+            max_score = 1.0
+        return dict(zip(index.doc_ids.tolist(), (scores / max_score).tolist()))
+
+    def keyword_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        namespace: str = PRIMARY_NAMESPACE,
+        normalize: bool = True
+    ) -> List[Tuple[str, float]]:
+        """
+        Best BM25 matches for a query (exact, with pruning).
 
-        # Normalize scores to 0-1 range
-        max_score = max(scores) if max(scores) > 0 else 1.0
-        normalized_scores = [score / max_score for score in scores]
+        Args:
+            query: Query string
+            top_k: Number of results
+            namespace: Collection to search
+            normalize: Scale scores by the best match (False = raw BM25 scores)
+
+        Returns:
+            (document_id, score) pairs, best first
+        """
+        index = self.bm25_indexes.get(namespace)
+        if not index:
+            return []
 
-        return dict(zip(self.document_ids, normalized_scores))
+        indexes, top_scores = index.top_k(tokenize(query), top_k)
+        if not len(indexes):
+            return []
+        max_score = float(top_scores[0]) if normalize else 1.0
+        return [(index.doc_ids[i], float(score) / max_score) for i, score in zip(indexes, top_scores)]
 
     def merge_results(
         self,
         semantic_results: Dict[str, any],
         query: str,
-        top_k: int = 5
+        top_k: int = 5,
+        namespaces: Optional[List[str]] = None
     ) -> List[Dict[str, any]]:
         """
         Merge semantic and BM25 results with hybrid scoring.
@@ -63,23 +134,34 @@ class HybridRetriever:
             semantic_results: Results from ChromaDB query
             query: Original query string
             top_k: Number of top results to return
+            namespaces: Collection of each result, aligned with its IDs (default: all primary)
 
         Returns:
             List of documents with hybrid scores, sorted by relevance
         """
-        # Get BM25 scores
-        bm25_scores = self.get_bm25_scores(query)
+        ids = semantic_results['ids'][0]
+        if namespaces is None:
+            namespaces = [PRIMARY_NAMESPACE] * len(ids)
+
+        # Get BM25 scores (only the semantic candidates are looked up, each in its own collection's index)
+        wanted: Dict[str, List[str]] = {}
+        for doc_id, namespace in zip(ids, namespaces):
+            wanted.setdefault(namespace, []).append(doc_id)
+        bm25_scores = {
+            namespace: self.get_bm25_scores(query, doc_ids, namespace)
+            for namespace, doc_ids in wanted.items()
+        }
 
         # Parse semantic results
         merged_results = []
-        for i in range(len(semantic_results['ids'][0])):
-            doc_id = semantic_results['ids'][0][i]
+        for i in range(len(ids)):
+            doc_id = ids[i]
             semantic_score = 1 - semantic_results['distances'][0][i]  # Convert distance to similarity
             document_text = semantic_results['documents'][0][i]
             metadata = semantic_results['metadatas'][0][i]
 
             # Get BM25 score for this document
-            bm25_score = bm25_scores.get(doc_id, 0.0)
+            bm25_score = bm25_scores[namespaces[i]].get(doc_id, 0.0)
 
             # Calculate hybrid score
             hybrid_score = (
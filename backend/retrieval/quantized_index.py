@@ -0,0 +1,428 @@
+"""Quantized vector index with exact float rescoring.
+
+A first pass scans compact codes for every vector: int8 scalar codes (4x
+smaller than float32) or binary sign codes (32x smaller), scored against the
+query. Only the best candidates are rescored with their exact float vectors.
+QuantizedCollection puts the index in front of a ChromaDB collection and by
+default reads the candidates' float vectors from ChromaDB, together with
+their documents and metadata, so the index adds only its codes to the disk.
+Saved with a float copy (VECTOR_FLOAT_COPY), rescoring reads memory-mapped
+vectors instead and ChromaDB's HNSW segment is never loaded into RAM, at the
+cost of storing every vector a second time.
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+META_FILE = "meta.json"
+QUANTIZATIONS = ("int8", "binary")
+
+# Rows scored per block in the first pass (bounds the float temporaries)
+_BLOCK_ROWS = 4096
+_READ_PAGE = 1000
+
+# Bits of every byte value, most significant first (np.packbits order)
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(np.float32)
+
+
+class QuantizedVectorIndex:
+    """Compact codes for first-pass search, optionally with float vectors for rescoring."""
+
+    def __init__(
+        self,
+        quantization: str,
+        ids: np.ndarray,
+        codes: np.ndarray,
+        vectors: Optional[np.ndarray],
+        dimensions: int,
+        offset: Optional[np.ndarray] = None,
+        scale: Optional[np.ndarray] = None,
+        space: str = "l2"
+    ):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}' (expected one of {QUANTIZATIONS})")
+        self.quantization = quantization
+        self.ids = ids
+        self.codes = codes
+        self.vectors = vectors  # None: rescore candidates with vectors read elsewhere (see rescore)
+        self.dimensions = dimensions
+        self.offset = offset
+        self.scale = scale
+        self.space = space
+        self._id_list = ids.tolist()
+
+    @classmethod
+    def build(cls, ids: List[str], vectors: np.ndarray, quantization: str, space: str = "l2") -> "QuantizedVectorIndex":
+        """
+        Quantize vectors in memory.
+
+        Args:
+            ids: Document IDs
+            vectors: float32 vectors (n x dimensions)
+            quantization: "int8" (per-dimension scalar codes) or "binary" (sign bits)
+            space: ChromaDB distance space of the collection ("l2", "cosine" or "ip")
+
+        Returns:
+            Index ready to search or save
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        offset = scale = None
+        if quantization == "int8":
+            # Map each dimension's observed range onto -128..127
+            low = vectors.min(axis=0) if len(vectors) else np.zeros(vectors.shape[1], np.float32)
+            high = vectors.max(axis=0) if len(vectors) else np.ones(vectors.shape[1], np.float32)
+            scale = np.maximum(high - low, 1e-12) / 255
+            offset = low + 128 * scale
+            codes = np.clip(np.rint((vectors - offset) / scale), -128, 127).astype(np.int8)
+        elif quantization == "binary":
+            codes = np.packbits(vectors > 0, axis=1)
+        else:
+            raise ValueError(f"Unknown quantization '{quantization}' (expected one of {QUANTIZATIONS})")
+        dimensions = vectors.shape[1] if vectors.ndim == 2 else 0
+        return cls(quantization, np.array(ids, dtype=str), codes, vectors, dimensions, offset, scale, space)
+
+    @classmethod
+    def from_collection(cls, collection, quantization: str) -> "QuantizedVectorIndex":
+        """
+        Quantize every vector of a ChromaDB collection (read in pages).
+
+        Args:
+            collection: ChromaDB collection
+            quantization: "int8" or "binary"
+
+        Returns:
+            Built index
+        """
+        count = collection.count()
+        ids: List[str] = []
+        vectors = None
+        for start in range(0, count, _READ_PAGE):
+            page = collection.get(include=["embeddings"], limit=_READ_PAGE, offset=start)
+            page_vectors = np.asarray(page["embeddings"], dtype=np.float32)
+            if vectors is None:
+                vectors = np.empty((count, page_vectors.shape[1]), dtype=np.float32)
+            vectors[len(ids):len(ids) + len(page_vectors)] = page_vectors
+            ids.extend(page["ids"])
+        if vectors is None:
+            vectors = np.empty((0, 0), dtype=np.float32)
+
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+        return cls.build(ids, vectors[:len(ids)], quantization, space=space)
+
+    def save(self, path: str, corpus_version: str, float_copy: bool = False):
+        """
+        Write the index to a directory, replacing any previous index there.
+
+        Args:
+            path: Index directory
+            corpus_version: Corpus version the index was built from
+            float_copy: Also write the float32 vectors for rescoring (as much
+                disk again as ChromaDB uses for them)
+        """
+        if float_copy and self.vectors is None:
+            raise ValueError("Index has no float vectors to save")
+        target = Path(path)
+        tmp_dir = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        old_dir = target.with_name(f".{target.name}.{os.getpid()}.old")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        arrays = {"ids": self.ids, "codes": self.codes}
+        if float_copy:
+            arrays["vectors"] = self.vectors
+        if self.quantization == "int8":
+            arrays.update(offset=self.offset, scale=self.scale)
+        for name, array in arrays.items():
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(array))
+        (tmp_dir / META_FILE).write_text(json.dumps({
+            "corpus_version": corpus_version,
+            "quantization": self.quantization,
+            "space": self.space,
+            "documents": len(self),
+            "dimensions": int(self.dimensions),
+            "float_copy": float_copy,
+        }))
+
+        if target.exists():
+            os.replace(target, old_dir)
+        os.replace(tmp_dir, target)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str) -> "QuantizedVectorIndex":
+        """
+        Open a saved index: codes are read into memory, a float copy (if saved) is memory-mapped.
+
+        Args:
+            path: Index directory written by save()
+
+        Returns:
+            Loaded index
+        """
+        meta = read_quantized_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"No quantized vector index at {path}")
+
+        directory = Path(path)
+        extra = {}
+        if meta["quantization"] == "int8":
+            extra = {"offset": np.load(directory / "offset.npy"), "scale": np.load(directory / "scale.npy")}
+        return cls(
+            meta["quantization"],
+            ids=np.load(directory / "ids.npy"),
+            codes=np.load(directory / "codes.npy"),
+            vectors=np.load(directory / "vectors.npy", mmap_mode="r") if meta.get("float_copy") else None,
+            dimensions=meta["dimensions"],
+            space=meta["space"],
+            **extra
+        )
+
+    @classmethod
+    def open(cls, collection, path: str, quantization: str, corpus_version: str,
+             float_copy: bool = False) -> "QuantizedVectorIndex":
+        """
+        Load the saved index for a collection, rebuilding it if missing or stale.
+
+        Args:
+            collection: ChromaDB collection the index covers
+            path: Index directory
+            quantization: "int8" or "binary"
+            corpus_version: Current corpus version
+            float_copy: Keep a memory-mapped float copy for rescoring (see save)
+
+        Returns:
+            Index matching the collection's current contents
+        """
+        meta = read_quantized_meta(path)
+        if (meta and meta["corpus_version"] == corpus_version and meta["quantization"] == quantization
+                and meta["documents"] == collection.count() and bool(meta.get("float_copy")) == float_copy):
+            return cls.load(path)
+
+        index = cls.from_collection(collection, quantization)
+        try:
+            index.save(path, corpus_version, float_copy=float_copy)
+            return cls.load(path)
+        except OSError as e:
+            print(f"[QUANTIZED INDEX] Could not save index to {path}: {e} - keeping it in memory")
+            return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """Size of the in-memory codes against the float vectors they stand in for."""
+        float_bytes = int(len(self) * self.dimensions * 4)
+        code_bytes = int(self.codes.nbytes)
+        return {
+            "quantization": self.quantization,
+            "documents": len(self),
+            "code_bytes": code_bytes,
+            "float_bytes": float_bytes,
+            "compression": round(float_bytes / code_bytes, 1) if code_bytes else 0.0,
+        }
+
+    def search(self, query: List[float], k: int, rescore_factor: int = 8):
+        """
+        Find the nearest vectors: approximate scan over codes, exact rescoring of the best candidates.
+
+        Needs the index's own float vectors (built in memory or saved with
+        a float copy); otherwise rescore candidates() with vectors read
+        from ChromaDB.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            rescore_factor: Candidates rescored per requested result
+
+        Returns:
+            (ids, distances) of the k nearest vectors, nearest first; distances
+            use the collection's space, as ChromaDB reports them
+
+        Raises:
+            ValueError: If the index holds no float vectors
+        """
+        if self.vectors is None:
+            raise ValueError("Index was loaded without float vectors; rescore candidates() instead")
+        rows = self._candidate_rows(query, k, rescore_factor)
+        rows.sort()  # Sequential reads from the memory-mapped vectors
+        return rescore(query, [self._id_list[row] for row in rows], np.asarray(self.vectors[rows]), k, self.space)
+
+    def candidates(self, query: List[float], k: int, rescore_factor: int = 8) -> List[str]:
+        """
+        IDs of the vectors whose codes score best against the query (first pass only).
+
+        Args:
+            query: Query embedding
+            k: Number of results wanted after rescoring
+            rescore_factor: Candidates per requested result
+
+        Returns:
+            Up to k * rescore_factor IDs, in no particular order
+        """
+        return [self._id_list[row] for row in self._candidate_rows(query, k, rescore_factor)]
+
+    def _candidate_rows(self, query: List[float], k: int, rescore_factor: int) -> np.ndarray:
+        """Rows of the best first-pass scores."""
+        if not len(self) or k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        approx = self._approximate_scores(np.asarray(query, dtype=np.float32))
+        candidates = min(len(self), max(k, k * rescore_factor))
+        if candidates < len(self):
+            return np.argpartition(-approx, candidates - 1)[:candidates]
+        return np.arange(len(self))
+
+    def _approximate_scores(self, query: np.ndarray) -> np.ndarray:
+        """First-pass similarity of every vector to the query (higher is closer)."""
+        scores = np.empty(len(self), dtype=np.float32)
+        if self.quantization == "int8":
+            # q . (offset + scale * code) = q . offset + (q * scale) . code
+            weighted = query * self.scale
+            base = float(query @ self.offset)
+            for start in range(0, len(self), _BLOCK_ROWS):
+                block = self.codes[start:start + _BLOCK_ROWS].astype(np.float32)
+                scores[start:start + len(block)] = block @ weighted + base
+        else:
+            # Asymmetric scoring: the float query against each vector's signs. q . sign(v)
+            # ranks like q . bits(v) (they differ by a constant), which is summed one
+            # code byte at a time from a table of q's partial sums for all 256 byte values
+            padded = np.zeros(self.codes.shape[1] * 8, dtype=np.float32)
+            padded[:len(query)] = query
+            byte_sums = padded.reshape(-1, 8) @ _BYTE_BITS.T
+            positions = np.arange(self.codes.shape[1])
+            for start in range(0, len(self), _BLOCK_ROWS):
+                block = self.codes[start:start + _BLOCK_ROWS]
+                scores[start:start + len(block)] = byte_sums[positions, block].sum(axis=1)
+        return scores
+
+
+class QuantizedCollection:
+    """
+    ChromaDB collection whose unfiltered vector searches are served by a QuantizedVectorIndex.
+
+    Candidates are rescored with the index's float copy if it has one,
+    otherwise with the float vectors ChromaDB stores, read in the same call
+    as their documents and metadata. Filtered queries, queries returning
+    embeddings, and queries made after the corpus changed (until the index
+    is rebuilt) go to ChromaDB itself. Every other attribute is the wrapped
+    collection's.
+    """
+
+    def __init__(self, collection, index: QuantizedVectorIndex, corpus_version, built_version: str,
+                 rescore_factor: int = 8):
+        """
+        Initialize quantized collection.
+
+        Args:
+            collection: ChromaDB collection
+            index: Index built from the collection
+            corpus_version: CorpusVersion reader, used to detect re-ingestion
+            built_version: Corpus version the index was built from
+            rescore_factor: Candidates rescored per requested result
+        """
+        self.collection = collection
+        self.index = index
+        self.corpus_version = corpus_version
+        self.built_version = built_version
+        self.rescore_factor = rescore_factor
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def query(self, query_embeddings=None, n_results: int = 10, where=None, where_document=None,
+              include=("metadatas", "documents", "distances"), **kwargs):
+        """Same contract as chromadb Collection.query."""
+        if (where or where_document or kwargs or query_embeddings is None or "embeddings" in include
+                or self.corpus_version.get() != self.built_version):
+            return self.collection.query(
+                query_embeddings=query_embeddings, n_results=n_results, where=where,
+                where_document=where_document, include=list(include), **kwargs
+            )
+
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": [],
+                   "embeddings": None, "uris": None, "data": None}
+        for query_embedding in query_embeddings:
+            if self.index.vectors is not None:
+                ids, distances = self.index.search(query_embedding, n_results, self.rescore_factor)
+                stored = self.collection.get(ids=ids, include=["documents", "metadatas"]) if ids else None
+            else:
+                candidates = self.index.candidates(query_embedding, n_results, self.rescore_factor)
+                stored = self.collection.get(
+                    ids=candidates, include=["embeddings", "documents", "metadatas"]
+                ) if candidates else None
+                ids, distances = rescore(
+                    query_embedding, stored["ids"], np.asarray(stored["embeddings"], dtype=np.float32),
+                    n_results, self.index.space
+                ) if stored and len(stored["ids"]) else ([], [])
+            by_id = {doc_id: i for i, doc_id in enumerate(stored["ids"])} if stored else {}
+
+            # Drop IDs deleted from ChromaDB since the index was built
+            kept = [(doc_id, distance) for doc_id, distance in zip(ids, distances) if doc_id in by_id]
+            results["ids"].append([doc_id for doc_id, _ in kept])
+            results["distances"].append([distance for _, distance in kept])
+            results["documents"].append([stored["documents"][by_id[doc_id]] for doc_id, _ in kept])
+            results["metadatas"].append([stored["metadatas"][by_id[doc_id]] for doc_id, _ in kept])
+
+        for field in ("documents", "metadatas", "distances"):
+            if field not in include:
+                results[field] = None
+        return results
+
+
+def rescore(query: List[float], ids: List[str], vectors: np.ndarray, k: int, space: str = "l2"):
+    """
+    Rank candidates by their exact distance to the query.
+
+    Args:
+        query: Query embedding
+        ids: Candidate IDs
+        vectors: Their float vectors (len(ids) x dimensions)
+        k: Number of results
+        space: Collection distance space
+
+    Returns:
+        (ids, distances) of the k nearest candidates, nearest first
+    """
+    if not len(ids) or k <= 0:
+        return [], []
+    distances = vector_distances(np.asarray(query, dtype=np.float32), vectors, space)
+    order = np.argsort(distances)[:k]
+    return [ids[row] for row in order], distances[order].tolist()
+
+
+def vector_distances(query: np.ndarray, vectors: np.ndarray, space: str = "l2") -> np.ndarray:
+    """
+    Exact distances from a query to vectors, as ChromaDB computes them.
+
+    Args:
+        query: Query vector
+        vectors: Candidate vectors (n x dimensions)
+        space: Collection distance space ("l2" = squared L2, "cosine" or "ip")
+
+    Returns:
+        One distance per vector (smaller is closer)
+    """
+    dots = vectors @ query
+    if space == "ip":
+        return 1.0 - dots
+    if space == "cosine":
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+        return 1.0 - dots / np.maximum(norms, 1e-12)
+    return np.maximum((vectors * vectors).sum(axis=1) - 2 * dots + query @ query, 0.0)
+
+
+def quantized_index_dir(db_path: str, collection_name: str) -> str:
+    """Where a collection's quantized index is saved (next to the ChromaDB files)."""
+    return str(Path(db_path) / "vector_index" / collection_name)
+
+
+def read_quantized_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Read a saved index's metadata (None if there is no index)."""
+    try:
+        return json.loads((Path(path) / META_FILE).read_text())
+    except (OSError, ValueError):
+        return None
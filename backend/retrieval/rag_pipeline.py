@@ -1,14 +1,112 @@
 """RAG pipeline for query processing and answer generation."""
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import HumanMessage, SystemMessage
 import json
+import re
+from contextlib import nullcontext
 from difflib import SequenceMatcher
 from .query_classifier import classify_query, get_system_prompt_modifier
 from .query_router import QueryRouter, QueryRoute
 
 
+class AnswerStreamParser:
+    """
+    Incrementally extract the "answer" string from a streamed JSON LLM response.
+
+    The model is prompted to reply with {"answer": "...", "confidence": "..."},
+    so raw tokens cannot be forwarded to the user as-is. Feed each streamed
+    chunk to feed(); it returns only the newly decoded answer text.
+    """
+
+    ANSWER_START = re.compile(r'"answer"\s*:\s*"')
+    ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = None  # Index in buffer of the next undecoded answer character
+        self.finished = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a streamed chunk and return any newly available answer text.
+
+        Args:
+            chunk: Raw text emitted by the LLM
+
+        Returns:
+            Decoded answer text (empty string if nothing new)
+        """
+        if self.finished:
+            return ""
+
+        self.buffer += chunk
+
+        if self.position is None:
+            match = self.ANSWER_START.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+
+        decoded = []
+        i = self.position
+        while i < len(self.buffer):
+            char = self.buffer[i]
+            if char == '"':
+                self.finished = True
+                i += 1
+                break
+            if char != '\\':
+                decoded.append(char)
+                i += 1
+                continue
+
+            # Escape sequence - wait for more input if it is split across chunks
+            if i + 1 >= len(self.buffer):
+                break
+            code = self.buffer[i + 1]
+            if code != 'u':
+                decoded.append(self.ESCAPES.get(code, code))
+                i += 2
+                continue
+            if i + 6 > len(self.buffer):
+                break
+            codepoint = self._hex(self.buffer[i + 2:i + 6])
+            if codepoint is None:
+                # Malformed escape - pass it through as written rather than end the stream
+                decoded.append(self.buffer[i:i + 2])
+                i += 2
+            elif 0xD800 <= codepoint < 0xDC00:
+                # High surrogate - needs the following \uXXXX low surrogate
+                pair = self.buffer[i + 6:i + 12]
+                if len(pair) < 6 and '\\u'.startswith(pair[:2]):
+                    break
+                low = self._hex(pair[2:]) if pair.startswith('\\u') else None
+                if low is not None and 0xDC00 <= low < 0xE000:
+                    decoded.append(chr(0x10000 + ((codepoint - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                else:
+                    decoded.append('\ufffd')  # Unpaired surrogate
+                    i += 6
+            elif 0xDC00 <= codepoint < 0xE000:
+                decoded.append('\ufffd')  # Unpaired surrogate
+                i += 6
+            else:
+                decoded.append(chr(codepoint))
+                i += 6
+
+        self.position = i
+        return "".join(decoded)
+
+    @staticmethod
+    def _hex(digits: str) -> Optional[int]:
+        """Value of the 4 hex digits of a \\uXXXX escape (None if they aren't hex)."""
+        if len(digits) != 4 or any(char not in "0123456789abcdefABCDEF" for char in digits):
+            return None
+        return int(digits, 16)
+
+
 class RAGPipeline:
     """Orchestrate retrieval and generation for Q&A."""
 
@@ -16,7 +114,8 @@ class RAGPipeline:
         self,
         openai_api_key: str,
         model: str = "gpt-4-turbo-preview",
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        admission=None  # AdmissionGate limiting concurrent LLM calls (optional)
     ):
         self.llm = ChatOpenAI(
             model=model,
@@ -24,6 +123,7 @@ class RAGPipeline:
             openai_api_key=openai_api_key
         )
         self.router = QueryRouter()
+        self.admission = admission
 
     def route_query(self, question: str) -> QueryRoute:
         """
@@ -130,6 +230,50 @@ class RAGPipeline:
         Returns:
             Dict with answer, confidence, and formatted sources
         """
+        messages = self.build_messages(question, retrieved_chunks, conversation_history)
+        with self.admission.slot() if self.admission else nullcontext():
+            response = self.llm.invoke(messages)
+        return self.parse_llm_response(response.content)
+
+    async def agenerate_answer(
+        self,
+        question: str,
+        retrieved_chunks: List[Dict[str, any]],
+        conversation_history: List[Dict[str, str]] = None
+    ) -> Dict[str, any]:
+        """
+        Async variant of generate_answer using the LLM's native ainvoke.
+
+        Args:
+            question: User's question
+            retrieved_chunks: List of retrieved document chunks
+            conversation_history: Previous conversation messages (optional)
+
+        Returns:
+            Dict with answer, confidence, and formatted sources
+        """
+        messages = self.build_messages(question, retrieved_chunks, conversation_history)
+        async with self.admission.aslot() if self.admission else nullcontext():
+            response = await self.llm.ainvoke(messages)
+        return self.parse_llm_response(response.content)
+
+    def build_messages(
+        self,
+        question: str,
+        retrieved_chunks: List[Dict[str, any]],
+        conversation_history: List[Dict[str, str]] = None
+    ) -> list:
+        """
+        Build the system and user messages sent to the LLM.
+
+        Args:
+            question: User's question
+            retrieved_chunks: List of retrieved document chunks
+            conversation_history: Previous conversation messages (optional)
+
+        Returns:
+            List of chat messages
+        """
         # Classify query type
         query_type = classify_query(question)
         query_modifier = get_system_prompt_modifier(query_type)
@@ -205,16 +349,23 @@ Question: {question}
 
 Provide your answer as a valid JSON object (raw JSON, no markdown formatting)."""
 
-        # Call LLM
-        messages = [
+        return [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
         ]
 
-        response = self.llm.invoke(messages)
+    def parse_llm_response(self, content: str) -> Dict[str, any]:
+        """
+        Parse the raw LLM output into answer, confidence, and reasoning.
+
+        Args:
+            content: Raw message content returned by the LLM
 
+        Returns:
+            Dict with answer, confidence, and reasoning
+        """
         # Parse JSON response - handle various formats
-        content = response.content.strip()
+        content = content.strip()
 
         # Remove markdown code blocks if present
         if content.startswith('```'):
@@ -388,17 +539,91 @@ Provide your answer as a valid JSON object (raw JSON, no markdown formatting).""
         Returns:
             Formatted response with answer, confidence, and sources
         """
-        # Deduplicate chunks for count queries to improve accuracy
         query_type = classify_query(question)
-        if query_type == "count":
-            print(f"[QUERY] Count query detected, deduplicating chunks...")
-            deduplicated_chunks = self.deduplicate_chunks(retrieved_chunks, similarity_threshold=0.85)
-        else:
-            deduplicated_chunks = retrieved_chunks
+        generation_chunks = self._prepare_generation_chunks(retrieved_chunks, query_type)
 
         # Generate answer
-        llm_result = self.generate_answer(question, deduplicated_chunks, conversation_history)
+        llm_result = self.generate_answer(question, generation_chunks, conversation_history)
+
+        return self._build_response(llm_result, retrieved_chunks, query_type)
 
+    async def aprocess_query(
+        self,
+        question: str,
+        retrieved_chunks: List[Dict[str, any]],
+        conversation_history: List[Dict[str, str]] = None
+    ) -> Dict[str, any]:
+        """
+        Async variant of process_query.
+
+        Args:
+            question: User's question
+            retrieved_chunks: Retrieved document chunks with scores
+            conversation_history: Previous conversation messages (optional)
+
+        Returns:
+            Formatted response with answer, confidence, and sources
+        """
+        query_type = classify_query(question)
+        generation_chunks = self._prepare_generation_chunks(retrieved_chunks, query_type)
+
+        llm_result = await self.agenerate_answer(question, generation_chunks, conversation_history)
+
+        return self._build_response(llm_result, retrieved_chunks, query_type)
+
+    async def astream_answer(
+        self,
+        question: str,
+        retrieved_chunks: List[Dict[str, any]],
+        conversation_history: List[Dict[str, str]] = None
+    ) -> AsyncIterator[Tuple[str, any]]:
+        """
+        Stream answer text as the LLM produces it.
+
+        Yields ("token", text) for each decoded piece of the answer field,
+        then a single ("result", response) with the same shape process_query
+        returns. The final answer may differ from the concatenated tokens when
+        post-processing (count de-duplication, structured answers) applies.
+
+        Args:
+            question: User's question
+            retrieved_chunks: Retrieved document chunks with scores
+            conversation_history: Previous conversation messages (optional)
+        """
+        query_type = classify_query(question)
+        generation_chunks = self._prepare_generation_chunks(retrieved_chunks, query_type)
+        messages = self.build_messages(question, generation_chunks, conversation_history)
+
+        parser = AnswerStreamParser()
+        raw_parts = []
+        async with self.admission.aslot() if self.admission else nullcontext():
+            async for chunk in self.llm.astream(messages):
+                raw_parts.append(chunk.content)
+                text = parser.feed(chunk.content)
+                if text:
+                    yield "token", text
+
+        llm_result = self.parse_llm_response("".join(raw_parts))
+        yield "result", self._build_response(llm_result, retrieved_chunks, query_type)
+
+    def _prepare_generation_chunks(
+        self,
+        retrieved_chunks: List[Dict[str, any]],
+        query_type: str
+    ) -> List[Dict[str, any]]:
+        """Deduplicate chunks for count queries to improve accuracy."""
+        if query_type == "count":
+            print(f"[QUERY] Count query detected, deduplicating chunks...")
+            return self.deduplicate_chunks(retrieved_chunks, similarity_threshold=0.85)
+        return retrieved_chunks
+
+    def _build_response(
+        self,
+        llm_result: Dict[str, any],
+        retrieved_chunks: List[Dict[str, any]],
+        query_type: str
+    ) -> Dict[str, any]:
+        """Post-process the LLM result and attach formatted sources."""
         # Post-process answer to remove duplicate sections for count queries
         if query_type == "count":
             llm_result['answer'] = self._remove_duplicate_sections(llm_result['answer'])
@@ -0,0 +1,182 @@
+"""Semantic answer cache for near-duplicate questions."""
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def semantic_context_key(
+    corpus_version: str,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    history_window: int = 6
+) -> str:
+    """
+    Key for everything besides the question that an answer depends on.
+
+    Args:
+        corpus_version: Current corpus version stamp
+        conversation_history: Previous conversation messages (optional)
+        history_window: Trailing conversation messages sent to the LLM
+
+    Returns:
+        Hex digest; only entries with the same context can match
+    """
+    history = [
+        [msg.get('role', 'user'), msg.get('content', '')]
+        for msg in (conversation_history or [])[-history_window:]
+    ]
+    payload = json.dumps([corpus_version, history])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def mark_semantic_hit(response: Dict[str, Any], similarity: float, matched_question: str) -> Dict[str, Any]:
+    """Record in the response metadata that it was served from the semantic cache."""
+    response.setdefault('metadata', {}).update({
+        'semantic_cache_hit': True,
+        'semantic_similarity': round(similarity, 4),
+        'matched_question': matched_question,
+    })
+    return response
+
+
+class SemanticCache:
+    """
+    Cache answers by question embedding instead of exact text.
+
+    Past question embeddings are kept L2-normalized in a fixed-capacity float32
+    matrix, so a lookup is a single matrix-vector product. A cached answer is
+    returned when the best cosine similarity reaches the threshold and the
+    route type and context (corpus version, conversation tail) match.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 500, ttl_seconds: float = 6 * 3600):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Capacity (least recently used entries are replaced)
+            ttl_seconds: Time after which an entry can no longer match
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._matrix: Optional[np.ndarray] = None  # (max_entries, dim), allocated on first add
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(
+        self,
+        embedding: List[float],
+        route_type: str,
+        context_key: str
+    ) -> Optional[Tuple[Dict[str, Any], float, str]]:
+        """
+        Find a cached answer for a semantically equivalent question.
+
+        Args:
+            embedding: Embedding of the incoming question
+            route_type: Route the question was classified to
+            context_key: Key from semantic_context_key
+
+        Returns:
+            (response copy, similarity, matched question) or None
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            valid = np.array([
+                entry is not None
+                and entry['route_type'] == route_type
+                and entry['context_key'] == context_key
+                and entry['expires_at'] > now
+                for entry in self._entries
+            ])
+            if not valid.any():
+                self.misses += 1
+                return None
+
+            similarities = self._matrix @ query
+            similarities[~valid] = -1.0
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._last_used[best] = now
+            entry = self._entries[best]
+            return copy.deepcopy(entry['response']), similarity, entry['question']
+
+    def add(
+        self,
+        embedding: List[float],
+        route_type: str,
+        context_key: str,
+        question: str,
+        response: Dict[str, Any]
+    ):
+        """
+        Remember the answer to a question.
+
+        Args:
+            embedding: Embedding of the question
+            route_type: Route type the answer was produced for
+            context_key: Key from semantic_context_key
+            question: Original question text (reported on hits)
+            response: Response dict to cache
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                # First entry, or the embedding dimension changed - start over
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._entries = [None] * self.max_entries
+                self._last_used[:] = 0
+
+            # Prefer an empty slot, otherwise replace the least recently used entry
+            slot = next((i for i, entry in enumerate(self._entries) if entry is None), None)
+            if slot is None:
+                slot = int(np.argmin(self._last_used))
+
+            now = time.time()
+            self._matrix[slot] = vector
+            self._last_used[slot] = now
+            self._entries[slot] = {
+                'route_type': route_type,
+                'context_key': context_key,
+                'question': question,
+                'expires_at': now + self.ttl_seconds,
+                'response': copy.deepcopy(response),
+            }
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries if entry is not None)
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        """Return the embedding as a unit-length float32 vector (None for a zero vector)."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
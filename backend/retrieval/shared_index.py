@@ -0,0 +1,32 @@
+"""Helpers shared by the BM25 index and its saved, memory-mapped form."""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+META_FILE = "meta.json"
+
+# Collections with a BM25 index; each collection's index is its own namespace
+LEXICAL_COLLECTIONS = ("fta_compliance_guide", "historical_audits")
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenizer shared by index building and query scoring."""
+    return text.lower().split()
+
+
+def lexical_index_root(db_path: str) -> str:
+    """Directory holding one saved BM25 index per collection (next to the ChromaDB files)."""
+    return str(Path(db_path) / "lexical_index")
+
+
+def lexical_index_dir(db_path: str, collection_name: str) -> str:
+    """Where a collection's BM25 index is saved."""
+    return str(Path(lexical_index_root(db_path)) / collection_name)
+
+
+def read_index_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Read a saved index's metadata (None if there is no index)."""
+    try:
+        return json.loads((Path(path) / META_FILE).read_text())
+    except (OSError, ValueError):
+        return None
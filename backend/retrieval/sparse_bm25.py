@@ -0,0 +1,586 @@
+"""BM25 as a precomputed sparse term-document weight matrix.
+
+rank_bm25.BM25Okapi scores a query by looping in Python over every document
+for every query term. Here the BM25 contribution of every (term, document)
+posting is computed once at build time and stored as a CSR matrix with one
+row per term. Scoring a query is then a sparse vector-matrix product: the
+rows of the query's terms, weighted by how often each term occurs in the
+query, summed into a dense score vector with one np.bincount. Top-k uses
+np.argpartition, so nothing per query is proportional to the corpus in
+Python.
+
+When only the best few documents are needed, top_k avoids scoring the
+whole corpus with MaxScore-style dynamic pruning over per-term upper bounds,
+and score_documents scores just a given candidate set; both are exact.
+
+The index is nothing but flat arrays, strings included (the vocabulary and
+the document IDs are UTF-8 blobs with offsets, looked up by binary search).
+Ingestion saves one per collection next to the ChromaDB files, stamped with
+the corpus version, and the API memory-maps them: opening one reads no
+documents, builds no Python objects per term or document, and every worker
+process shares the same pages through the OS page cache.
+"""
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .shared_index import LEXICAL_COLLECTIONS, META_FILE, lexical_index_root, read_index_meta, tokenize
+
+ARRAYS = (
+    "terms", "terms_offsets", "terms_prefixes", "idf", "row_offsets", "posting_docs", "posting_weights",
+    "max_weights", "doc_lengths", "doc_ids", "doc_ids_offsets", "doc_ids_prefixes", "doc_ids_order",
+)
+
+# Documents per block when bounding the k-th largest score by blockwise maxima
+_BLOCK = 1024
+_READ_PAGE = 1000
+# Bytes of each string kept in fixed width for np.searchsorted lookups
+_PREFIX = 16
+
+
+class StringTable:
+    """
+    Read-only list of strings stored as a UTF-8 blob plus end offsets (memory-mappable).
+
+    Lookups binary-search fixed-width 16-byte prefixes of the strings in
+    sorted order with np.searchsorted, then compare whole strings only among
+    the few that share the prefix.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, prefixes: np.ndarray, order: Optional[np.ndarray] = None):
+        """
+        Initialize table from its arrays.
+
+        Args:
+            blob: Concatenated UTF-8 strings
+            offsets: End offset of each string in the blob
+            prefixes: First _PREFIX bytes of each string, in sorted order
+            order: Permutation that sorts the table (None if the strings are stored sorted)
+        """
+        self.blob = blob
+        self.offsets = offsets
+        self.prefixes = prefixes
+        self.order = order
+        self._data = memoryview(blob) if len(blob) else memoryview(b"")
+
+    @classmethod
+    def from_strings(cls, values: List[str], stored_sorted: bool = False) -> "StringTable":
+        """
+        Build a table.
+
+        Args:
+            values: Strings, in table order
+            stored_sorted: The values are already sorted (no permutation needed)
+        """
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+        order = None if stored_sorted else np.array(sorted(range(len(encoded)), key=encoded.__getitem__),
+                                                    dtype=np.int64)
+        in_order = encoded if order is None else [encoded[i] for i in order]
+        prefixes = np.array([value[:_PREFIX] for value in in_order], dtype=f"S{_PREFIX}")
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets, prefixes, order)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _bytes(self, i: int) -> bytes:
+        start = int(self.offsets[i - 1]) if i else 0
+        return bytes(self._data[start:int(self.offsets[i])])
+
+    def __getitem__(self, i: int) -> str:
+        return self._bytes(int(i)).decode("utf-8")
+
+    def tolist(self) -> List[str]:
+        data = self.blob.tobytes()
+        starts = [0] + self.offsets[:-1].tolist()
+        return [data[start:end].decode("utf-8") for start, end in zip(starts, self.offsets.tolist())]
+
+    def find(self, value: str) -> int:
+        """Position of a string in the table (-1 if absent)."""
+        key = value.encode("utf-8")
+        low = int(np.searchsorted(self.prefixes, key[:_PREFIX], side="left"))
+        high = int(np.searchsorted(self.prefixes, key[:_PREFIX], side="right"))
+        while low < high:
+            middle = (low + high) // 2
+            position = int(self.order[middle]) if self.order is not None else middle
+            stored = self._bytes(position)
+            if stored == key:
+                return position
+            if stored < key:
+                low = middle + 1
+            else:
+                high = middle
+        return -1
+
+
+class SparseBM25Index:
+    """BM25 (Okapi) index with scores identical to rank_bm25.BM25Okapi (up to float32 rounding)."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], avgdl: float, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize index from its arrays (in memory or memory-mapped).
+
+        Args:
+            arrays: The arrays named in ARRAYS:
+                terms, terms_offsets, terms_prefixes: Vocabulary, sorted (see StringTable); term i is CSR row i
+                idf: Idf of each term
+                row_offsets: Start of each term's postings (one entry per term, plus the end)
+                posting_docs: Document index of each posting, ascending within a row
+                posting_weights: BM25 contribution of each posting (idf * saturated, length-normalized tf)
+                max_weights: Largest posting weight of each term (upper bound, for pruning)
+                doc_lengths: Tokens per document
+                doc_ids, doc_ids_offsets, doc_ids_prefixes, doc_ids_order: Document IDs in
+                    index order (see StringTable)
+            avgdl: Average document length
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.arrays = arrays
+        self.vocab = StringTable(arrays["terms"], arrays["terms_offsets"], arrays["terms_prefixes"])
+        self.idf = arrays["idf"]
+        self.row_offsets = arrays["row_offsets"]
+        self.posting_docs = arrays["posting_docs"]
+        self.posting_weights = arrays["posting_weights"]
+        self.max_weights = arrays["max_weights"]
+        self.doc_lengths = arrays["doc_lengths"]
+        self.doc_ids = StringTable(
+            arrays["doc_ids"], arrays["doc_ids_offsets"], arrays["doc_ids_prefixes"], arrays["doc_ids_order"]
+        )
+        self.avgdl = avgdl
+        self.k1 = k1
+        self.b = b
+
+    @classmethod
+    def build(
+        cls,
+        documents: List[str],
+        document_ids: List[str],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25
+    ) -> "SparseBM25Index":
+        """
+        Build the weight matrix.
+
+        Args:
+            documents: Document texts
+            document_ids: Corresponding document IDs
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+            epsilon: Floor for negative idf values, as a fraction of the average idf
+
+        Returns:
+            Index ready to score or save
+        """
+        vocab: Dict[str, int] = {}
+        term_rows, doc_rows, tf_values = [], [], []
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+        for doc_index, text in enumerate(documents):
+            tokens = tokenize(text)
+            doc_lengths[doc_index] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_rows.append(vocab.setdefault(term, len(vocab)))
+                doc_rows.append(doc_index)
+                tf_values.append(tf)
+
+        # Rows in sorted term order, so a saved vocabulary can be binary-searched
+        terms_sorted = sorted(vocab)
+        rank = np.empty(len(vocab), dtype=np.int64)
+        rank[[vocab[term] for term in terms_sorted]] = np.arange(len(vocab))
+        terms = rank[np.asarray(term_rows, dtype=np.int64)]
+        docs = np.asarray(doc_rows, dtype=np.int32)
+        tfs = np.asarray(tf_values, dtype=np.float32)
+
+        # Same idf (with epsilon floor) as rank_bm25.BM25Okapi
+        corpus_size = len(documents)
+        doc_freqs = np.bincount(terms, minlength=len(vocab)).astype(np.float64)
+        idf = np.log(corpus_size - doc_freqs + 0.5) - np.log(doc_freqs + 0.5)
+        if len(idf):
+            idf[idf < 0] = epsilon * idf.mean()
+
+        avgdl = float(doc_lengths.mean()) if corpus_size else 1.0
+        length_norm = k1 * (1 - b + b * doc_lengths / (avgdl or 1.0))
+        weights = (idf[terms] * (tfs * (k1 + 1)) / (tfs + length_norm[docs])).astype(np.float32)
+
+        # Group postings by term (stable, so each row stays in document order)
+        order = np.argsort(terms, kind="stable")
+        row_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        row_offsets[1:] = np.cumsum(doc_freqs.astype(np.int64))
+        posting_weights = weights[order]
+
+        term_table = StringTable.from_strings(terms_sorted, stored_sorted=True)
+        id_table = StringTable.from_strings(list(document_ids))
+        arrays = {
+            "terms": term_table.blob,
+            "terms_offsets": term_table.offsets,
+            "terms_prefixes": term_table.prefixes,
+            "idf": idf.astype(np.float32),
+            "row_offsets": row_offsets,
+            "posting_docs": docs[order],
+            "posting_weights": posting_weights,
+            "max_weights": (np.maximum.reduceat(posting_weights, row_offsets[:-1])
+                            if len(vocab) else np.empty(0, dtype=np.float32)),
+            "doc_lengths": doc_lengths,
+            "doc_ids": id_table.blob,
+            "doc_ids_offsets": id_table.offsets,
+            "doc_ids_prefixes": id_table.prefixes,
+            "doc_ids_order": id_table.order,
+        }
+        return cls(arrays, avgdl=avgdl or 1.0, k1=k1, b=b)
+
+    @classmethod
+    def from_collection(cls, collection) -> "SparseBM25Index":
+        """
+        Build the index from every document of a ChromaDB collection (read in pages).
+
+        Args:
+            collection: ChromaDB collection
+
+        Returns:
+            Built index
+        """
+        documents, ids = [], []
+        for start in range(0, collection.count(), _READ_PAGE):
+            page = collection.get(include=["documents"], limit=_READ_PAGE, offset=start)
+            documents.extend(page["documents"])
+            ids.extend(page["ids"])
+        return cls.build(documents, ids)
+
+    def save(self, path: str, corpus_version: str):
+        """
+        Write the index to a directory, replacing any previous index there.
+
+        The new index is written to a temporary directory and swapped in, so
+        workers never open a half-written index. Workers that already mapped
+        the old files keep reading them until they re-attach.
+
+        Args:
+            path: Index directory
+            corpus_version: Corpus version the index was built from
+        """
+        target = Path(path)
+        tmp_dir = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        old_dir = target.with_name(f".{target.name}.{os.getpid()}.old")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        for name in ARRAYS:
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(self.arrays[name]))
+        (tmp_dir / META_FILE).write_text(json.dumps({
+            "corpus_version": corpus_version,
+            "documents": len(self),
+            "terms": len(self.vocab),
+            "avgdl": self.avgdl,
+            "k1": self.k1,
+            "b": self.b,
+        }))
+
+        if target.exists():
+            os.replace(target, old_dir)
+        os.replace(tmp_dir, target)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str) -> "SparseBM25Index":
+        """
+        Memory-map a saved index (read-only, shared between processes).
+
+        Args:
+            path: Index directory written by save()
+
+        Returns:
+            Index backed by the mapped files
+
+        Raises:
+            FileNotFoundError: If there is no index at path
+        """
+        meta = read_index_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"No BM25 index at {path}")
+
+        arrays = {name: np.load(Path(path) / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+        return cls(arrays, avgdl=meta["avgdl"], k1=meta["k1"], b=meta["b"])
+
+    @classmethod
+    def open(cls, collection, path: str, corpus_version: str) -> "SparseBM25Index":
+        """
+        Memory-map the saved index of a collection, rebuilding it if missing or stale.
+
+        Args:
+            collection: ChromaDB collection the index covers
+            path: Index directory
+            corpus_version: Current corpus version (read before the collection, so a
+                concurrent ingestion leaves the saved index stale rather than wrongly current)
+
+        Returns:
+            Index matching the collection's current contents
+        """
+        meta = read_index_meta(path)
+        if meta and meta["corpus_version"] == corpus_version and meta["documents"] == collection.count():
+            try:
+                return cls.load(path)
+            except (OSError, ValueError) as e:
+                print(f"[BM25 INDEX] Could not open index at {path}: {e} - rebuilding")
+
+        index = cls.from_collection(collection)
+        try:
+            index.save(path, corpus_version)
+            return cls.load(path)
+        except OSError as e:
+            print(f"[BM25 INDEX] Could not save index to {path}: {e} - keeping it in memory")
+            return index
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the index arrays."""
+        return int(sum(array.nbytes for array in self.arrays.values()))
+
+    def positions(self, document_ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Index positions of documents, looked up by ID.
+
+        Args:
+            document_ids: Document IDs (unknown IDs are skipped)
+
+        Returns:
+            (IDs found, their positions)
+        """
+        found, positions = [], []
+        for doc_id in document_ids:
+            position = self.doc_ids.find(doc_id)
+            if position >= 0:
+                found.append(doc_id)
+                positions.append(position)
+        return found, np.array(positions, dtype=np.int64)
+
+    def _query_rows(self, tokenized_query: List[str]) -> List[Tuple[int, int]]:
+        """(row, count) of each known query term."""
+        rows = Counter(self.vocab.find(term) for term in tokenized_query)
+        rows.pop(-1, None)
+        return list(rows.items())
+
+    def get_scores(self, tokenized_query: List[str]) -> np.ndarray:
+        """
+        BM25 score of every document for a tokenized query.
+
+        Args:
+            tokenized_query: Query tokens (repeated tokens count repeatedly, as in BM25Okapi)
+
+        Returns:
+            float32 array with one score per document, in index order
+        """
+        rows = self._query_rows(tokenized_query)
+        if not rows:
+            return np.zeros(len(self), dtype=np.float32)
+        if len(rows) == 1:
+            row, count = rows[0]
+            start, end = self.row_offsets[row], self.row_offsets[row + 1]
+            scores = np.zeros(len(self), dtype=np.float32)
+            scores[self.posting_docs[start:end]] = count * self.posting_weights[start:end]
+            return scores
+
+        docs = np.concatenate([self.posting_docs[self.row_offsets[row]:self.row_offsets[row + 1]] for row, _ in rows])
+        weights = np.concatenate([
+            count * self.posting_weights[self.row_offsets[row]:self.row_offsets[row + 1]] for row, count in rows
+        ])
+        return np.bincount(docs, weights=weights, minlength=len(self)).astype(np.float32)
+
+    def _postings(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Document indexes (ascending) and weights of one term."""
+        start, end = self.row_offsets[row], self.row_offsets[row + 1]
+        return self.posting_docs[start:end], self.posting_weights[start:end]
+
+    def score_documents(self, tokenized_query: List[str], doc_indexes: np.ndarray) -> np.ndarray:
+        """
+        BM25 scores of selected documents only.
+
+        Each query term's postings are binary-searched for the documents,
+        so the cost depends on the number of documents, not the corpus.
+
+        Args:
+            tokenized_query: Query tokens
+            doc_indexes: Documents to score (positions in the index)
+
+        Returns:
+            float32 scores, aligned with doc_indexes
+        """
+        doc_indexes = np.asarray(doc_indexes, dtype=np.int64)
+        scores = np.zeros(len(doc_indexes), dtype=np.float32)
+        for row, count in self._query_rows(tokenized_query):
+            docs, weights = self._postings(row)
+            positions = np.searchsorted(docs, doc_indexes)
+            found = positions < len(docs)
+            found[found] = docs[positions[found]] == doc_indexes[found]
+            scores[found] += count * weights[positions[found]]
+        return scores
+
+    def top_k(self, tokenized_query: List[str], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact BM25 top-k without scoring the whole corpus (MaxScore pruning).
+
+        Terms are processed from the highest upper bound (rare terms, short
+        posting lists) down. Scores accumulated so far are lower bounds, so
+        the k-th best of them is a threshold: once the upper bounds of the
+        remaining terms add up to less than it, documents not seen yet can
+        no longer reach the top k, and the remaining (common, long) terms
+        only update the surviving candidates by binary search. Candidates
+        that cannot catch up with the threshold are dropped along the way.
+
+        Args:
+            tokenized_query: Query tokens
+            k: Number of results
+
+        Returns:
+            (document indexes, scores), best first; only documents with a positive score
+        """
+        rows = self._query_rows(tokenized_query)
+        if not rows or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        bounds = np.array([count * self.max_weights[row] for row, count in rows], dtype=np.float64)
+        order = np.argsort(-bounds, kind="stable")
+        rows = [rows[i] for i in order]
+        # remaining[i] = best total the terms from i onwards can still add
+        remaining = np.concatenate((np.cumsum(bounds[order][::-1])[::-1], [0.0]))
+
+        # Phase 1 (new documents can still reach the top k): add whole posting lists into a dense accumulator
+        accumulator = np.zeros(len(self), dtype=np.float32)
+        threshold, i = 0.0, 0
+        while i < len(rows):
+            row, count = rows[i]
+            docs, weights = self._postings(row)
+            accumulator[docs] += count * weights
+            i += 1
+            # No score can exceed the bounds processed so far, so skip the threshold until they outweigh the rest
+            if i == len(rows) or remaining[0] - remaining[i] <= remaining[i]:
+                continue
+            threshold = max(threshold, _kth_largest_lower_bound(accumulator, k))
+            if remaining[i] < threshold:
+                break
+        # Candidates: documents that can still reach the threshold (and a positive score, the only kind returned)
+        if threshold > 0:
+            candidates = np.flatnonzero(accumulator >= threshold - remaining[i])
+        else:
+            candidates = np.flatnonzero(accumulator)
+
+        # Phase 2: the remaining terms only update candidates that can still reach the threshold
+        scores = accumulator[candidates]
+        while i < len(rows):
+            keep = scores + remaining[i] >= threshold
+            candidates, scores = candidates[keep], scores[keep]
+            row, count = rows[i]
+            docs, weights = self._postings(row)
+            positions = np.searchsorted(docs, candidates)
+            found = positions < len(docs)
+            found[found] = docs[positions[found]] == candidates[found]
+            scores[found] += count * weights[positions[found]]
+            i += 1
+            if len(scores) >= k:
+                threshold = _kth_largest(scores, k)
+
+        top, top_scores = top_k_indices(scores, k)
+        return candidates[top], top_scores
+
+
+def open_lexical_indexes(client, index_root: str, corpus_version: str) -> Dict[str, SparseBM25Index]:
+    """
+    Open (rebuilding where missing or stale) the BM25 index of every lexical collection.
+
+    A corpus version bump leaves every collection's index stale, so ingestion
+    of any one collection calls this to bring all of them up to date.
+
+    Args:
+        client: ChromaDB client
+        index_root: Directory with one index subdirectory per collection
+        corpus_version: Current corpus version
+
+    Returns:
+        Collection name -> index, for the lexical collections that exist
+    """
+    existing = {collection.name: collection for collection in client.list_collections()}
+    return {
+        name: SparseBM25Index.open(existing[name], str(Path(index_root) / name), corpus_version)
+        for name in LEXICAL_COLLECTIONS
+        if name in existing
+    }
+
+
+def save_lexical_indexes(client, db_path: str, corpus_version: str) -> Dict[str, SparseBM25Index]:
+    """
+    Save the BM25 index of every lexical collection after an ingestion run.
+
+    Called by the ingestion scripts once they have bumped the corpus
+    version; current indexes are left as they are. The API then
+    memory-maps them at startup.
+
+    Args:
+        client: ChromaDB client of the database that was ingested into
+        db_path: ChromaDB directory (indexes go to its lexical_index/)
+        corpus_version: Corpus version after the ingestion
+
+    Returns:
+        Collection name -> index
+    """
+    start_time = time.time()
+    indexes = open_lexical_indexes(client, lexical_index_root(db_path), corpus_version)
+    for name, index in indexes.items():
+        print(f"[BM25 INDEX] '{name}': {len(index)} documents, {len(index.vocab)} terms")
+    print(f"[BM25 INDEX] Indexes saved in {round(time.time() - start_time, 1)}s")
+    return indexes
+
+
+def _kth_largest(scores: np.ndarray, k: int) -> float:
+    """k-th largest value (k <= len(scores))."""
+    if k == 1:
+        return float(scores.max())
+    return float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+
+def _kth_largest_lower_bound(scores: np.ndarray, k: int) -> float:
+    """
+    Cheap lower bound of the k-th largest value (0.0 if there are fewer than k values).
+
+    The maxima of k different blocks are k different values, so the k-th
+    largest block maximum is at most the k-th largest value. Computing it
+    only needs a blockwise max over the array, not a partition of it.
+    """
+    blocks = len(scores) // _BLOCK
+    if blocks < k:
+        return _kth_largest(scores, k) if len(scores) >= k else 0.0
+    maxima = scores[:blocks * _BLOCK].reshape(blocks, _BLOCK).max(axis=1)
+    return _kth_largest(maxima, k)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indexes and values of the k largest positive scores, best first.
+
+    Args:
+        scores: One score per document
+        k: Number of results
+
+    Returns:
+        (indexes, scores)
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    # Partition only the scores that can be in the top k (positive, and at least a lower bound of the k-th)
+    floor = _kth_largest_lower_bound(scores, k)
+    positive = np.flatnonzero(scores >= floor) if floor > 0 else np.flatnonzero(scores > 0)
+    k = min(k, len(positive))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    if k < len(positive):
+        positive = positive[np.argpartition(-scores[positive], k - 1)[:k]]
+    top = positive[np.argsort(-scores[positive], kind="stable")]
+    return top, scores[top]
+
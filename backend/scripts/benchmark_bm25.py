@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-query BM25 cost of rank_bm25 against the sparse weight-matrix engine.
+
+Builds synthetic corpora (Zipf-distributed vocabulary, chunk-sized documents)
+of each size and times, per query:
+  - rank_bm25: BM25Okapi.get_scores plus a normalized score dict over the
+    whole corpus (what HybridRetriever did before)
+  - full scores: SparseBM25Index scores of every document (vectorized)
+  - full, top-10: best 10 documents of the full scores (top_k_indices)
+  - pruned, top-10: exact top 10 with MaxScore pruning (SparseBM25Index.top_k,
+    what HybridRetriever.keyword_search uses)
+  - pruned, 5 ids: 5 candidate documents plus the pruned top-1 used for
+    normalization (what HybridRetriever.merge_results does)
+
+Pruning pays off when a query's rare terms dominate its score; with common
+terms whose best postings score high (as in Zipf text) few documents can be
+ruled out early, and the pruned paths cost about as much as full scoring.
+
+rank_bm25 is skipped above --okapi-max documents (its index of per-document
+dicts gets very large, and its per-query cost grows linearly anyway).
+
+rank_bm25 is a development dependency (pip install -r requirements-dev.txt).
+
+Usage:
+    python scripts/benchmark_bm25.py
+    python scripts/benchmark_bm25.py --sizes 1000,10000,100000 --queries 200 --okapi-max 100000
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.hybrid_search import HybridRetriever
+from retrieval.shared_index import tokenize
+from retrieval.sparse_bm25 import top_k_indices
+from rank_bm25 import BM25Okapi
+
+
+def make_corpus(size: int, doc_tokens: int, vocabulary: int, rng: np.random.Generator):
+    """Synthetic documents whose word frequencies follow Zipf's law."""
+    words = np.array([f"w{i}" for i in range(vocabulary)])
+    ranks = np.arange(1, vocabulary + 1)
+    probabilities = (1 / ranks) / (1 / ranks).sum()
+    lengths = rng.integers(doc_tokens // 2, doc_tokens * 3 // 2, size=size)
+    tokens = rng.choice(vocabulary, size=int(lengths.sum()), p=probabilities)
+    documents, start = [], 0
+    for length in lengths:
+        documents.append(" ".join(words[tokens[start:start + length]]))
+        start += length
+    return documents, [f"chunk_{i}" for i in range(size)]
+
+
+def make_queries(count: int, vocabulary: int, rng: np.random.Generator):
+    """Queries of 3-8 mid-frequency words (the kind that discriminate between chunks)."""
+    return [
+        " ".join(f"w{i}" for i in rng.integers(20, min(vocabulary, 5000), size=rng.integers(3, 9)))
+        for _ in range(count)
+    ]
+
+
+def time_queries(search, queries):
+    """Mean and p95 latency in ms."""
+    latencies = []
+    for query in queries:
+        start_time = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return float(np.mean(latencies)), float(np.percentile(latencies, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-query cost of BM25 engines")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated corpus sizes (chunks)")
+    parser.add_argument("--doc-tokens", type=int, default=300, help="Average tokens per chunk")
+    parser.add_argument("--vocabulary", type=int, default=50000, help="Distinct words")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per measurement")
+    parser.add_argument("--okapi-max", type=int, default=10000, help="Largest corpus to run rank_bm25 on")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = make_queries(args.queries, args.vocabulary, rng)
+
+    print(f"{'chunks':>8}  {'engine':<16} {'build s':>8} {'mean ms':>8} {'p95 ms':>8}")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        documents, ids = make_corpus(size, args.doc_tokens, args.vocabulary, rng)
+        candidates = ids[:5]
+
+        if size <= args.okapi_max:
+            start_time = time.perf_counter()
+            okapi = BM25Okapi([tokenize(doc) for doc in documents])
+            build = time.perf_counter() - start_time
+
+            def okapi_scores(query):
+                scores = okapi.get_scores(tokenize(query))
+                max_score = max(scores) if max(scores) > 0 else 1.0
+                return dict(zip(ids, [score / max_score for score in scores]))
+
+            mean, p95 = time_queries(okapi_scores, queries)
+            print(f"{size:>8}  {'rank_bm25':<16} {build:>8.2f} {mean:>8.3f} {p95:>8.3f}")
+            del okapi
+        else:
+            print(f"{size:>8}  {'rank_bm25':<16} {'skipped (--okapi-max)':>26}")
+
+        retriever = HybridRetriever()
+        start_time = time.perf_counter()
+        retriever.build_bm25_index(documents, ids)
+        build = time.perf_counter() - start_time
+
+        index = retriever.bm25_index
+        mean, p95 = time_queries(lambda q: index.get_scores(tokenize(q)), queries)
+        print(f"{size:>8}  {'full scores':<16} {build:>8.2f} {mean:>8.3f} {p95:>8.3f}"
+              f"   ({index.nbytes / 1e6:.1f} MB of index arrays)")
+        mean, p95 = time_queries(lambda q: top_k_indices(index.get_scores(tokenize(q)), 10), queries)
+        print(f"{size:>8}  {'full, top-10':<16} {'':>8} {mean:>8.3f} {p95:>8.3f}")
+        mean, p95 = time_queries(lambda q: index.top_k(tokenize(q), 10), queries)
+        print(f"{size:>8}  {'pruned, top-10':<16} {'':>8} {mean:>8.3f} {p95:>8.3f}")
+        mean, p95 = time_queries(lambda q: retriever.get_bm25_scores(q, candidates), queries)
+        print(f"{size:>8}  {'pruned, 5 ids':<16} {'':>8} {mean:>8.3f} {p95:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
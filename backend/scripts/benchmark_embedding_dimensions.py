@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark reduced embedding dimensions against the full 3072.
+
+Reads the full-size vectors of an ingested collection, shortens them to each
+candidate size (truncate + re-normalize, which is what the API's `dimensions`
+parameter returns), loads each variant into an in-memory ChromaDB collection
+and reports recall@k against exact full-dimension search, query latency
+through the HNSW index, and vector storage.
+
+Queries are the configured common questions (embedded once with the API) or,
+with --sample-queries, stored document vectors (no API calls).
+
+Usage:
+    python scripts/benchmark_embedding_dimensions.py
+    python scripts/benchmark_embedding_dimensions.py --dims 256,512,1024 --k 10
+    python scripts/benchmark_embedding_dimensions.py --sample-queries 200
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from ingestion.embedding_dimensions import NATIVE_DIMENSIONS, REDUCIBLE_MODELS, truncate_embeddings
+import chromadb
+from ingestion.chroma_settings import chroma_settings
+from langchain_openai import OpenAIEmbeddings
+
+ADD_BATCH = 1000
+
+
+def load_vectors(collection_name: str):
+    """Load ids and full-size vectors of a persisted collection."""
+    client = chromadb.PersistentClient(
+        path=settings.chroma_db_path,
+        settings=chroma_settings()
+    )
+    collection = client.get_collection(collection_name)
+    data = collection.get(include=["embeddings"])
+    return data["ids"], np.asarray(data["embeddings"], dtype=np.float32)
+
+
+def embed_questions(questions: List[str], dimensions: int) -> np.ndarray:
+    """Embed benchmark questions at full size."""
+    embeddings = OpenAIEmbeddings(
+        model=settings.embedding_model,
+        dimensions=dimensions,
+        openai_api_key=settings.openai_api_key
+    )
+    return np.asarray(embeddings.embed_documents(questions), dtype=np.float32)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k document indices per query (ground truth)."""
+    scores = truncate_embeddings(queries, queries.shape[1]) @ truncate_embeddings(vectors, vectors.shape[1]).T
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def benchmark(ids: List[str], vectors: np.ndarray, queries: np.ndarray, dims: int, truth: np.ndarray, k: int):
+    """Index one dimension variant in memory and measure recall and latency."""
+    reduced = truncate_embeddings(vectors, dims)
+    reduced_queries = truncate_embeddings(queries, dims)
+
+    client = chromadb.EphemeralClient(settings=chroma_settings())
+    name = f"benchmark_{dims}"
+    try:
+        client.delete_collection(name)
+    except Exception:
+        pass
+    collection = client.create_collection(name)
+
+    start_time = time.time()
+    for i in range(0, len(ids), ADD_BATCH):
+        collection.add(ids=ids[i:i + ADD_BATCH], embeddings=reduced[i:i + ADD_BATCH].tolist())
+    build_ms = (time.time() - start_time) * 1000
+
+    id_index = {doc_id: i for i, doc_id in enumerate(ids)}
+    latencies, hits = [], 0
+    for query, expected in zip(reduced_queries, truth):
+        start_time = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        found = {id_index[doc_id] for doc_id in result["ids"][0]}
+        hits += len(found & set(expected.tolist()))
+
+    client.delete_collection(name)
+    return {
+        "dims": dims,
+        "recall": hits / (len(truth) * k),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "build_ms": build_ms,
+        "vector_mb": reduced.nbytes / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare reduced embedding dimensions with the full size")
+    parser.add_argument("--collection", default="fta_compliance_guide", help="Collection built at full dimensions")
+    parser.add_argument("--dims", default="256,512,1024", help="Comma-separated dimension counts to test")
+    parser.add_argument("--k", type=int, default=settings.top_k_retrieval, help="Results per query (recall@k)")
+    parser.add_argument("--sample-queries", type=int, default=0,
+                        help="Use this many stored vectors as queries instead of embedding common questions")
+    args = parser.parse_args()
+
+    full = NATIVE_DIMENSIONS.get(settings.embedding_model)
+    if settings.embedding_model not in REDUCIBLE_MODELS:
+        print(f"✗ {settings.embedding_model} does not support reduced dimensions")
+        sys.exit(1)
+
+    ids, vectors = load_vectors(args.collection)
+    if not len(ids):
+        print(f"✗ Collection '{args.collection}' is empty - run ingestion first")
+        sys.exit(1)
+    if vectors.shape[1] != full:
+        print(f"✗ Collection '{args.collection}' has {vectors.shape[1]} dimensions; "
+              f"the benchmark needs full {full}-dimension vectors")
+        sys.exit(1)
+    k = min(args.k, len(ids))
+
+    if args.sample_queries:
+        rng = np.random.default_rng(0)
+        sample = rng.choice(len(ids), size=min(args.sample_queries, len(ids)), replace=False)
+        queries = vectors[sample]
+        print(f"Queries: {len(queries)} stored document vectors")
+    else:
+        questions = [q["question"] for q in settings.common_questions] + [settings.warmup_probe_query]
+        queries = embed_questions(questions, full)
+        print(f"Queries: {len(queries)} common questions")
+
+    print(f"Collection: {args.collection} ({len(ids)} documents), recall@{k} vs exact {full}-dimension search\n")
+    truth = exact_top_k(vectors, queries, k)
+
+    dims_list = [int(d) for d in args.dims.split(",") if d.strip()]
+    results = [benchmark(ids, vectors, queries, dims, truth, k) for dims in dims_list + [full]]
+
+    print(f"{'dims':>6} {'recall@' + str(k):>10} {'p50 ms':>8} {'p95 ms':>8} {'build ms':>9} {'vectors MB':>11}")
+    for r in results:
+        print(f"{r['dims']:>6} {r['recall']:>10.3f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['build_ms']:>9.0f} {r['vector_mb']:>11.1f}")
+
+    print("\nTo switch, set EMBEDDING_DIMENSIONS and re-ingest both collections "
+          "(unchanged text is re-embedded at the new size, not served from the cache).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Report memory savings and recall of the quantized vector index.
+
+For each collection (fta_compliance_guide and historical_audits), builds
+int8 and binary indexes from the stored vectors and compares their results
+with exact float search, for several rescoring depths, alongside ChromaDB's
+own HNSW search.
+
+Queries are the configured common questions (embedded once with the API) or,
+with --sample-queries, stored document vectors (no API calls).
+
+Usage:
+    python scripts/benchmark_quantized_index.py
+    python scripts/benchmark_quantized_index.py --k 10 --factors 1,4,8,16
+    python scripts/benchmark_quantized_index.py --sample-queries 200
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from retrieval.quantized_index import QUANTIZATIONS, QuantizedVectorIndex
+import chromadb
+from ingestion.chroma_settings import chroma_settings
+from langchain_openai import OpenAIEmbeddings
+
+COLLECTIONS = ("fta_compliance_guide", "historical_audits")
+
+
+def embed_questions(dimensions: int) -> np.ndarray:
+    """Embed the common questions with the configured model."""
+    questions = [q["question"] for q in settings.common_questions] + [settings.warmup_probe_query]
+    embeddings = OpenAIEmbeddings(
+        model=settings.embedding_model,
+        dimensions=dimensions,
+        openai_api_key=settings.openai_api_key
+    )
+    return np.asarray(embeddings.embed_documents(questions), dtype=np.float32)
+
+
+def measure(search, queries: np.ndarray, truth: list, k: int):
+    """Recall@k against exact search and median latency of a search function."""
+    hits, latencies = 0, []
+    for query, expected in zip(queries, truth):
+        start_time = time.perf_counter()
+        ids = search(query)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        hits += len(set(ids) & expected)
+    return hits / (len(truth) * k), float(np.median(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and recall of quantized vector search")
+    parser.add_argument("--k", type=int, default=settings.top_k_retrieval, help="Results per query (recall@k)")
+    parser.add_argument("--factors", default="1,4,8", help="Comma-separated rescore factors to test")
+    parser.add_argument("--sample-queries", type=int, default=0,
+                        help="Use this many stored vectors as queries instead of embedding common questions")
+    args = parser.parse_args()
+    factors = [int(f) for f in args.factors.split(",") if f.strip()]
+
+    client = chromadb.PersistentClient(
+        path=settings.chroma_db_path,
+        settings=chroma_settings()
+    )
+    question_vectors = None
+
+    for name in COLLECTIONS:
+        try:
+            collection = client.get_collection(name)
+        except Exception:
+            print(f"\n✗ Collection '{name}' not found - skipping")
+            continue
+        if not collection.count():
+            print(f"\n✗ Collection '{name}' is empty - skipping")
+            continue
+
+        data = collection.get(include=["embeddings"])
+        ids = data["ids"]
+        vectors = np.asarray(data["embeddings"], dtype=np.float32)
+        k = min(args.k, len(ids))
+
+        if args.sample_queries:
+            rng = np.random.default_rng(0)
+            queries = vectors[rng.choice(len(ids), size=min(args.sample_queries, len(ids)), replace=False)]
+        else:
+            if question_vectors is None:
+                question_vectors = embed_questions(vectors.shape[1])
+            queries = question_vectors
+
+        # Ground truth: exact search over the float vectors (squared L2, ChromaDB's default space)
+        distances = (vectors ** 2).sum(axis=1)[None, :] - 2 * queries @ vectors.T
+        truth = [{ids[i] for i in row} for row in np.argsort(distances, axis=1)[:, :k]]
+
+        print(f"\n{name}: {len(ids)} vectors x {vectors.shape[1]} dimensions, {len(queries)} queries, recall@{k}")
+        print(f"  {'search':<18} {'recall':>7} {'p50 ms':>8} {'memory MB':>10}")
+
+        recall, latency = measure(
+            lambda q: collection.query(query_embeddings=[q.tolist()], n_results=k, include=[])["ids"][0],
+            queries, truth, k
+        )
+        print(f"  {'chromadb hnsw':<18} {recall:>7.3f} {latency:>8.2f} {vectors.nbytes / 1e6:>10.1f}")
+
+        for quantization in QUANTIZATIONS:
+            index = QuantizedVectorIndex.build(ids, vectors, quantization)
+            stats = index.memory_stats()
+            for factor in factors:
+                recall, latency = measure(lambda q: index.search(q, k, factor)[0], queries, truth, k)
+                label = f"{quantization} x{factor}"
+                print(f"  {label:<18} {recall:>7.3f} {latency:>8.2f} {stats['code_bytes'] / 1e6:>10.1f}")
+            print(f"  {'':<18} {quantization} codes are {stats['compression']}x smaller than float32 "
+                  f"(floats stay on disk for rescoring)")
+
+    print("\nEnable with VECTOR_QUANTIZATION=int8 or binary and tune VECTOR_RESCORE_FACTOR.")
+
+
+if __name__ == "__main__":
+    main()
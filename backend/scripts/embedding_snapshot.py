@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Export and import embedding snapshots of the ChromaDB collections.
+
+A snapshot holds every chunk's ID, text, metadata and float32 vector in one
+compressed file, so a fresh disk can be populated without re-embedding:
+build it once where the collections already exist, ship it with the image,
+and import it at boot (startup.py does so when EMBEDDING_SNAPSHOT points at a
+file and the collections are empty). Importing also writes each collection's
+BM25 index.
+
+Usage:
+    python scripts/embedding_snapshot.py export snapshots/embeddings.npz
+    python scripts/embedding_snapshot.py export snapshots/guide.npz --collections fta_compliance_guide
+    python scripts/embedding_snapshot.py import snapshots/embeddings.npz [--replace] [--quantization int8]
+"""
+import sys
+import argparse
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from ingestion.corpus_version import read_corpus_version
+from ingestion.embedding_cache import open_embedding_cache
+from ingestion.embedding_providers import create_embeddings, output_dimensions
+from ingestion.snapshot import import_collection, load_snapshot, read_collection, write_snapshot
+from retrieval.quantized_index import QUANTIZATIONS, QuantizedVectorIndex, quantized_index_dir
+from retrieval.shared_index import lexical_index_dir, lexical_index_root
+from retrieval.sparse_bm25 import SparseBM25Index, open_lexical_indexes
+import chromadb
+from ingestion.chroma_settings import chroma_settings
+
+COLLECTIONS = ("fta_compliance_guide", "historical_audits")
+
+
+def export_snapshot(client, path: str, names):
+    """Write the named collections to a snapshot file."""
+    existing = {collection.name: collection for collection in client.list_collections()}
+    snapshots = []
+    for name in names:
+        if name not in existing:
+            print(f"✗ Collection '{name}' not found - skipping")
+            continue
+        snapshot = read_collection(existing[name], settings.chroma_db_path)
+        print(f"✓ Read {len(snapshot.ids)} documents from '{name}' ({snapshot.dimensions} dimensions)")
+        snapshots.append(snapshot)
+
+    if not snapshots:
+        print("Nothing to export.")
+        return 1
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    write_snapshot(path, snapshots)
+    print(f"\n✓ Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+
+def import_snapshot(client, path: str, names, replace: bool, quantization: str = None):
+    """Load collections from a snapshot file into ChromaDB and write their BM25 (and optionally quantized) indexes."""
+    start_time = time.time()
+    snapshots = load_snapshot(path, names)
+    if not snapshots:
+        print(f"No matching collections in {path}.")
+        return 1
+
+    # Snapshots are checked against the model name and dimensions the configured provider stamps on collections
+    embeddings = create_embeddings(
+        settings.embedding_provider, settings.embedding_model, settings.embedding_dimensions, settings.openai_api_key
+    )
+
+    # Imported vectors also seed the embedding cache, so a later ingest doesn't re-embed them
+    cache = open_embedding_cache(settings.chroma_db_path, settings.embedding_cache_path, settings.embedding_cache_max_mb)
+
+    imported = []
+    for snapshot in snapshots:
+        collection = import_collection(
+            client,
+            snapshot,
+            settings.chroma_db_path,
+            model=embeddings.model,
+            dimensions=output_dimensions(embeddings),
+            replace=replace,
+            cache=cache
+        )
+        if collection is not None:
+            imported.append(snapshot)
+
+    # Serving indexes straight from the snapshots, stamped with the version after the last import
+    version = read_corpus_version(settings.chroma_db_path)
+    for snapshot in imported:
+        SparseBM25Index.build(snapshot.documents, snapshot.ids).save(
+            lexical_index_dir(settings.chroma_db_path, snapshot.name), version
+        )
+        print(f"✓ Saved BM25 index for '{snapshot.name}'")
+        if not quantization:
+            continue
+
+        index = QuantizedVectorIndex.build(
+            snapshot.ids, snapshot.vectors, quantization,
+            space=snapshot.metadata.get("hnsw:space", "l2")
+        )
+        index.save(quantized_index_dir(settings.chroma_db_path, snapshot.name), version,
+                   float_copy=settings.vector_float_copy)
+        print(f"✓ Saved {quantization} quantized index for '{snapshot.name}'")
+
+    # The version bump also left the BM25 indexes of collections not in the snapshot stale
+    open_lexical_indexes(client, lexical_index_root(settings.chroma_db_path), version)
+
+    print(f"\n✓ Import finished in {time.time() - start_time:.1f}s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export/import embedding snapshots of the ChromaDB collections")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="Snapshot file (.npz)")
+    parser.add_argument("--collections", default=",".join(COLLECTIONS),
+                        help="Comma-separated collections to export/import")
+    parser.add_argument("--replace", action="store_true",
+                        help="On import, replace collections that already hold documents")
+    parser.add_argument("--quantization", choices=QUANTIZATIONS, default=settings.vector_quantization,
+                        help="On import, also write the quantized vector index (default: VECTOR_QUANTIZATION)")
+    args = parser.parse_args()
+    names = [name.strip() for name in args.collections.split(",") if name.strip()]
+
+    client = chromadb.PersistentClient(
+        path=settings.chroma_db_path,
+        settings=chroma_settings()
+    )
+    if args.command == "export":
+        return export_snapshot(client, args.path, names)
+    return import_snapshot(client, args.path, names, args.replace, args.quantization)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
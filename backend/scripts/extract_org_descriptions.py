@@ -24,8 +24,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.connection import DatabaseManager
 from database.models import Recipient
-import chromadb
-from langchain_openai import OpenAIEmbeddings
+from ingestion.corpus_version import bump_corpus_version, read_corpus_version
+from ingestion.embeddings import HISTORICAL_COLLECTION, EmbeddingManager
+from retrieval.sparse_bm25 import save_lexical_indexes
+from config import settings
 
 
 class OrganizationDescriptionExtractor:
@@ -47,22 +49,11 @@ class OrganizationDescriptionExtractor:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
         self.claude = anthropic.Anthropic(api_key=anthropic_api_key)
 
-        # Initialize ChromaDB
-        persist_directory = os.getenv("CHROMA_DB_PATH", "./chroma_db")
-        self.chroma_client = chromadb.PersistentClient(path=persist_directory)
-        self.collection = self.chroma_client.get_or_create_collection(
-            name="historical_audits"
-        )
-
-        # Initialize OpenAI embeddings
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment")
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-large",
-            dimensions=3072,
-            api_key=openai_api_key
-        )
+        # Same embedding configuration as the API (queries search both collections with one embedding)
+        self.persist_directory = settings.chroma_db_path
+        self.embedding_manager = EmbeddingManager.from_settings(settings)
+        self.embeddings = self.embedding_manager.document_embedder
+        self.collection = self.embedding_manager.open_historical_collection()
 
     def extract_text_from_pdf(self, pdf_path: Path, max_pages: int = 10) -> str:
         """
@@ -326,20 +317,30 @@ FTA Region: {recipient['region']}
             documents = [d["text"] for d in documents_to_add]
             metadatas = [d["metadata"] for d in documents_to_add]
 
-            # Generate embeddings
-            print("  Generating embeddings with OpenAI...")
-            embeddings = self.embeddings.embed_documents(documents)
-            print(f"  ✓ Generated {len(embeddings)} embeddings")
-
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
+            # Generate embeddings, adding each batch to ChromaDB as it completes
+            print(f"  Generating embeddings ({self.embeddings.model})...")
+
+            def store_batch(start: int, end: int, embeddings: List[List[float]]):
+                self.collection.add(
+                    ids=ids[start:end],
+                    embeddings=embeddings,
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end]
+                )
+
+            self.embedding_manager.pipelined_embedder(max_batch_size=100).run(documents, sink=store_batch)
+            print(f"  ✓ Generated {len(documents)} embeddings")
+            print(f"  {self.embeddings.report()}")
+
+            print(f"  ✓ Added to ChromaDB collection '{HISTORICAL_COLLECTION}'")
+            bump_corpus_version(
+                self.persist_directory, f"{HISTORICAL_COLLECTION} added {len(ids)} organization descriptions"
             )
 
-            print(f"  ✓ Added to ChromaDB collection 'historical_audits'")
+            # The version bump leaves every saved BM25 index stale; rebuild this collection's and the guide's
+            save_lexical_indexes(
+                self.embedding_manager.client, self.persist_directory, read_corpus_version(self.persist_directory)
+            )
 
         # Summary
         print(f"\n{'='*80}")
@@ -29,6 +29,7 @@ from database.models import (
     LessonLearned, ComplianceSection, Award, Project
 )
 from database.connection import DatabaseManager
+from ingestion.corpus_version import bump_corpus_version
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -343,6 +344,10 @@ class HistoricalAuditIngestor:
 
             # Commit all at end
             session.commit()
+
+            # Database answers changed - invalidate cached answers in the API
+            if successful:
+                bump_corpus_version(os.getenv("CHROMA_DB_PATH", "./chroma_db"), f"{successful} audit reviews ingested")
             logger.info(f"\nIngestion complete:")
             logger.info(f"  Successful: {successful}")
             logger.info(f"  Skipped: {skipped}")
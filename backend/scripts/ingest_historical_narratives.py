@@ -4,14 +4,15 @@ Ingest historical audit narratives into ChromaDB for semantic search.
 This script:
 1. Extracts deficiency descriptions and corrective actions from PostgreSQL
 2. Creates rich document chunks with metadata (recipient, review area, etc.)
-3. Embeds them using OpenAI embeddings
+3. Embeds them with the configured embeddings (same provider, model and dimensions as the API)
 4. Stores in ChromaDB collection 'historical_audits'
+5. Saves the collection's BM25 index (recipient acronyms, deficiency codes and
+   review areas are then matched lexically too)
 
 Usage:
     python ingest_historical_narratives.py [--reset]
 """
 import sys
-import os
 import argparse
 from pathlib import Path
 from typing import List, Dict, Any
@@ -25,9 +26,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.connection import DatabaseManager
 from database.models import Recipient, AuditReview, HistoricalAssessment
-from ingestion.embeddings import EmbeddingManager
-import chromadb
-from langchain_openai import OpenAIEmbeddings
+from ingestion.embeddings import HISTORICAL_COLLECTION, EmbeddingManager
+from ingestion.corpus_version import bump_corpus_version, read_corpus_version
+from retrieval.sparse_bm25 import save_lexical_indexes
+from config import settings
 
 
 class HistoricalNarrativeIngestor:
@@ -41,23 +43,17 @@ class HistoricalNarrativeIngestor:
             reset: If True, delete and recreate the collection
         """
         self.db = DatabaseManager()
-        self.collection_name = "historical_audits"
+        self.collection_name = HISTORICAL_COLLECTION
         self.reset = reset
 
-        # Initialize ChromaDB client
-        persist_directory = os.getenv("CHROMA_DB_PATH", "./chroma_db")
-        self.chroma_client = chromadb.PersistentClient(path=persist_directory)
+        # Same embedding configuration as the API (queries search both collections with one embedding)
+        self.persist_directory = settings.chroma_db_path
+        self.embedding_manager = EmbeddingManager.from_settings(settings)
+        self.model = self.embedding_manager.embedding_model
+        self.dimensions = self.embedding_manager.dimensions
 
-        # Initialize OpenAI embeddings
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment")
-
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-large",
-            dimensions=3072,
-            api_key=openai_api_key
-        )
+        # Unchanged narratives are served from the persistent embedding cache on re-runs
+        self.embeddings = self.embedding_manager.document_embedder
 
         # Setup collection
         self._setup_collection()
@@ -66,15 +62,12 @@ class HistoricalNarrativeIngestor:
         """Create or get the ChromaDB collection."""
         if self.reset:
             try:
-                self.chroma_client.delete_collection(name=self.collection_name)
+                self.embedding_manager.client.delete_collection(name=self.collection_name)
                 print(f"✓ Deleted existing collection '{self.collection_name}'")
             except Exception as e:
                 print(f"  (Collection didn't exist or couldn't be deleted: {e})")
 
-        self.collection = self.chroma_client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"description": "Historical FTA audit review narratives for semantic search"}
-        )
+        self.collection = self.embedding_manager.open_historical_collection()
         print(f"✓ Collection '{self.collection_name}' ready")
 
     def extract_narratives(self) -> List[Dict[str, Any]]:
@@ -167,25 +160,28 @@ class HistoricalNarrativeIngestor:
         documents = [n["text"] for n in narratives]
         metadatas = [n["metadata"] for n in narratives]
 
-        # Generate embeddings using OpenAI
-        print("  Generating embeddings with OpenAI (text-embedding-3-large)...")
-        embeddings = self.embeddings.embed_documents(documents)
-        print(f"  ✓ Generated {len(embeddings)} embeddings")
-
-        # Add to ChromaDB in batches (ChromaDB has a batch limit)
-        batch_size = 100
-        for i in range(0, len(ids), batch_size):
-            batch_end = min(i + batch_size, len(ids))
+        # Generate embeddings using OpenAI, storing each batch while later ones are embedded
+        # (batches of at most 100 also stay under ChromaDB's batch limit)
+        print(f"  Generating embeddings ({self.model}, {self.dimensions} dimensions)...")
 
+        def store_batch(start: int, end: int, embeddings: List[List[float]]):
             self.collection.add(
-                ids=ids[i:batch_end],
-                embeddings=embeddings[i:batch_end],
-                documents=documents[i:batch_end],
-                metadatas=metadatas[i:batch_end]
+                ids=ids[start:end],
+                embeddings=embeddings,
+                documents=documents[start:end],
+                metadatas=metadatas[start:end]
             )
+            print(f"  ✓ Added documents {start + 1}-{end}")
+
+        self.embedding_manager.pipelined_embedder(max_batch_size=100).run(documents, sink=store_batch)
+        print(f"  ✓ Generated {len(documents)} embeddings")
+        print(f"  {self.embeddings.report()}")
 
-            print(f"  ✓ Added batch {i//batch_size + 1}: documents {i+1}-{batch_end}")
+        bump_corpus_version(self.persist_directory, f"historical_audits ingested {len(narratives)} narratives")
 
+        save_lexical_indexes(
+            self.embedding_manager.client, self.persist_directory, read_corpus_version(self.persist_directory)
+        )
         print(f"\n✓ Successfully ingested {len(narratives)} narratives into ChromaDB")
 
     def get_statistics(self):
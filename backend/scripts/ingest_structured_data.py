@@ -9,6 +9,7 @@ Usage:
     python scripts/ingest_structured_data.py --drop-existing  # CAREFUL: Drops all tables first
 """
 
+import os
 import sys
 import json
 import argparse
@@ -31,6 +32,7 @@ from database.models import (
     ComplianceDeficiency
 )
 from database.connection import get_db_manager
+from ingestion.corpus_version import bump_corpus_version
 
 
 def load_json_file(json_path: Path) -> Dict:
@@ -308,6 +310,9 @@ def main():
         ingest_all_sections(db_manager, json_data)
         verify_ingestion(db_manager)
 
+        # Database answers changed - invalidate cached answers in the API
+        bump_corpus_version(os.getenv("CHROMA_DB_PATH", "./chroma_db"), "compliance guide tables ingested")
+
         print("\n" + "=" * 80)
         print("✅ INGESTION COMPLETE!")
         print("=" * 80)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Multi-worker launcher.
+
+Makes sure the read-only BM25 indexes saved by ingestion are current
+(building them once if not), then starts uvicorn workers that memory-map
+them instead of each loading every chunk from ChromaDB and building its own
+BM25 indexes. All workers share one copy of the indexes through the OS page
+cache. With VECTOR_QUANTIZATION set, the quantized vector indexes are built
+here too.
+
+Usage:
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import time
+from typing import Dict
+
+import chromadb
+import uvicorn
+
+from config import settings
+from ingestion.chroma_settings import chroma_settings
+from ingestion.corpus_version import read_corpus_version
+from retrieval.quantized_index import QuantizedVectorIndex, quantized_index_dir
+from retrieval.shared_index import lexical_index_root
+from retrieval.sparse_bm25 import SparseBM25Index, open_lexical_indexes
+
+
+def build_shared_indexes(index_root: str) -> Dict[str, SparseBM25Index]:
+    """
+    Make sure the BM25 index of every lexical collection is saved and current.
+
+    Ingestion normally saves them already; they are only rebuilt from the
+    collections here if missing or stale.
+
+    Args:
+        index_root: Directory with one index subdirectory per collection
+
+    Returns:
+        Collection name -> index
+    """
+    start_time = time.time()
+
+    # Read the version first: if ingestion bumps it meanwhile, workers see a
+    # stale index and fall back to building their own rather than serving it
+    version = read_corpus_version(settings.chroma_db_path)
+
+    client = chromadb.PersistentClient(
+        path=settings.chroma_db_path,
+        settings=chroma_settings()
+    )
+    indexes = open_lexical_indexes(client, index_root, version)
+
+    for name, index in indexes.items():
+        print(f"[SERVE] Shared BM25 index for '{name}': {len(index)} documents, {len(index.vocab)} terms")
+    print(f"[SERVE] Shared BM25 indexes for corpus version {version} "
+          f"ready in {round((time.time() - start_time) * 1000, 2)}ms")
+    return indexes
+
+
+def build_quantized_indexes():
+    """Quantize both collections' vectors up front so workers only memory-map them."""
+    version = read_corpus_version(settings.chroma_db_path)
+    client = chromadb.PersistentClient(
+        path=settings.chroma_db_path,
+        settings=chroma_settings()
+    )
+    for collection in client.list_collections():
+        if collection.name not in ("fta_compliance_guide", "historical_audits"):
+            continue
+        start_time = time.time()
+        index = QuantizedVectorIndex.open(
+            collection,
+            quantized_index_dir(settings.chroma_db_path, collection.name),
+            settings.vector_quantization,
+            version,
+            float_copy=settings.vector_float_copy
+        )
+        print(f"[SERVE] Quantized index for '{collection.name}': {len(index)} vectors "
+              f"({settings.vector_quantization}), ready in {round((time.time() - start_time) * 1000, 2)}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with several workers sharing the BM25 indexes")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    args = parser.parse_args()
+
+    index_root = settings.shared_index_dir or lexical_index_root(settings.chroma_db_path)
+    build_shared_indexes(index_root)
+    if settings.vector_quantization:
+        build_quantized_indexes()
+
+    # Don't carry the Chroma client and chunk texts around in the supervisor process
+    gc.collect()
+
+    # Workers are separate interpreters; they pick the indexes up through the environment
+    os.environ["SHARED_INDEX_DIR"] = index_root
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
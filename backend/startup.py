@@ -3,10 +3,36 @@
 Startup script to run before the FastAPI app starts.
 This runs AFTER disk mounts, so ChromaDB persistence works.
 """
+import os
 import subprocess
 import sys
 from pathlib import Path
 
+
+def import_snapshot():
+    """Load the shipped embedding snapshot into empty collections, if one is configured."""
+    snapshot = os.getenv("EMBEDDING_SNAPSHOT")
+    if not snapshot:
+        return
+    if not Path(snapshot).exists():
+        print(f"⚠️  WARNING: EMBEDDING_SNAPSHOT {snapshot} not found, skipping snapshot import")
+        return
+
+    print("\n" + "="*70)
+    print(f"STARTUP: Importing embedding snapshot {snapshot}...")
+    print("="*70)
+
+    # Collections that already hold documents are kept as they are
+    result = subprocess.run(
+        [sys.executable, "scripts/embedding_snapshot.py", "import", snapshot],
+        cwd=Path(__file__).parent,
+        capture_output=False
+    )
+
+    if result.returncode != 0:
+        print("⚠️  WARNING: Snapshot import failed, ingestion will embed from scratch")
+
+
 def run_ingestion():
     """Run compliance guide ingestion if needed."""
     print("\n" + "="*70)
@@ -28,4 +54,5 @@ def run_ingestion():
     print("="*70 + "\n")
 
 if __name__ == "__main__":
+    import_snapshot()
     run_ingestion()
@@ -0,0 +1,115 @@
+"""Shared pytest setup for the backend tests (run from backend/: python -m pytest -q)."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings require an API key; the tests never call OpenAI
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+class FakeEmbeddingManager:
+    """Embeds every question to the same vector, so any rewording is a paraphrase."""
+
+    def __init__(self):
+        self.document_calls = []  # Questions of each aembed_documents call
+
+    async def aembed_query(self, question):
+        return [1.0, 0.0, 0.0]
+
+    async def aembed_documents(self, questions):
+        self.document_calls.append(list(questions))
+        return [[1.0, 0.0, 0.0] for _ in questions]
+
+    def embed_query(self, question):
+        return [1.0, 0.0, 0.0]
+
+
+class CountingPipeline:
+    """Stands in for RAGPipeline and counts answer generations (LLM calls)."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def aprocess_query(self, question, retrieved_chunks, conversation_history=None):
+        self.calls += 1
+        return {'answer': f"answer {self.calls}", 'confidence': 'high', 'sources': [], 'ranked_chunks': []}
+
+
+@pytest.fixture
+def make_rag_engine(tmp_path):
+    """
+    Build HybridQueryEngines whose RAG route runs on fakes, serving the corpus version in tmp_path.
+
+    The factory takes answer_cache and semantic_cache and returns
+    (engine, pipeline); pipeline.calls counts the answers actually generated.
+    Set engine.indexed_version to simulate an index refresh.
+    """
+    from ingestion.corpus_version import read_corpus_version
+    from retrieval.hybrid_engine import HybridQueryEngine
+
+    def make(answer_cache=None, semantic_cache=None):
+        pipeline = CountingPipeline()
+        engine = HybridQueryEngine(
+            db_manager=None,
+            rag_pipeline=pipeline,
+            embedding_manager=FakeEmbeddingManager(),
+            answer_cache=answer_cache,
+            indexed_version=read_corpus_version(str(tmp_path)),
+            semantic_cache=semantic_cache
+        )
+        engine._retrieve_rag_chunks = lambda question, query_embedding: [
+            {'chunk_id': "c1", 'text': "Paratransit must be comparable to fixed route service.", 'metadata': {}}
+        ]
+        return engine, pipeline
+
+    return make
+
+
+@pytest.fixture
+def make_rag_service(tmp_path):
+    """
+    Build RAG-only RAGServices (no hybrid engine) on the same fakes as make_rag_engine.
+
+    The factory takes answer_cache and semantic_cache and returns
+    (service, pipeline); pipeline.calls counts the answers actually generated.
+    """
+    from api.service import RAGService
+    from ingestion.corpus_version import CorpusVersion, read_corpus_version
+
+    def make(answer_cache=None, semantic_cache=None):
+        pipeline = CountingPipeline()
+        service = object.__new__(RAGService)  # Skips _initialize_components (ChromaDB, OpenAI)
+        service.hybrid_engine = None
+        service.answer_cache = answer_cache
+        service.semantic_cache = semantic_cache
+        service.corpus_version = CorpusVersion(str(tmp_path))
+        service.indexed_version = read_corpus_version(str(tmp_path))
+        service.embedding_manager = FakeEmbeddingManager()
+        service.rag_pipeline = pipeline
+        service._retrieve_chunks = lambda question, query_embedding, top_k, recipient_type=None: [
+            {'chunk_id': "c1", 'text': "Paratransit must be comparable to fixed route service.", 'metadata': {}}
+        ]
+        return service, pipeline
+
+    return make
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Names of the collections whose BM25 index was built from ChromaDB (not memory-mapped)."""
+    from retrieval.sparse_bm25 import SparseBM25Index
+
+    built = []
+    from_collection = SparseBM25Index.from_collection
+
+    def counting_from_collection(collection):
+        built.append(collection.name)
+        return from_collection(collection)
+
+    monkeypatch.setattr(SparseBM25Index, "from_collection", counting_from_collection)
+    return built
@@ -0,0 +1,140 @@
+"""Tests for admission control and the 429 responses it produces."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.admission import AdmissionGate, AdmissionRejected
+from api.routes import get_rag_service, router
+
+
+def make_gate(max_concurrent=1, max_queue=1, queue_timeout=5.0):
+    return AdmissionGate("test", max_concurrent=max_concurrent, max_queue=max_queue,
+                         queue_timeout=queue_timeout, retry_after=7)
+
+
+async def admitted(gate: AdmissionGate) -> bool:
+    """Take a slot of the gate and give it back."""
+    async with gate.aslot():
+        return True
+
+
+def test_rejects_when_wait_queue_is_full():
+    gate = make_gate(max_concurrent=1, max_queue=1)
+
+    async def scenario():
+        async with gate.aslot():
+            waiter = asyncio.create_task(admitted(gate))
+            await asyncio.sleep(0.01)
+            assert gate.queue_depth == 1
+
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with gate.aslot():
+                    pass
+            assert rejected.value.reason == "queue full"
+            assert rejected.value.retry_after == 7
+            with pytest.raises(AdmissionRejected):
+                gate.check()
+        # Leaving the slot hands it to the queued caller
+        assert await waiter
+        assert gate.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_rejects_after_queue_timeout():
+    gate = make_gate(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+
+    async def scenario():
+        async with gate.aslot():
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with gate.aslot():
+                    pass
+            assert rejected.value.reason == "queue timeout"
+            assert gate.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    gate = make_gate(max_concurrent=1, max_queue=5)
+    order = []
+
+    async def call(label):
+        async with gate.aslot():
+            order.append(label)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        async with gate.aslot():
+            tasks = []
+            for label in range(4):
+                tasks.append(asyncio.create_task(call(label)))
+                await asyncio.sleep(0.001)
+            assert gate.queue_depth == 4
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert order == [0, 1, 2, 3]
+
+
+def test_threads_and_coroutines_share_the_limit():
+    gate = make_gate(max_concurrent=1, max_queue=0)
+
+    with gate.slot():
+        with pytest.raises(AdmissionRejected):
+            asyncio.run(admitted(gate))
+    assert asyncio.run(admitted(gate))
+
+
+class FakeService:
+    """Just enough of RAGService for the query routes, with a real admission gate."""
+
+    def __init__(self, gate: AdmissionGate):
+        self.gate = gate
+
+    def check_admission(self):
+        self.gate.check()
+
+    async def aprocess_query(self, question, recipient_type=None, conversation_history=None):
+        async with self.gate.aslot():
+            return {'answer': "ok", 'confidence': 'high', 'sources': [], 'ranked_chunks': [], 'backend': 'rag'}
+
+
+@pytest.fixture
+def gate_and_client():
+    gate = make_gate(max_concurrent=1, max_queue=0)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_rag_service] = lambda: FakeService(gate)
+    return gate, TestClient(app)
+
+
+def test_query_is_admitted_when_a_slot_is_free(gate_and_client):
+    gate, client = gate_and_client
+
+    response = client.post("/api/v1/query", json={"question": "What is ADA?"})
+
+    assert response.status_code == 200
+    assert response.json()['answer'] == "ok"
+
+
+@pytest.mark.parametrize("path", ["/api/v1/query", "/api/v1/query/stream"])
+def test_overloaded_query_gets_429_with_retry_after(gate_and_client, path):
+    gate, client = gate_and_client
+
+    with gate.slot():
+        response = client.post(path, json={"question": "What is ADA?"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+
+
+def test_overloaded_batch_gets_429(gate_and_client):
+    gate, client = gate_and_client
+
+    with gate.slot():
+        response = client.post("/api/v1/query/batch", json={"questions": ["What is ADA?"]})
+
+    assert response.status_code == 429
@@ -0,0 +1,73 @@
+"""Tests for corpus-version invalidation of the answer cache."""
+import asyncio
+
+from ingestion.corpus_version import CorpusVersion, bump_corpus_version
+from retrieval.answer_cache import AnswerCache
+
+QUESTION = "What are the ADA requirements for paratransit service?"
+
+
+def test_key_depends_on_corpus_version_not_question_formatting():
+    cache = AnswerCache()
+
+    key = cache.make_key(QUESTION, "rag", "v1")
+
+    assert cache.make_key("  what are the ADA requirements for PARATRANSIT service? ", "rag", "v1") == key
+    assert cache.make_key(QUESTION, "rag", "v2") != key
+    assert cache.make_key(QUESTION, "database", "v1") != key
+
+
+def test_entries_stop_matching_after_a_version_bump(tmp_path):
+    cache = AnswerCache()
+    version = CorpusVersion(str(tmp_path))
+    bump_corpus_version(str(tmp_path), "first ingest")
+    cache.put(cache.make_key(QUESTION, "rag", version.get()), "rag", {'answer': "old", 'backend': 'rag'})
+
+    assert cache.get(cache.make_key(QUESTION, "rag", version.get()))['answer'] == "old"
+
+    bump_corpus_version(str(tmp_path), "re-ingest")
+
+    assert cache.get(cache.make_key(QUESTION, "rag", version.get())) is None
+
+
+def test_failures_are_not_cached():
+    cache = AnswerCache()
+    key = cache.make_key(QUESTION, "rag", "v1")
+
+    cache.put(key, "rag", {'answer': "boom", 'backend': 'error'})
+
+    assert cache.get(key) is None
+
+
+def test_engine_regenerates_the_answer_after_an_index_refresh(tmp_path, make_rag_engine):
+    bump_corpus_version(str(tmp_path), "first ingest")
+    engine, pipeline = make_rag_engine(answer_cache=AnswerCache())
+
+    first = asyncio.run(engine.aexecute_query(QUESTION))
+    repeated = asyncio.run(engine.aexecute_query(QUESTION))
+    assert pipeline.calls == 1
+    assert repeated['answer'] == first['answer']
+    assert repeated['metadata']['cache_hit'] is True
+
+    engine.indexed_version = bump_corpus_version(str(tmp_path), "re-ingest")  # Refreshed indexes swapped in
+    fresh = asyncio.run(engine.aexecute_query(QUESTION))
+
+    assert pipeline.calls == 2
+    assert fresh['answer'] != first['answer']
+    assert fresh['metadata']['cache_hit'] is False
+
+
+def test_answers_from_the_old_indexes_are_not_served_after_the_refresh(tmp_path, make_rag_engine):
+    bump_corpus_version(str(tmp_path), "first ingest")
+    engine, pipeline = make_rag_engine(answer_cache=AnswerCache())
+    asyncio.run(engine.aexecute_query(QUESTION))
+
+    # Ingestion bumped the version, but the old indexes still serve until the refresh
+    new_version = bump_corpus_version(str(tmp_path), "re-ingest")
+    assert asyncio.run(engine.aexecute_query(QUESTION))['metadata']['cache_hit'] is True
+
+    engine.indexed_version = new_version
+    fresh = asyncio.run(engine.aexecute_query(QUESTION))
+
+    assert fresh['metadata']['cache_hit'] is False
+    assert pipeline.calls == 2
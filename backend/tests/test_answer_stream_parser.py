@@ -0,0 +1,48 @@
+"""Tests for the incremental JSON answer parser used by streaming responses."""
+import json
+
+import pytest
+
+from retrieval.rag_pipeline import AnswerStreamParser
+
+
+def parse(chunks):
+    """Feed chunks to a new parser and return everything it decoded."""
+    parser = AnswerStreamParser()
+    return "".join(parser.feed(chunk) for chunk in chunks)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64])
+def test_decodes_answer_split_at_any_point(size):
+    answer = 'Café "quoted" \\ path/to\n\ttab \U0001F600 done'
+    raw = json.dumps({"answer": answer, "confidence": "high"})  # ASCII-escaped, with a surrogate pair
+    chunks = [raw[start:start + size] for start in range(0, len(raw), size)]
+
+    assert parse(chunks) == answer
+
+
+def test_ignores_text_before_answer_and_after_it_closes():
+    parser = AnswerStreamParser()
+
+    assert parser.feed('{"confidence": "low", ') == ""
+    assert parser.feed('"answer": "yes') == "yes"
+    assert parser.feed('", "extra": "no"}') == ""
+    assert parser.finished
+    assert parser.feed('"answer": "again"') == ""
+
+
+def test_waits_for_a_split_unicode_escape():
+    parser = AnswerStreamParser()
+
+    assert parser.feed('{"answer": "a\\u00') == "a"
+    assert parser.feed('e9b"}') == "éb"
+
+
+def test_malformed_unicode_escape_is_passed_through():
+    assert parse(['{"answer": "bad \\uZZ12 ok"}']) == "bad \\uZZ12 ok"
+
+
+def test_unpaired_surrogates_become_replacement_characters():
+    assert parse(['{"answer": "high \\ud83d end"}']) == "high � end"
+    assert parse(['{"answer": "low \\ude00 end"}']) == "low � end"
+    assert parse(['{"answer": "last \\ud83d', '"}']) == "last �"
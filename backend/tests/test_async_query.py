@@ -0,0 +1,53 @@
+"""Tests for the async query path: concurrent questions on one event loop."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from retrieval.rag_pipeline import RAGPipeline
+
+QUESTIONS = [f"What are the ADA requirements for paratransit service in case {i}?" for i in range(10)]
+CHUNKS = [{'chunk_id': "c1", 'text': "Paratransit must be comparable to fixed route service.", 'metadata': {},
+           'hybrid_score': 0.9}]
+
+
+class RendezvousLLM:
+    """Chat model whose calls only return once `parties` of them are in flight together."""
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.barrier = None
+
+    def invoke(self, messages):
+        raise AssertionError("the async path must not make blocking LLM calls")
+
+    async def ainvoke(self, messages):
+        self.barrier = self.barrier or asyncio.Barrier(self.parties)
+        await asyncio.wait_for(self.barrier.wait(), timeout=5)  # Times out if the calls run one after another
+        return SimpleNamespace(content=json.dumps({'answer': "comparable service", 'confidence': "high"}))
+
+
+def test_pipeline_generations_overlap_on_one_event_loop():
+    pipeline = RAGPipeline(openai_api_key="test-key")
+    pipeline.llm = RendezvousLLM(parties=len(QUESTIONS))
+
+    async def scenario():
+        return await asyncio.gather(*(pipeline.aprocess_query(question, CHUNKS) for question in QUESTIONS))
+
+    results = asyncio.run(scenario())
+
+    assert [result['answer'] for result in results] == ["comparable service"] * len(QUESTIONS)
+
+
+def test_engine_keeps_many_questions_in_flight(make_rag_engine):
+    engine, _ = make_rag_engine()
+    engine.rag_pipeline = RAGPipeline(openai_api_key="test-key")
+    engine.rag_pipeline.llm = RendezvousLLM(parties=len(QUESTIONS))
+    engine._retrieve_rag_chunks = lambda question, query_embedding: [dict(chunk) for chunk in CHUNKS]
+
+    async def scenario():
+        return await asyncio.gather(*(engine.aexecute_query(question) for question in QUESTIONS))
+
+    results = asyncio.run(scenario())
+
+    assert all(result['backend'] == 'rag' for result in results)
+    assert [result['answer'] for result in results] == ["comparable service"] * len(QUESTIONS)
@@ -0,0 +1,88 @@
+"""Tests for answering a batch of questions in one request."""
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.admission import AdmissionGate
+from api.routes import get_rag_service, router
+from config import settings
+
+QUESTIONS = ["What is ADA?", "Who needs a DBE program?", "  what is   ADA? ", "What is Title VI?"]
+
+
+async def collect(results):
+    return [result async for result in results]
+
+
+def test_duplicates_are_answered_once_and_results_keep_request_order(make_rag_service):
+    service, pipeline = make_rag_service()
+
+    results = asyncio.run(collect(service.astream_batch(QUESTIONS)))
+
+    assert [result['index'] for result in results] == [0, 1, 2, 3]
+    assert [result['question'] for result in results] == QUESTIONS
+    assert pipeline.calls == 3
+    assert service.embedding_manager.document_calls == [["What is ADA?", "Who needs a DBE program?", "What is Title VI?"]]
+    assert results[2]['answer'] == results[0]['answer']
+
+
+def test_generations_are_capped_at_the_server_concurrency(make_rag_service, monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_concurrency", 2)
+    service, pipeline = make_rag_service()
+    in_flight = peak = 0
+
+    async def aprocess_query(question, retrieved_chunks, conversation_history=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {'answer': question, 'confidence': 'high', 'sources': [], 'ranked_chunks': []}
+
+    pipeline.aprocess_query = aprocess_query
+    questions = [f"Question {i}?" for i in range(6)]
+
+    results = asyncio.run(collect(service.astream_batch(questions, max_concurrency=10)))
+
+    assert [result['answer'] for result in results] == questions
+    assert peak == 2
+
+
+@pytest.fixture
+def client(make_rag_service):
+    service, _ = make_rag_service()
+    service.llm_admission = AdmissionGate("llm", max_concurrent=1, max_queue=0, queue_timeout=1.0, retry_after=1)
+    service.embedding_admission = AdmissionGate("embedding", max_concurrent=1, max_queue=0, queue_timeout=1.0,
+                                                retry_after=1)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_rag_service] = lambda: service
+    return TestClient(app)
+
+
+def test_batch_endpoint_returns_one_result_per_question(client):
+    response = client.post("/api/v1/query/batch", json={"questions": QUESTIONS})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['unique_questions'] == 3
+    assert [result['question'] for result in body['results']] == QUESTIONS
+
+
+def test_batch_endpoint_streams_ndjson_in_order(client):
+    response = client.post("/api/v1/query/batch", json={"questions": QUESTIONS, "stream": True})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['index'] for line in lines] == [0, 1, 2, 3]
+
+
+def test_batch_endpoint_rejects_oversized_batches(client, monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_questions", 2)
+
+    response = client.post("/api/v1/query/batch", json={"questions": QUESTIONS})
+
+    assert response.status_code == 400
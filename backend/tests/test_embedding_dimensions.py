@@ -0,0 +1,36 @@
+"""Tests for resolving the embedding dimensions of the configured model."""
+import pytest
+
+from config import Settings
+from ingestion.embedding_dimensions import resolve_dimensions
+from ingestion.embedding_providers import create_embeddings, output_dimensions
+
+
+def test_default_setting_is_the_models_full_size():
+    assert Settings(_env_file=None).embedding_dimensions is None
+
+
+def test_text_embedding_3_small_without_override_uses_its_native_size():
+    embeddings = create_embeddings("openai", "text-embedding-3-small", None, "test-key")
+
+    assert embeddings.dimensions is None  # Not sent to the API
+    assert output_dimensions(embeddings) == 1536
+
+
+def test_explicit_reduction_is_sent_and_names_the_vectors():
+    embeddings = create_embeddings("openai", "text-embedding-3-large", 256, "test-key")
+
+    assert embeddings.dimensions == 256
+    assert output_dimensions(embeddings) == 256
+
+
+def test_models_without_the_dimensions_parameter_only_accept_their_full_size():
+    assert resolve_dimensions("text-embedding-ada-002", None) == 1536
+    assert resolve_dimensions("text-embedding-ada-002", 1536) == 1536
+    with pytest.raises(ValueError, match="does not support reduced dimensions"):
+        resolve_dimensions("text-embedding-ada-002", 512)
+
+
+def test_sizes_above_the_native_size_are_rejected():
+    with pytest.raises(ValueError, match="1-1536"):
+        resolve_dimensions("text-embedding-3-small", 3072)
@@ -0,0 +1,107 @@
+"""Tests for reciprocal rank fusion of the vector and BM25 rankings."""
+import pytest
+
+from ingestion.vector_query import VectorHit
+from retrieval.fusion import KeywordHit, fuse_rankings
+
+
+def vector_hits(*chunk_ids, collection="guide"):
+    """Vector hits in rank order, with decreasing similarity."""
+    return [
+        VectorHit(chunk_id=chunk_id, text=chunk_id, metadata={}, collection=collection,
+                  distance=0.1 * rank, similarity=1.0 - 0.1 * rank)
+        for rank, chunk_id in enumerate(chunk_ids)
+    ]
+
+
+def keyword_hits(*chunk_ids, collection="guide"):
+    """BM25 hits in rank order, with decreasing scaled scores."""
+    return [
+        KeywordHit(chunk_id=chunk_id, text=chunk_id, metadata={}, collection=collection, score=1.0 - 0.1 * rank)
+        for rank, chunk_id in enumerate(chunk_ids)
+    ]
+
+
+def ranked_ids(candidates):
+    return [candidate.chunk_id for candidate in candidates]
+
+
+def test_chunks_found_by_both_sources_rank_first():
+    fused = fuse_rankings(vector_hits("a", "b", "c"), keyword_hits("c", "d", "b"), top_k=4)
+
+    # b: ranks 2 + 3, c: ranks 3 + 1, a: rank 1 only, d: rank 2 only
+    assert ranked_ids(fused) == ["c", "b", "a", "d"]
+    assert fused[0].semantic_rank == 3 and fused[0].bm25_rank == 1
+
+
+def test_scores_follow_the_rrf_formula_scaled_to_one():
+    rrf_k = 60
+    fused = fuse_rankings(vector_hits("a", "b"), keyword_hits("a", "c"), top_k=3, rrf_k=rrf_k)
+    by_id = {candidate.chunk_id: candidate for candidate in fused}
+    best = 2 / (rrf_k + 1)
+
+    assert by_id["a"].fused_score == pytest.approx(1.0)
+    assert by_id["b"].fused_score == pytest.approx((1 / (rrf_k + 2)) / best)
+    assert by_id["c"].fused_score == pytest.approx((1 / (rrf_k + 2)) / best)
+
+
+def test_ties_break_on_best_rank_then_collection_and_chunk_id():
+    # a: ranks 2 + 1, b: ranks 1 + 2 - equal scores and best ranks, so the chunk ID decides
+    assert ranked_ids(fuse_rankings(vector_hits("b", "a"), keyword_hits("a", "b"), top_k=2)) == ["a", "b"]
+
+    # The same chunk ID in two collections, with mirrored ranks: the collection label decides
+    fused = fuse_rankings(
+        vector_hits("m", collection="history") + vector_hits("m", collection="guide"),
+        keyword_hits("m", collection="guide") + keyword_hits("m", collection="history"),
+        top_k=2
+    )
+    assert [candidate.collection for candidate in fused] == ["guide", "history"]
+
+    # Equal weighted scores: the chunk with the better rank in either source comes first
+    keyword = [KeywordHit(chunk_id="k", text="k", metadata={}, collection="guide", score=0.9)]
+    fused = fuse_rankings(vector_hits("top", "v"), keyword, method="score", top_k=3,
+                          semantic_weight=0.5, keyword_weight=0.5)
+    assert fused[1].fused_score == fused[2].fused_score
+    assert ranked_ids(fused) == ["top", "k", "v"]
+
+
+def test_same_inputs_give_the_same_order():
+    vector = vector_hits(*"abcdefgh")
+    keyword = keyword_hits(*"hgfedcba")
+
+    orders = {tuple(ranked_ids(fuse_rankings(vector, keyword, top_k=8))) for _ in range(5)}
+
+    assert len(orders) == 1
+
+
+def test_bm25_only_chunk_enters_the_top_k():
+    fused = fuse_rankings(vector_hits("a", "b", "c", "d"), keyword_hits("exact-phrase"), top_k=3)
+
+    assert "exact-phrase" in ranked_ids(fused)
+    candidate = next(candidate for candidate in fused if candidate.chunk_id == "exact-phrase")
+    assert candidate.semantic_rank is None and candidate.semantic_score == 0.0
+    assert candidate.to_chunk()['bm25_rank'] == 1
+
+
+def test_chunks_with_the_same_id_in_different_collections_stay_separate():
+    fused = fuse_rankings(vector_hits("1", collection="guide"), keyword_hits("1", collection="history"), top_k=5)
+
+    assert sorted(candidate.collection for candidate in fused) == ["guide", "history"]
+
+
+def test_score_method_weights_normalized_scores():
+    vector = vector_hits("a", "b")
+    keyword = keyword_hits("b")
+
+    fused = fuse_rankings(vector, keyword, method="score", top_k=2, semantic_weight=0.5, keyword_weight=0.5,
+                          bm25_scores={("guide", "a"): 0.2})
+    by_id = {candidate.chunk_id: candidate for candidate in fused}
+
+    assert by_id["a"].fused_score == pytest.approx((1.0 + 0.2) / 2)
+    assert by_id["b"].fused_score == pytest.approx((0.9 + 1.0) / 2)
+    assert ranked_ids(fused) == ["b", "a"]
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        fuse_rankings([], [], method="borda")
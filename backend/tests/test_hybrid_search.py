@@ -0,0 +1,90 @@
+"""Tests for HybridRetriever scoring on the sparse BM25 index."""
+import pytest
+
+from retrieval.hybrid_search import PRIMARY_NAMESPACE, HybridRetriever
+
+GUIDE = {
+    "guide-1": "ADA paratransit service must be comparable to fixed route service",
+    "guide-2": "procurement of rolling stock requires a pre-award audit",
+    "guide-3": "drug and alcohol testing program for safety sensitive employees",
+    "guide-4": "fixed route service must meet ADA accessibility requirements",
+    "guide-5": "the recipient shall maintain procurement records",
+}
+AUDITS = {
+    "audit-1": "the recipient lacked procurement records for rolling stock",
+    "audit-2": "paratransit trips were denied in violation of ADA",
+}
+
+
+@pytest.fixture
+def retriever():
+    retriever = HybridRetriever(semantic_weight=0.7, keyword_weight=0.3)
+    retriever.build_bm25_index(list(GUIDE.values()), list(GUIDE))
+    retriever.build_bm25_index(list(AUDITS.values()), list(AUDITS), namespace="historical_audits")
+    return retriever
+
+
+def semantic_results(*hits):
+    """ChromaDB query results for (chunk_id, text, distance) hits."""
+    return {
+        'ids': [[chunk_id for chunk_id, _, _ in hits]],
+        'documents': [[text for _, text, _ in hits]],
+        'metadatas': [[{} for _ in hits]],
+        'distances': [[distance for _, _, distance in hits]],
+    }
+
+
+def test_candidate_scores_match_scoring_the_whole_corpus(retriever):
+    everything = retriever.get_bm25_scores("ADA fixed route service")
+    candidates = retriever.get_bm25_scores("ADA fixed route service", document_ids=["guide-4", "guide-2", "missing"])
+
+    assert max(everything.values()) == pytest.approx(1.0)
+    assert candidates == pytest.approx({"guide-4": everything["guide-4"], "guide-2": everything["guide-2"]})
+
+
+def test_scores_match_rank_bm25_normalized_by_the_best_document(retriever):
+    rank_bm25 = pytest.importorskip("rank_bm25")
+    okapi = rank_bm25.BM25Okapi([text.lower().split() for text in GUIDE.values()])
+    expected = okapi.get_scores("procurement records audit".split())
+
+    scores = retriever.get_bm25_scores("procurement records audit")
+
+    assert [scores[chunk_id] for chunk_id in GUIDE] == pytest.approx(list(expected / expected.max()), rel=1e-5)
+
+
+def test_keyword_search_returns_the_best_matches_first(retriever):
+    results = retriever.keyword_search("procurement records", top_k=2)
+
+    assert [chunk_id for chunk_id, _ in results] == ["guide-5", "guide-2"]
+    assert results[0][1] == pytest.approx(1.0)
+    assert retriever.keyword_search("unknownterm") == []
+
+
+def test_merge_results_weights_semantic_and_keyword_scores(retriever):
+    query = "procurement records"
+    results = retriever.merge_results(
+        semantic_results(("guide-2", GUIDE["guide-2"], 0.2), ("guide-5", GUIDE["guide-5"], 0.3),
+                         ("guide-3", GUIDE["guide-3"], 0.4)),
+        query,
+        top_k=2
+    )
+
+    bm25 = retriever.get_bm25_scores(query)
+    assert [result['chunk_id'] for result in results] == ["guide-5", "guide-2"]
+    for result in results:
+        assert result['bm25_score'] == pytest.approx(bm25[result['chunk_id']])
+        assert result['hybrid_score'] == pytest.approx(0.7 * result['semantic_score'] + 0.3 * result['bm25_score'])
+
+
+def test_merge_results_scores_each_chunk_against_its_own_collection(retriever):
+    results = retriever.merge_results(
+        semantic_results(("guide-1", GUIDE["guide-1"], 0.5), ("audit-2", AUDITS["audit-2"], 0.5)),
+        "paratransit ADA",
+        namespaces=[PRIMARY_NAMESPACE, "historical_audits"]
+    )
+
+    scores = {result['chunk_id']: result['bm25_score'] for result in results}
+    assert scores["guide-1"] == pytest.approx(retriever.get_bm25_scores("paratransit ADA")["guide-1"])
+    assert scores["audit-2"] == pytest.approx(
+        retriever.get_bm25_scores("paratransit ADA", namespace="historical_audits")["audit-2"]
+    )
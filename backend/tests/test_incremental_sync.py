@@ -0,0 +1,115 @@
+"""Tests for incremental syncs of several ingest sources into one collection."""
+import pytest
+
+import ingest
+import ingest_full_guide
+from ingestion.embeddings import EmbeddingManager
+
+
+def chunk_pdf_documents(names):
+    """Documents as ingest.py builds them from chunk PDFs ({Category}_chunk_{N}.pdf)."""
+    return ingest.namespace_documents([
+        {"text": f"Chunk PDF text of {name}.", "metadata": {"chunk_id": name, "category": name.split("_chunk_")[0]}}
+        for name in names
+    ])
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return EmbeddingManager(db_path=str(tmp_path), openai_api_key="test-key", provider="hashing")
+
+
+def stored_ids(manager):
+    return set(manager.collection.get(include=[])["ids"])
+
+
+def store_untagged(manager, documents):
+    """Store documents the way ingestion did before chunks were tagged with their source (no embedding cache)."""
+    manager.collection.add(
+        ids=[doc["metadata"]["chunk_id"] for doc in documents],
+        embeddings=manager.embeddings.embed_documents([doc["text"] for doc in documents]),
+        documents=[doc["text"] for doc in documents],
+        metadatas=[doc["metadata"] for doc in documents]
+    )
+
+
+def test_both_ingest_paths_keep_each_others_chunks(manager):
+    guide_documents = ingest_full_guide.create_documents_from_chunks([
+        "ADA paratransit service must be comparable to fixed route service.",
+        "Procurement requires full and open competition for third party contracts.",
+    ])
+    chunk_documents = chunk_pdf_documents(["ADA_General_chunk_1", "ADA_General_chunk_2", "Procurement_chunk_1"])
+    guide_ids = {doc["metadata"]["chunk_id"] for doc in guide_documents}
+    chunk_ids = {doc["metadata"]["chunk_id"] for doc in chunk_documents}
+
+    manager.sync_documents(guide_documents, source=ingest_full_guide.INGEST_SOURCE)
+    report = manager.sync_documents(chunk_documents, source=ingest.INGEST_SOURCE)
+    assert report.deleted == 0
+    assert stored_ids(manager) == guide_ids | chunk_ids
+
+    # Re-running the full guide ingest must not delete the chunk PDFs' documents
+    report = manager.sync_documents(guide_documents, source=ingest_full_guide.INGEST_SOURCE)
+    assert report.deleted == 0
+    assert report.unchanged == len(guide_documents)
+    assert stored_ids(manager) == guide_ids | chunk_ids
+
+
+def test_stale_chunks_are_deleted_only_from_their_own_source(manager):
+    guide_documents = ingest_full_guide.create_documents_from_chunks(["Title VI prohibits discrimination."])
+    manager.sync_documents(guide_documents, source=ingest_full_guide.INGEST_SOURCE)
+    manager.sync_documents(chunk_pdf_documents(["Title_VI_chunk_1", "Title_VI_chunk_2"]), source=ingest.INGEST_SOURCE)
+
+    report = manager.sync_documents(chunk_pdf_documents(["Title_VI_chunk_1"]), source=ingest.INGEST_SOURCE)
+
+    assert report.deleted_ids == [f"{ingest.ID_PREFIX}Title_VI_chunk_2"]
+    assert stored_ids(manager) == {guide_documents[0]["metadata"]["chunk_id"], f"{ingest.ID_PREFIX}Title_VI_chunk_1"}
+
+
+def test_a_source_cannot_take_over_another_sources_chunk_ids(manager):
+    manager.sync_documents(chunk_pdf_documents(["School_Bus_chunk_1"]), source=ingest.INGEST_SOURCE)
+
+    with pytest.raises(ValueError, match="another ingest source"):
+        manager.sync_documents(chunk_pdf_documents(["School_Bus_chunk_1"]), source="other_script")
+
+
+def test_rebuild_clears_only_its_own_sources_chunks(manager):
+    guide_documents = ingest_full_guide.create_documents_from_chunks(["Charter service rules apply to FTA recipients."])
+    manager.sync_documents(guide_documents, source=ingest_full_guide.INGEST_SOURCE)
+    manager.sync_documents(chunk_pdf_documents(["Charter_Service_chunk_1"]), source=ingest.INGEST_SOURCE)
+
+    assert manager.clear_source(ingest.INGEST_SOURCE) == 1
+    assert stored_ids(manager) == {guide_documents[0]["metadata"]["chunk_id"]}
+
+
+def test_first_sync_of_an_untagged_collection_re_embeds_nothing(manager):
+    guide_documents = ingest_full_guide.create_documents_from_chunks([
+        "ADA paratransit service must be comparable to fixed route service.",
+        "Procurement requires full and open competition for third party contracts.",
+    ])
+    store_untagged(manager, guide_documents)
+
+    report = manager.sync_documents(guide_documents, source=ingest_full_guide.INGEST_SOURCE,
+                                    adopt=ingest_full_guide.wrote_untagged_chunk)
+
+    assert (report.added, report.changed, report.unchanged) == (0, 0, 2)
+    assert manager.document_embedder.hits + manager.document_embedder.misses == 0  # Nothing sent to the embedder
+    metadatas = manager.collection.get(include=["metadatas"])["metadatas"]
+    assert {metadata["ingest_source"] for metadata in metadatas} == {ingest_full_guide.INGEST_SOURCE}
+
+
+def test_chunk_pdfs_stored_under_unprefixed_ids_move_to_prefixed_ids(manager):
+    guide_documents = ingest_full_guide.create_documents_from_chunks(["Charter service rules apply to FTA recipients."])
+    legacy_documents = [
+        {"text": f"Chunk PDF text of {name}.",
+         "metadata": {"chunk_id": name, "category": "Title_VI", "file_path": f"/docs/guide/chunks/{name}.pdf"}}
+        for name in ["Title_VI_chunk_1", "Title_VI_chunk_2"]
+    ]
+    store_untagged(manager, guide_documents + legacy_documents)
+
+    report = manager.sync_documents(chunk_pdf_documents(["Title_VI_chunk_1", "Title_VI_chunk_2"]),
+                                    source=ingest.INGEST_SOURCE, adopt=ingest.wrote_untagged_chunk)
+
+    assert (report.added, report.deleted) == (2, 2)
+    assert manager.document_embedder.misses == 0  # Vectors of the unprefixed chunks were reused
+    assert stored_ids(manager) == {guide_documents[0]["metadata"]["chunk_id"],
+                                   f"{ingest.ID_PREFIX}Title_VI_chunk_1", f"{ingest.ID_PREFIX}Title_VI_chunk_2"}
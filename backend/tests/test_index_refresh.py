@@ -0,0 +1,60 @@
+"""Tests for the serving indexes picking up ingestion done by another process."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ingest_full_guide
+from config import settings
+from ingestion.embeddings import EmbeddingManager
+
+BACKEND = Path(__file__).parent.parent
+OLD_TEXT = "Charter service rules apply to FTA recipients."
+NEW_TEXT = "School bus operations are prohibited for FTA recipients."
+
+# Runs as its own process, like an ingestion job started from the admin API
+SYNC_SCRIPT = """
+import sys
+import ingest_full_guide
+from ingestion.embeddings import EmbeddingManager
+
+manager = EmbeddingManager(db_path=sys.argv[1], openai_api_key="test-key", provider="hashing")
+manager.sync_documents(ingest_full_guide.create_documents_from_chunks(sys.argv[2:]), source=ingest_full_guide.INGEST_SOURCE)
+"""
+
+
+def sync_in_subprocess(db_path, texts):
+    subprocess.run([sys.executable, "-c", SYNC_SCRIPT, db_path, *texts], cwd=BACKEND, check=True)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """RAG-only service (no DATABASE_URL) on local hashing embeddings, serving a one-chunk guide."""
+    from api.service import RAGService
+
+    monkeypatch.setattr(settings, "chroma_db_path", str(tmp_path))
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    monkeypatch.setattr(settings, "database_url", None)
+    monkeypatch.setattr(settings, "shared_index_dir", None)
+    manager = EmbeddingManager.from_settings(settings)
+    manager.sync_documents(ingest_full_guide.create_documents_from_chunks([OLD_TEXT]), source=ingest_full_guide.INGEST_SOURCE)
+
+    service = object.__new__(RAGService)  # Not the process-wide singleton
+    service._initialize_components()
+    return service
+
+
+def test_refresh_serves_vectors_written_by_another_process(service, tmp_path):
+    question = "Are school bus operations allowed?"
+    query_embedding = service.embedding_manager.embed_query(question)
+    assert [chunk['text'] for chunk in service._retrieve_chunks(question, query_embedding, 5)] == [OLD_TEXT]
+
+    sync_in_subprocess(str(tmp_path), [NEW_TEXT])
+    assert service.refresh_indexes() is not None
+
+    # The vector search and the BM25 index both serve the new corpus
+    results = service.embedding_manager.query_by_embedding(query_embedding, 5)
+    assert results['documents'] == [[NEW_TEXT]]
+    assert list(service.hybrid_retriever.bm25_index.doc_ids) == results['ids'][0]
+    assert [chunk['text'] for chunk in service._retrieve_chunks(question, query_embedding, 5)] == [NEW_TEXT]
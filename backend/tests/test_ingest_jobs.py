@@ -0,0 +1,27 @@
+"""Tests for mutual exclusion of ingestion jobs writing the same data."""
+import pytest
+
+from api.ingest_jobs import IngestJobStore, conflicting_kinds
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IngestJobStore(str(tmp_path / "ingest_jobs.sqlite3"))
+
+
+def test_guide_jobs_exclude_each_other(store):
+    store.create("guide", {}, exclusive_with=conflicting_kinds("guide"))
+
+    with pytest.raises(ValueError, match="'guide' job"):
+        store.create("guide_chunks", {"rebuild": True}, exclusive_with=conflicting_kinds("guide_chunks"))
+    with pytest.raises(ValueError):
+        store.create("guide", {}, exclusive_with=conflicting_kinds("guide"))
+
+
+def test_jobs_for_other_targets_and_after_the_active_one_ends_are_accepted(store):
+    job = store.create("guide", {}, exclusive_with=conflicting_kinds("guide"))
+
+    assert store.create("historical_narratives", {}, exclusive_with=conflicting_kinds("historical_narratives"))
+
+    store.finish(job["id"], "succeeded")
+    assert store.create("guide_chunks", {}, exclusive_with=conflicting_kinds("guide_chunks"))["status"] == "queued"
@@ -0,0 +1,83 @@
+"""Tests for saving BM25 indexes next to ChromaDB and memory-mapping them at startup."""
+import numpy as np
+import pytest
+
+import ingest_full_guide
+from ingestion.embeddings import EmbeddingManager
+from retrieval.shared_index import lexical_index_dir, read_index_meta, tokenize
+from retrieval.sparse_bm25 import SparseBM25Index, save_lexical_indexes
+
+TEXTS = [
+    "ADA paratransit service must be comparable to fixed route service.",
+    "Procurement requires full and open competition for third party contracts.",
+    "Charter service rules apply to FTA recipients.",
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = EmbeddingManager(db_path=str(tmp_path), openai_api_key="test-key", provider="hashing")
+    manager.sync_documents(ingest_full_guide.create_documents_from_chunks(TEXTS), source=ingest_full_guide.INGEST_SOURCE)
+    return manager
+
+
+def test_saved_index_scores_like_the_built_one(manager, tmp_path):
+    built = SparseBM25Index.from_collection(manager.collection)
+    built.save(str(tmp_path / "index"), "v1")
+
+    loaded = SparseBM25Index.load(str(tmp_path / "index"))
+
+    assert isinstance(loaded.arrays["posting_weights"], np.memmap)
+    assert loaded.doc_ids.tolist() == built.doc_ids.tolist()
+    query = tokenize("service for FTA recipients")
+    np.testing.assert_array_equal(loaded.get_scores(query), built.get_scores(query))
+    assert read_index_meta(str(tmp_path / "index"))["corpus_version"] == "v1"
+
+
+def test_open_reuses_a_current_index(manager, tmp_path, builds):
+    path = str(tmp_path / "index")
+    SparseBM25Index.open(manager.collection, path, "v1")
+    index = SparseBM25Index.open(manager.collection, path, "v1")
+
+    assert builds == [manager.collection.name]
+    assert len(index) == len(TEXTS)
+
+
+def test_open_rebuilds_after_a_new_corpus_version(manager, tmp_path, builds):
+    path = str(tmp_path / "index")
+    SparseBM25Index.open(manager.collection, path, "v1")
+
+    SparseBM25Index.open(manager.collection, path, "v2")
+
+    assert len(builds) == 2
+    assert read_index_meta(path)["corpus_version"] == "v2"
+
+
+def test_open_rebuilds_when_the_collection_size_changed(manager, tmp_path, builds):
+    path = str(tmp_path / "index")
+    SparseBM25Index.open(manager.collection, path, "v1")
+    manager.sync_documents(ingest_full_guide.create_documents_from_chunks(TEXTS[:2]),
+                           source=ingest_full_guide.INGEST_SOURCE)
+
+    index = SparseBM25Index.open(manager.collection, path, "v1")
+
+    assert len(builds) == 2
+    assert len(index) == 2
+
+
+def test_open_rebuilds_an_unreadable_index(manager, tmp_path, builds):
+    path = tmp_path / "index"
+    SparseBM25Index.open(manager.collection, str(path), "v1")
+    (path / "posting_weights.npy").write_bytes(b"truncated")
+
+    index = SparseBM25Index.open(manager.collection, str(path), "v1")
+
+    assert len(builds) == 2
+    assert len(index) == len(TEXTS)
+
+
+def test_ingestion_saves_the_index_next_to_chromadb(manager, tmp_path):
+    indexes = save_lexical_indexes(manager.client, str(tmp_path), "v1")
+
+    assert list(indexes) == [manager.collection.name]
+    assert read_index_meta(lexical_index_dir(str(tmp_path), manager.collection.name))["documents"] == len(TEXTS)
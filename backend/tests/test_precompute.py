@@ -0,0 +1,37 @@
+"""Tests for the query log that picks the questions to precompute."""
+from api.precompute import QueryLog
+
+
+def test_new_question_asked_repeatedly_enters_the_top_of_a_full_log(tmp_path):
+    log = QueryLog(str(tmp_path / "query_log.json"), max_entries=50)
+    for i in range(50):
+        for _ in range(5):
+            log.record(f"Old question {i}?")
+
+    for _ in range(6):
+        log.record("What changed in the FY2025 procurement review?")
+
+    assert log.top(1) == ["What changed in the FY2025 procurement review?"]
+
+
+def test_old_counts_decay_so_recent_questions_overtake_them(tmp_path):
+    log = QueryLog(str(tmp_path / "query_log.json"), half_life=10)
+    for _ in range(100):
+        log.record("What is a DBE?")
+    for i in range(60):
+        log.record(f"One-off question {i}?")
+
+    for _ in range(5):
+        log.record("What are the Title VI requirements?")
+
+    assert log.top(1) == ["What are the Title VI requirements?"]
+
+
+def test_counts_survive_a_restart(tmp_path):
+    path = str(tmp_path / "query_log.json")
+    log = QueryLog(path, half_life=3)
+    for question in ["A?", "B?", "B?", "C?", "C?", "C?"]:
+        log.record(question)
+    log.save()
+
+    assert QueryLog(path, half_life=3).top(3) == log.top(3) == ["C?", "B?", "A?"]
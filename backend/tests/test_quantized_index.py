@@ -0,0 +1,109 @@
+"""Tests for quantized vector search recall against exact search."""
+import numpy as np
+import pytest
+
+from retrieval.quantized_index import QuantizedCollection, QuantizedVectorIndex, vector_distances
+
+DOCUMENTS = 3000
+DIMENSIONS = 64
+K = 10
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    """Clustered unit vectors (like chunk embeddings) and queries drawn near the same clusters."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, DIMENSIONS))
+    vectors = centers[rng.integers(0, 20, DOCUMENTS)] + 0.5 * rng.normal(size=(DOCUMENTS, DIMENSIONS))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+    queries = (centers[rng.integers(0, 20, 50)] + 0.5 * rng.normal(size=(50, DIMENSIONS))).astype(np.float32)
+    return [f"doc-{i}" for i in range(DOCUMENTS)], vectors, queries
+
+
+def recall_at_k(index, ids, vectors, queries, space, rescore_factor=8):
+    """Mean fraction of the exact top K that the index returns."""
+    recalls = []
+    for query in queries:
+        exact = {ids[row] for row in np.argsort(vector_distances(query, vectors, space))[:K]}
+        found, _ = index.search(query.tolist(), K, rescore_factor=rescore_factor)
+        recalls.append(len(exact & set(found)) / K)
+    return float(np.mean(recalls))
+
+
+@pytest.mark.parametrize("space", ["l2", "cosine", "ip"])
+@pytest.mark.parametrize("quantization, minimum", [("int8", 0.95), ("binary", 0.8)])
+def test_recall_against_exact_search(corpus, space, quantization, minimum):
+    ids, vectors, queries = corpus
+    index = QuantizedVectorIndex.build(ids, vectors, quantization, space=space)
+
+    assert recall_at_k(index, ids, vectors, queries, space) >= minimum
+
+
+@pytest.mark.parametrize("quantization", ["int8", "binary"])
+def test_rescoring_every_vector_is_exact(corpus, quantization):
+    ids, vectors, queries = corpus
+    index = QuantizedVectorIndex.build(ids, vectors, quantization, space="cosine")
+
+    assert recall_at_k(index, ids, vectors, queries, "cosine", rescore_factor=DOCUMENTS) == 1.0
+
+
+def test_distances_are_exact_and_sorted(corpus):
+    ids, vectors, queries = corpus
+    index = QuantizedVectorIndex.build(ids, vectors, "int8", space="l2")
+
+    found, distances = index.search(queries[0].tolist(), K)
+
+    expected = vector_distances(queries[0], vectors, "l2")
+    positions = [ids.index(chunk_id) for chunk_id in found]
+    assert distances == sorted(distances)
+    np.testing.assert_allclose(distances, expected[positions], rtol=1e-5)
+
+
+def test_save_and_load_keep_results(corpus, tmp_path):
+    ids, vectors, queries = corpus
+    index = QuantizedVectorIndex.build(ids, vectors, "binary", space="cosine")
+    index.save(str(tmp_path / "index"), "v1", float_copy=True)
+
+    loaded = QuantizedVectorIndex.load(str(tmp_path / "index"))
+
+    for query in queries[:5]:
+        assert loaded.search(query.tolist(), K) == index.search(query.tolist(), K)
+
+
+class StoredCollection:
+    """Stands in for a ChromaDB collection holding the corpus vectors."""
+
+    def __init__(self, ids, vectors):
+        self.rows = {chunk_id: row for row, chunk_id in enumerate(ids)}
+        self.vectors = vectors
+
+    def get(self, ids, include):
+        found = [chunk_id for chunk_id in ids if chunk_id in self.rows]
+        return {
+            "ids": found,
+            "embeddings": [self.vectors[self.rows[chunk_id]] for chunk_id in found] if "embeddings" in include else None,
+            "documents": [f"text of {chunk_id}" for chunk_id in found],
+            "metadatas": [{} for _ in found],
+        }
+
+
+class FixedVersion:
+    def get(self):
+        return "v1"
+
+
+def test_by_default_only_codes_are_saved_and_chroma_vectors_rescore(corpus, tmp_path):
+    ids, vectors, queries = corpus
+    index = QuantizedVectorIndex.build(ids, vectors, "int8", space="cosine")
+    index.save(str(tmp_path / "index"), "v1")
+
+    loaded = QuantizedVectorIndex.load(str(tmp_path / "index"))
+    collection = QuantizedCollection(StoredCollection(ids, vectors), loaded, FixedVersion(), "v1")
+
+    assert not (tmp_path / "index" / "vectors.npy").exists()
+    assert loaded.vectors is None
+    for query in queries[:5]:
+        results = collection.query(query_embeddings=[query.tolist()], n_results=K)
+        found, distances = index.search(query.tolist(), K)
+        assert results["ids"][0] == found
+        np.testing.assert_allclose(results["distances"][0], distances, rtol=1e-5)
@@ -0,0 +1,67 @@
+"""Tests for the in-process LRU of query embeddings."""
+import asyncio
+
+import pytest
+
+from ingestion.embedding_cache import QueryEmbeddingCache
+from ingestion.embeddings import EmbeddingManager
+
+
+def test_rewordings_in_case_and_whitespace_hit_the_cache():
+    cache = QueryEmbeddingCache("text-embedding-3-small/1536")
+    cache.put("What is ADA paratransit?", [0.5, 0.25])
+
+    assert cache.get("  what is ADA   paratransit? ") == [0.5, 0.25]
+    assert cache.get("What is Title VI?") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_query_is_evicted():
+    cache = QueryEmbeddingCache("model", max_entries=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")  # b is now the least recently used
+    cache.put("c", [3.0])
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+
+
+def test_zero_capacity_disables_the_cache():
+    cache = QueryEmbeddingCache("model", max_entries=0)
+    cache.put("a", [1.0])
+
+    assert len(cache) == 0
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Manager on local hashing embeddings that counts the queries sent to the embedder."""
+    manager = EmbeddingManager(db_path=str(tmp_path), openai_api_key="test-key", provider="hashing",
+                               query_cache_size=8)
+    manager.embedded = []
+    embed_query, aembed_query = manager.embeddings.embed_query, manager.embeddings.aembed_query
+
+    def counting_embed_query(text):
+        manager.embedded.append(text)
+        return embed_query(text)
+
+    async def counting_aembed_query(text):
+        manager.embedded.append(text)
+        return await aembed_query(text)
+
+    manager.embeddings.embed_query = counting_embed_query
+    manager.embeddings.aembed_query = counting_aembed_query
+    return manager
+
+
+def test_a_repeated_question_is_embedded_once(manager):
+    first = manager.embed_query("Who needs a DBE program?")
+    again = manager.embed_query("who needs a DBE program?")
+    from_async = asyncio.run(manager.aembed_query("Who needs a DBE program?"))
+
+    assert first == again == from_async
+    assert manager.embedded == ["Who needs a DBE program?"]
+    assert manager.query_cache.hits == 2
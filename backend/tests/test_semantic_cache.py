@@ -0,0 +1,84 @@
+"""Tests for corpus-version invalidation of the semantic answer cache."""
+import asyncio
+
+from ingestion.corpus_version import CorpusVersion, bump_corpus_version
+from retrieval.answer_cache import AnswerCache
+from retrieval.semantic_cache import SemanticCache, semantic_context_key
+
+QUESTION = "What are the ADA requirements for paratransit service?"
+PARAPHRASE = "Explain the ADA paratransit requirements"
+
+
+def test_near_duplicate_hits_only_in_the_same_context():
+    cache = SemanticCache(threshold=0.9)
+    context = semantic_context_key("v1")
+    cache.add([1.0, 0.0, 0.0], "rag", context, QUESTION, {'answer': "cached"})
+
+    response, similarity, matched = cache.lookup([0.99, 0.1, 0.0], "rag", context)
+    assert response['answer'] == "cached"
+    assert similarity >= 0.9
+    assert matched == QUESTION
+
+    assert cache.lookup([0.0, 1.0, 0.0], "rag", context) is None  # Not similar enough
+    assert cache.lookup([1.0, 0.0, 0.0], "database", context) is None
+    assert cache.lookup([1.0, 0.0, 0.0], "rag", semantic_context_key("v2")) is None
+    history = [{'role': "user", 'content': "And for fixed route?"}]
+    assert cache.lookup([1.0, 0.0, 0.0], "rag", semantic_context_key("v1", history)) is None
+
+
+def test_entries_stop_matching_after_a_version_bump(tmp_path):
+    cache = SemanticCache(threshold=0.9)
+    version = CorpusVersion(str(tmp_path))
+    bump_corpus_version(str(tmp_path), "first ingest")
+    cache.add([1.0, 0.0], "rag", semantic_context_key(version.get()), QUESTION, {'answer': "old"})
+
+    assert cache.lookup([1.0, 0.0], "rag", semantic_context_key(version.get())) is not None
+
+    bump_corpus_version(str(tmp_path), "re-ingest")
+
+    assert cache.lookup([1.0, 0.0], "rag", semantic_context_key(version.get())) is None
+
+
+def test_engine_answers_paraphrases_from_cache_until_an_index_refresh(tmp_path, make_rag_engine):
+    bump_corpus_version(str(tmp_path), "first ingest")
+    engine, pipeline = make_rag_engine(semantic_cache=SemanticCache(threshold=0.9))
+
+    first = asyncio.run(engine.aexecute_query(QUESTION))
+    paraphrased = asyncio.run(engine.aexecute_query(PARAPHRASE))
+    assert pipeline.calls == 1
+    assert paraphrased['answer'] == first['answer']
+    assert paraphrased['metadata']['semantic_cache_hit'] is True
+    assert paraphrased['metadata']['matched_question'] == QUESTION
+
+    engine.indexed_version = bump_corpus_version(str(tmp_path), "re-ingest")  # Refreshed indexes swapped in
+    fresh = asyncio.run(engine.aexecute_query(PARAPHRASE))
+
+    assert pipeline.calls == 2
+    assert fresh['answer'] != first['answer']
+    assert 'semantic_cache_hit' not in fresh['metadata']
+
+
+def test_paraphrase_hits_are_not_promoted_to_exact_cache_hits(tmp_path, make_rag_engine):
+    bump_corpus_version(str(tmp_path), "first ingest")
+    engine, pipeline = make_rag_engine(answer_cache=AnswerCache(), semantic_cache=SemanticCache(threshold=0.9))
+
+    asyncio.run(engine.aexecute_query(QUESTION))
+    asyncio.run(engine.aexecute_query(PARAPHRASE))
+    repeated = asyncio.run(engine.aexecute_query(PARAPHRASE))
+
+    assert pipeline.calls == 1
+    assert repeated['metadata']['semantic_cache_hit'] is True
+    assert repeated['metadata']['cache_hit'] is False
+
+
+def test_rag_only_service_does_not_promote_paraphrase_hits_either(tmp_path, make_rag_service):
+    bump_corpus_version(str(tmp_path), "first ingest")
+    service, pipeline = make_rag_service(answer_cache=AnswerCache(), semantic_cache=SemanticCache(threshold=0.9))
+
+    asyncio.run(service._aprocess_rag_only(QUESTION))
+    asyncio.run(service._aprocess_rag_only(PARAPHRASE))
+    repeated = asyncio.run(service._aprocess_rag_only(PARAPHRASE))
+
+    assert pipeline.calls == 1
+    assert repeated['metadata']['semantic_cache_hit'] is True
+    assert not repeated['metadata'].get('cache_hit')
@@ -0,0 +1,55 @@
+"""Tests for the BM25 indexes that serve.py shares between workers by memory-mapping them."""
+import numpy as np
+import pytest
+
+import ingest_full_guide
+import serve
+from config import settings
+from ingestion.corpus_version import read_corpus_version
+from ingestion.embeddings import EmbeddingManager
+from retrieval.shared_index import read_index_meta
+
+TEXTS = [
+    "ADA paratransit service must be comparable to fixed route service.",
+    "Charter service rules apply to FTA recipients.",
+    "School bus operations are prohibited for FTA recipients.",
+]
+
+
+@pytest.fixture
+def ingested(tmp_path, monkeypatch):
+    """A guide collection ingested with local hashing embeddings; returns the shared index directory."""
+    monkeypatch.setattr(settings, "chroma_db_path", str(tmp_path / "chroma"))
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    monkeypatch.setattr(settings, "database_url", None)
+    manager = EmbeddingManager.from_settings(settings)
+    manager.sync_documents(ingest_full_guide.create_documents_from_chunks(TEXTS), source=ingest_full_guide.INGEST_SOURCE)
+    return str(tmp_path / "shared")
+
+
+def test_launcher_saves_a_memory_mapped_index_once(ingested, builds):
+    indexes = serve.build_shared_indexes(ingested)
+
+    index = indexes["fta_compliance_guide"]
+    assert len(index) == len(TEXTS)
+    assert all(isinstance(array, np.memmap) for array in index.arrays.values())
+    assert read_index_meta(f"{ingested}/fta_compliance_guide")["corpus_version"] == \
+        read_corpus_version(settings.chroma_db_path)
+
+    serve.build_shared_indexes(ingested)  # A restart reuses the saved index
+    assert builds == ["fta_compliance_guide"]
+
+
+def test_workers_map_the_shared_index_instead_of_building_their_own(ingested, builds, monkeypatch):
+    from api.service import RAGService
+
+    launched = serve.build_shared_indexes(ingested)["fta_compliance_guide"]
+    monkeypatch.setattr(settings, "shared_index_dir", ingested)  # What serve.py hands its workers
+
+    worker = object.__new__(RAGService)  # Not the process-wide singleton
+    worker._initialize_components()
+
+    index = worker.hybrid_retriever.bm25_index
+    assert builds == ["fta_compliance_guide"]  # Only the launcher built it
+    assert isinstance(index.arrays["posting_weights"], np.memmap)
+    assert index.doc_ids.tolist() == launched.doc_ids.tolist()
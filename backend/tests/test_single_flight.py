@@ -0,0 +1,91 @@
+"""Tests for coalescing identical in-flight queries into one execution."""
+import asyncio
+
+import pytest
+
+from api.metrics import metrics
+from api.precompute import PrecomputedAnswers, QueryLog
+from api.single_flight import SingleFlight, query_key
+
+
+def test_query_key_ignores_case_whitespace_and_old_history():
+    old_turn = [{'role': 'user', 'content': "Hello"}, {'role': 'assistant', 'content': "Hi"}]
+    recent = [{'role': 'user', 'content': "What is ADA?"}, {'role': 'assistant', 'content': "A law."}]
+
+    assert query_key("What is a DBE?") == query_key("  what is a   DBE? ")
+    assert query_key("Why?", old_turn + recent, history_window=2) == query_key("Why?", recent, history_window=2)
+    assert query_key("Why?", recent) != query_key("Why?")
+    assert query_key("What is a DBE?", recipient_type="transit") != query_key("What is a DBE?")
+
+
+def test_callers_of_one_key_share_an_execution_and_get_separate_copies():
+    flight = SingleFlight()
+    executions = []
+
+    async def execute():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {'answer': "shared", 'metadata': {}}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.run("key", execute) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert len(executions) == 1
+    assert [coalesced for _, coalesced in results] == [False, True, True, True, True]
+    results[1][0]['metadata']['coalesced'] = True
+    assert results[0][0]['metadata'] == {}
+    assert flight.in_flight == 0
+
+
+def test_a_disconnecting_follower_does_not_cancel_the_shared_execution():
+    flight = SingleFlight()
+
+    async def execute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.run("key", execute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("key", execute))
+        await asyncio.sleep(0)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(scenario()) == ("done", False)
+
+
+def test_a_failed_execution_is_not_reused():
+    flight = SingleFlight()
+    attempts = []
+
+    async def execute():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("LLM unavailable")
+        return "ok"
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(flight.run("key", execute))
+    assert asyncio.run(flight.run("key", execute)) == ("ok", False)
+
+
+def test_service_answers_identical_concurrent_questions_once(make_rag_service, tmp_path):
+    service, pipeline = make_rag_service()
+    service.single_flight = SingleFlight()
+    service.query_log = QueryLog(str(tmp_path / "query_log.json"))
+    service.precomputed = PrecomputedAnswers()
+    before = metrics.snapshot()['counters'].get('query_coalesced_total', 0)
+
+    async def scenario():
+        questions = ["What is ADA paratransit?", "what is ADA   paratransit?", "What is ADA paratransit?"]
+        return await asyncio.gather(*(service.aprocess_query(question) for question in questions))
+
+    results = asyncio.run(scenario())
+
+    assert pipeline.calls == 1
+    assert [result['answer'] for result in results] == ["answer 1"] * 3
+    assert [result['metadata'].get('coalesced', False) for result in results] == [False, True, True]
+    assert metrics.snapshot()['counters']['query_coalesced_total'] - before == 2
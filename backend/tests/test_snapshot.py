@@ -0,0 +1,80 @@
+"""Tests for exporting embedding snapshots and importing them into a fresh ChromaDB directory."""
+import numpy as np
+import pytest
+
+import ingest_full_guide
+from ingestion.embedding_dimensions import EmbeddingDimensionMismatch
+from ingestion.embeddings import EmbeddingManager
+from ingestion.snapshot import import_collection, load_snapshot, read_collection, write_snapshot
+
+TEXTS = [
+    "ADA paratransit service must be comparable to fixed route service.",
+    "Procurement requires full and open competition for third party contracts.",
+    "Título VI prohíbe la discriminación.",  # Non-ASCII text survives the UTF-8 columns
+]
+
+
+def make_manager(path):
+    return EmbeddingManager(db_path=str(path), openai_api_key="test-key", provider="hashing")
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    """Snapshot of a guide collection ingested into tmp_path/source."""
+    manager = make_manager(tmp_path / "source")
+    manager.sync_documents(ingest_full_guide.create_documents_from_chunks(TEXTS), source=ingest_full_guide.INGEST_SOURCE)
+    path = str(tmp_path / "embeddings.npz")
+    write_snapshot(path, [read_collection(manager.collection, str(tmp_path / "source"))])
+    return path, read_collection(manager.collection)
+
+
+def test_round_trip_restores_chunks_and_vectors(snapshot_file, tmp_path):
+    path, exported = snapshot_file
+    target = make_manager(tmp_path / "target")
+
+    [snapshot] = load_snapshot(path)
+    collection = import_collection(target.client, snapshot, str(tmp_path / "target"),
+                                   model=target.embedding_model, dimensions=target.dimensions, replace=True)
+
+    imported = read_collection(collection)
+    assert imported.ids == exported.ids
+    assert imported.documents == exported.documents
+    assert imported.metadatas == exported.metadatas
+    assert imported.metadata == exported.metadata
+    np.testing.assert_array_equal(imported.vectors, exported.vectors)
+
+
+def test_ingest_after_import_embeds_nothing(snapshot_file, tmp_path):
+    path, _ = snapshot_file
+    target = make_manager(tmp_path / "target")
+    import_collection(target.client, load_snapshot(path)[0], str(tmp_path / "target"),
+                      model=target.embedding_model, dimensions=target.dimensions, replace=True)
+
+    target = make_manager(tmp_path / "target")  # As a later ingestion run
+    report = target.sync_documents(ingest_full_guide.create_documents_from_chunks(TEXTS),
+                                   source=ingest_full_guide.INGEST_SOURCE)
+
+    assert (report.added, report.changed, report.unchanged) == (0, 0, len(TEXTS))
+    assert target.document_embedder.misses == 0
+
+
+def test_snapshot_of_another_model_is_rejected(snapshot_file, tmp_path):
+    path, _ = snapshot_file
+    target = make_manager(tmp_path / "target")
+
+    with pytest.raises(EmbeddingDimensionMismatch):
+        import_collection(target.client, load_snapshot(path)[0], str(tmp_path / "target"),
+                          model="text-embedding-3-small", dimensions=1536)
+    with pytest.raises(EmbeddingDimensionMismatch):
+        import_collection(target.client, load_snapshot(path)[0], str(tmp_path / "target"),
+                          model=target.embedding_model, dimensions=target.dimensions // 2)
+
+
+def test_non_empty_collection_is_kept_unless_replaced(snapshot_file, tmp_path):
+    path, _ = snapshot_file
+    target = make_manager(tmp_path / "target")
+    target.sync_documents(ingest_full_guide.create_documents_from_chunks(TEXTS[:1]),
+                          source=ingest_full_guide.INGEST_SOURCE)
+
+    assert import_collection(target.client, load_snapshot(path)[0], str(tmp_path / "target")) is None
+    assert target.get_collection_count() == 1
@@ -0,0 +1,95 @@
+"""Tests for the sparse BM25 index: MaxScore top-k against brute-force scoring, and scores against rank_bm25."""
+import numpy as np
+import pytest
+
+from retrieval.sparse_bm25 import SparseBM25Index
+
+
+@pytest.fixture(scope="module")
+def index_and_vocabulary():
+    """Index of Zipf-distributed documents (a few very common terms, a long tail of rare ones)."""
+    rng = np.random.default_rng(0)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    documents = [
+        " ".join(rng.choice(vocabulary, size=rng.integers(20, 120), p=weights))
+        for _ in range(3000)
+    ]
+    index = SparseBM25Index.build(documents, [f"doc-{i}" for i in range(len(documents))])
+    return index, vocabulary
+
+
+def brute_force_top_k(index, query, k):
+    """Best k positive scores, by scoring every document."""
+    scores = index.get_scores(query)
+    order = np.argsort(-scores, kind="stable")[:k]
+    order = order[scores[order] > 0]
+    return scores, order
+
+
+def query_mixes(vocabulary, seed, count=40):
+    """Queries of rare terms, common terms, repeated and unknown terms, and mixes of them."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(count):
+        common = list(rng.choice(vocabulary[:20], size=rng.integers(0, 4)))
+        rare = list(rng.choice(vocabulary[200:], size=rng.integers(0, 4)))
+        query = common + rare + (common[:1] if rng.random() < 0.3 else []) + ["unknownterm"]
+        queries.append(query)
+    return queries
+
+
+@pytest.mark.parametrize("k", [1, 5, 10, 50])
+def test_top_k_matches_brute_force(index_and_vocabulary, k):
+    index, vocabulary = index_and_vocabulary
+
+    for query in query_mixes(vocabulary, seed=k):
+        scores, expected = brute_force_top_k(index, query, k)
+        found, found_scores = index.top_k(query, k)
+
+        np.testing.assert_allclose(found_scores, scores[expected], rtol=1e-5)
+        np.testing.assert_allclose(found_scores, scores[found], rtol=1e-5)
+        assert list(found_scores) == sorted(found_scores, reverse=True)
+        # Any order among equal scores is fine; documents above the k-th best score must all be returned
+        if len(expected):
+            kth = scores[expected[-1]]
+            assert set(np.flatnonzero(scores > kth * (1 + 1e-5))) <= set(found.tolist())
+
+
+def test_top_k_returns_only_matching_documents(index_and_vocabulary):
+    index, vocabulary = index_and_vocabulary
+    query = [vocabulary[-1]]
+    matching = np.flatnonzero(index.get_scores(query) > 0)
+
+    found, _ = index.top_k(query, 100)
+
+    assert sorted(found.tolist()) == sorted(matching.tolist())
+    assert len(index.top_k(["unknownterm"], 10)[0]) == 0
+    assert len(index.top_k(query, 0)[0]) == 0
+
+
+def test_score_documents_matches_full_scores(index_and_vocabulary):
+    index, vocabulary = index_and_vocabulary
+    rng = np.random.default_rng(1)
+    selected = rng.choice(len(index), size=200, replace=False)
+
+    for query in query_mixes(vocabulary, seed=99, count=10):
+        np.testing.assert_allclose(index.score_documents(query, selected), index.get_scores(query)[selected],
+                                   rtol=1e-5, atol=1e-6)
+
+
+def test_scores_match_rank_bm25():
+    rank_bm25 = pytest.importorskip("rank_bm25")
+    documents = [
+        "ADA paratransit service must be comparable to fixed route service",
+        "procurement of rolling stock requires a pre-award audit",
+        "drug and alcohol testing program for safety sensitive employees",
+        "fixed route service must meet ADA accessibility requirements",
+        "the recipient shall maintain procurement records",
+    ]
+    index = SparseBM25Index.build(documents, [f"doc-{i}" for i in range(len(documents))])
+    okapi = rank_bm25.BM25Okapi([document.lower().split() for document in documents])
+
+    for query in (["ada", "service"], ["procurement", "procurement", "audit"], ["testing"], ["unknown"]):
+        np.testing.assert_allclose(index.get_scores(query), okapi.get_scores(query), rtol=1e-5, atol=1e-6)
@@ -0,0 +1,56 @@
+"""Tests for concurrent searches of several collections through one ChromaDB client."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ingestion.embeddings import EmbeddingManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return EmbeddingManager(db_path=str(tmp_path), openai_api_key="test-key", provider="hashing")
+
+
+class RendezvousCollection:
+    """Collection whose query only returns once the other collection's query is running too."""
+
+    metadata = {"hnsw:space": "cosine"}
+
+    def __init__(self, name, barrier):
+        self.name = name
+        self.barrier = barrier
+
+    def query(self, query_embeddings, n_results, where=None):
+        self.barrier.wait()  # Raises BrokenBarrierError if the queries run one after another
+        return {'ids': [[f"{self.name}-1"]], 'documents': [["text"]], 'metadatas': [[{}]], 'distances': [[0.1]]}
+
+
+def test_queries_to_different_collections_overlap(manager):
+    barrier = threading.Barrier(2, timeout=5)
+    collections = {"guide": RendezvousCollection("guide", barrier),
+                   "historical": RendezvousCollection("historical", barrier)}
+
+    result = manager.query_many(collections, [1.0, 0.0, 0.0], per_collection_k=1)
+
+    assert {hit.collection for hit in result.hits} == {"guide", "historical"}
+
+
+def test_concurrent_reads_through_one_client_do_not_fail(manager):
+    texts = [f"Requirement {i} of the compliance guide covers paratransit and procurement." for i in range(20)]
+    vectors = manager.embeddings.embed_documents(texts)
+    historical = manager.open_historical_collection()
+    for collection in (manager.collection, historical):
+        collection.add(ids=[f"{collection.name}-{i}" for i in range(len(texts))], embeddings=vectors, documents=texts)
+    query = manager.embed_query("paratransit procurement")
+
+    def read(i):
+        collection = (manager.collection, historical)[i % 2]
+        collection.get(limit=5)
+        return collection.query(query_embeddings=[query], n_results=3)
+
+    # chromadb's default telemetry client fails dozens of these reads with a KeyError
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(read, range(2000)))
+
+    assert all(len(result["ids"][0]) == 3 for result in results)
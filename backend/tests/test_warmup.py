@@ -0,0 +1,69 @@
+"""Tests for startup warm-up and the liveness/readiness probes."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import router
+from api.service import RAGService, warm_up_service
+from config import settings
+
+
+@pytest.fixture
+def cold_service(tmp_path, monkeypatch):
+    """A process that has not built the RAGService singleton yet (RAG-only, local hashing embeddings)."""
+    monkeypatch.setattr(RAGService, "_instance", None)
+    monkeypatch.setattr(RAGService, "_initialized", False)
+    monkeypatch.setattr(RAGService, "_warmed_up", False)
+    monkeypatch.setattr(settings, "chroma_db_path", str(tmp_path))
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    monkeypatch.setattr(settings, "database_url", None)
+    monkeypatch.setattr(settings, "shared_index_dir", None)
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_probes_while_warming_up(cold_service, client):
+    assert client.get("/api/v1/live").json() == {"status": "alive"}
+
+    ready = client.get("/api/v1/ready")
+    assert ready.status_code == 503
+    assert ready.headers["Retry-After"] == "5"
+
+    assert client.get("/api/v1/health").json()["status"] == "starting"
+    query = client.post("/api/v1/query", json={"question": "What is ADA?"})
+    assert query.status_code == 503
+    assert RAGService._instance is None  # Requests never build the service on demand
+
+
+def test_ready_once_warm_up_completes(cold_service, client):
+    asyncio.run(warm_up_service())
+
+    assert RAGService.get_instance() is not None
+    assert client.get("/api/v1/ready").json() == {"status": "ready"}
+    assert client.get("/api/v1/health").json()["status"] == "healthy"
+
+
+def test_failed_warm_up_is_retried(cold_service, monkeypatch):
+    attempts = []
+    warm_up = RAGService.warm_up
+
+    def flaky_warm_up():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("embedding provider unavailable")
+        return warm_up()
+
+    monkeypatch.setattr(RAGService, "warm_up", flaky_warm_up)
+
+    asyncio.run(warm_up_service())
+
+    assert len(attempts) == 2
+    assert RAGService.get_instance() is not None